@@ -0,0 +1,106 @@
+# src/data/caixaSaida.py
+"""
+Caixa de saída local (SQLite) dos e-mails do plano.
+Cada mensagem é identificada por (ambiente, data de referência, tipo, chave), onde a
+chave é o CPF do aniversariante, o gestor ou vazia nos e-mails consolidados.
+O ambiente (AMBIENTE) separa os registros: um envio de QAS, redirecionado
+para EMAIL_TESTE, não conta como enviado para a execução de PRD.
+Antes do envio as mensagens entram como 'na_fila'; o resultado de cada bloco
+enviado é gravado como 'enviado' ou 'falha'. Uma nova execução do mesmo dia
+envia apenas o que não consta como 'enviado'. Mensagens que ficaram 'na_fila'
+por uma execução interrompida são reenviadas, pois o resultado é desconhecido.
+"""
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+
+ENVIADO = 'enviado'
+NA_FILA = 'na_fila'
+FALHA = 'falha'
+
+class caixaSaida:
+    def __init__(self, caminho, ambiente):
+        self.caminho = caminho
+        self.ambiente = ambiente
+        diretorio = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(diretorio, exist_ok=True)
+        self.conexao = sqlite3.connect(caminho)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("PRAGMA synchronous=NORMAL")
+        with self.conexao:
+            colunas = {linha[1] for linha in self.conexao.execute("PRAGMA table_info(envios)")}
+            if colunas and 'ambiente' not in colunas:
+                # Caixa criada sem o ambiente: os registros antigos não dizem para onde foram enviados
+                logging.warning(f"Caixa de saída {caminho} sem ambiente. Registros antigos movidos para envios_sem_ambiente.")
+                self.conexao.execute("ALTER TABLE envios RENAME TO envios_sem_ambiente")
+            self.conexao.execute("""
+                CREATE TABLE IF NOT EXISTS envios (
+                    ambiente TEXT NOT NULL,
+                    data_referencia TEXT NOT NULL,
+                    tipo TEXT NOT NULL,
+                    chave TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    destinatarios TEXT,
+                    assunto TEXT,
+                    tentativas INTEGER NOT NULL DEFAULT 0,
+                    codigo INTEGER,
+                    erro TEXT,
+                    atualizado_em TEXT NOT NULL,
+                    PRIMARY KEY (ambiente, data_referencia, tipo, chave)
+                ) WITHOUT ROWID
+            """)
+
+    def _data(self, data_referencia):
+        return data_referencia.strftime('%Y-%m-%d')
+
+    def enviados(self, data_referencia, tipo):
+        """Chaves já enviadas do tipo na data, em uma única consulta pela chave primária."""
+        cursor = self.conexao.execute(
+            "SELECT chave FROM envios WHERE ambiente = ? AND data_referencia = ? AND tipo = ? AND status = ?",
+            (self.ambiente, self._data(data_referencia), tipo, ENVIADO)
+        )
+        return {chave for (chave,) in cursor}
+
+    def enfileirar(self, data_referencia, chaves, mensagens):
+        """Registra as mensagens (tipo, chave) como 'na_fila', sem tocar nas já enviadas."""
+        data, agora = self._data(data_referencia), datetime.now().isoformat(timespec='seconds')
+        with self.conexao:
+            self.conexao.executemany(
+                """
+                INSERT INTO envios (ambiente, data_referencia, tipo, chave, status, destinatarios, assunto, atualizado_em)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (ambiente, data_referencia, tipo, chave) DO UPDATE SET
+                    status = excluded.status,
+                    destinatarios = excluded.destinatarios,
+                    assunto = excluded.assunto,
+                    atualizado_em = excluded.atualizado_em
+                WHERE envios.status <> 'enviado'
+                """,
+                [
+                    (self.ambiente, data, tipo, chave, NA_FILA, json.dumps(destinatarios, ensure_ascii=False), assunto, agora)
+                    for (tipo, chave), (destinatarios, assunto, _) in zip(chaves, mensagens)
+                ]
+            )
+
+    def registrar(self, data_referencia, chaves, resultados):
+        """Grava o resultado de um bloco de envios (um commit por bloco)."""
+        data, agora = self._data(data_referencia), datetime.now().isoformat(timespec='seconds')
+        with self.conexao:
+            self.conexao.executemany(
+                """
+                UPDATE envios SET status = ?, codigo = ?, erro = ?, tentativas = tentativas + 1, atualizado_em = ?
+                WHERE ambiente = ? AND data_referencia = ? AND tipo = ? AND chave = ?
+                """,
+                [
+                    (ENVIADO if resultado['status'] == 202 else FALHA, resultado['status'], resultado['erro'], agora, self.ambiente, data, tipo, chave)
+                    for (tipo, chave), resultado in zip(chaves, resultados)
+                ]
+            )
+
+    def fechar(self):
+        try:
+            self.conexao.close()
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao fechar a caixa de saída {self.caminho}: {e}")
@@ -1,50 +1,248 @@
 import requests
-from utils.config import client_secret, client_id, tenant_id, scope, email_from
+from requests.adapters import HTTPAdapter
+from utils.config import client_secret, client_id, tenant_id, scope, email_from, graph_pool_size, graph_mensagens_por_minuto, graph_rajada, graph_tentativas
+from utils.limitadorTaxa import limitadorTaxa
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
 import json
 import logging
+import random
+import threading
+import time
 
-class conexaoGraph:
-    def acessoTokenGraph(self):
-        # url = f'https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token'
-        # data = {
-        #     'grant_type': 'client_credentials',
-        #     'client_id': client_id,
-        #     'client_secret': client_secret,
-        #     'scope': scope
-        # }
-        # response = requests.post(url, data=data)
-        # return response.json().get('access_token')
+GRAPH_URL = 'https://graph.microsoft.com/v1.0'
+LOGIN_URL = 'https://login.microsoftonline.com'
+# Renova o token alguns minutos antes do vencimento informado em 'expires_in'
+MARGEM_RENOVACAO_TOKEN = 300
+# Limite de sub-requisições por chamada ao endpoint /$batch do Graph
+TAMANHO_LOTE_GRAPH = 20
+# Status de sub-requisição que valem nova tentativa (throttling e falhas transitórias)
+STATUS_TRANSITORIOS = {429, 500, 502, 503, 504}
+# Status com que o Graph sinaliza limite de envio (respeitam o Retry-After)
+STATUS_LIMITACAO = {429, 503, 504}
+# Teto do backoff exponencial (o Retry-After informado pelo Graph sempre prevalece)
+ESPERA_MAXIMA = 60
+# Fração aleatória somada à espera, para as threads não voltarem todas juntas
+JITTER_ESPERA = 0.25
+
+def segundos_retry_after(valor):
+    """Converte o Retry-After (segundos ou data HTTP) em segundos; None se ausente ou inválido."""
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except (TypeError, ValueError):
         pass
+    try:
+        return max(0.0, (parsedate_to_datetime(valor) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
 
-    def enviaEmailGraph(self, email_to, subject, body):
-        email_group = email_to
-        # Obter token de acesso
-        url = f'https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token'
-        data = {
-            'grant_type': 'client_credentials',
-            'client_id': client_id,
-            'client_secret': client_secret,
-            'scope': scope
-        }
-        response = requests.post(url, data=data)
-        token = response.json().get('access_token')
-        to_recipients = [{'emailAddress': {'address': email}} for email in email_group]
-        url = f'https://graph.microsoft.com/v1.0/users/{email_from}/sendMail'
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json'
-        }
-        email_msg = {
+def tempo_espera(tentativa, retry_after=None):
+    """Espera antes da nova tentativa: backoff exponencial com jitter, nunca menor que o Retry-After."""
+    espera = max(retry_after or 0.0, min(2 ** tentativa, ESPERA_MAXIMA))
+    return espera * (1 + random.uniform(0, JITTER_ESPERA))
+
+def _json_ou_vazio(response):
+    """Corpo JSON (objeto) da resposta; {} se o corpo não for JSON, como em erros de proxy ou gateway."""
+    try:
+        corpo = response.json()
+    except ValueError:
+        return {}
+    return corpo if isinstance(corpo, dict) else {}
+
+class conexaoGraph:
+    # Token e sessão são compartilhados por todas as instâncias do processo
+    _token = None
+    _token_expira_em = 0.0
+    _sessao = None
+    _lock = threading.Lock()
+    _lock_sessao = threading.Lock()
+    # Limite de mensagens por minuto da caixa de envio, compartilhado por todas as threads
+    _limitador = limitadorTaxa(graph_mensagens_por_minuto, graph_rajada)
+    _contadores = {'limitadas': 0, 'reenviadas': 0, 'espera_limitador': 0.0}
+    _lock_contadores = threading.Lock()
+
+    @classmethod
+    def _contar(cls, **quantidades):
+        with cls._lock_contadores:
+            for nome, quantidade in quantidades.items():
+                cls._contadores[nome] += quantidade
+
+    @classmethod
+    def contadores(cls):
+        """Respostas de limite do Graph (429/503/504), mensagens reenviadas e segundos de espera no limitador."""
+        with cls._lock_contadores:
+            return dict(cls._contadores)
+
+    def _aguardar_nova_tentativa(self, tentativa, retry_after, limitado, motivo):
+        """
+        Espera antes de reenviar. Quando o Graph limita o envio, todas as threads
+        pausam pelo Retry-After; a espera desta thread tem jitter, para não voltarem juntas.
+        """
+        espera = tempo_espera(tentativa, retry_after)
+        logging.warning(f"{motivo} Nova tentativa em {espera:.1f} segundos...")
+        if limitado and retry_after:
+            conexaoGraph._limitador.pausar(retry_after)
+        time.sleep(espera)
+
+    def _reservar_envio(self, quantidade=1):
+        """Aguarda o limitador liberar 'quantidade' mensagens."""
+        espera = conexaoGraph._limitador.adquirir(quantidade)
+        if espera:
+            self._contar(espera_limitador=espera)
+
+    def _sessao_http(self):
+        """Retorna a sessão keep-alive usada em todas as chamadas ao Graph."""
+        if conexaoGraph._sessao is None:
+            with conexaoGraph._lock_sessao:
+                if conexaoGraph._sessao is None:
+                    sessao = requests.Session()
+                    adaptador = HTTPAdapter(pool_connections=2, pool_maxsize=graph_pool_size)
+                    sessao.mount('https://', adaptador)
+                    sessao.mount('http://', adaptador)
+                    conexaoGraph._sessao = sessao
+        return conexaoGraph._sessao
+
+    def acessoTokenGraph(self, renovar=False):
+        """
+        Retorna o token client-credentials em cache, renovando-o perto do vencimento.
+        Levanta RuntimeError se o token não for obtido: nenhuma chamada ao Graph sai sem ele.
+        """
+        with conexaoGraph._lock:
+            if not renovar and conexaoGraph._token and time.monotonic() < conexaoGraph._token_expira_em:
+                return conexaoGraph._token
+
+            url = f'{LOGIN_URL}/{tenant_id}/oauth2/v2.0/token'
+            data = {
+                'grant_type': 'client_credentials',
+                'client_id': client_id,
+                'client_secret': client_secret,
+                'scope': scope
+            }
+            conexaoGraph._token = None
+            try:
+                response = self._sessao_http().post(url, data=data)
+            except requests.RequestException as e:
+                logging.error(f'Falha ao obter token do Graph: {e}')
+                raise RuntimeError(f'Falha ao obter token do Graph: {e}') from e
+            resposta = _json_ou_vazio(response)
+            token = resposta.get('access_token')
+            if not token:
+                logging.error(f'Falha ao obter token do Graph: {response.status_code}: {response.text}')
+                raise RuntimeError(f'Falha ao obter token do Graph: HTTP {response.status_code}')
+
+            expira_em = int(resposta.get('expires_in', 3599))
+            conexaoGraph._token = token
+            conexaoGraph._token_expira_em = time.monotonic() + max(expira_em - MARGEM_RENOVACAO_TOKEN, 0)
+            return token
+
+    def _post_graph(self, caminho, payload):
+        """POST autenticado no Graph; renova o token uma vez se ele for rejeitado (401)."""
+        url = f'{GRAPH_URL}{caminho}'
+        response = None
+        for renovar in (False, True):
+            token = self.acessoTokenGraph(renovar=renovar)
+            headers = {
+                'Authorization': f'Bearer {token}',
+                'Content-Type': 'application/json'
+            }
+            response = self._sessao_http().post(url, headers=headers, data=json.dumps(payload))
+            if response.status_code != 401:
+                break
+        return response
+
+    def _montar_mensagem(self, lista_emails, assunto, corpo):
+        """Monta o payload do sendMail."""
+        destinatarios = [{'emailAddress': {'address': email}} for email in lista_emails]
+        return {
             'message': {
-                'subject': subject,
+                'subject': assunto,
                 'body': {
                     'contentType': 'HTML',
-                    'content': body
+                    'content': corpo
                 },
-                'toRecipients': to_recipients
+                'toRecipients': destinatarios
             }
         }
-        response = requests.post(url, headers=headers, data=json.dumps(email_msg))
+
+    def _enviar_mensagem(self, lista_emails, assunto, corpo):
+        """Chama o sendMail da caixa configurada em USER_MAIL."""
+        self._reservar_envio()
+        return self._post_graph(f'/users/{email_from}/sendMail', self._montar_mensagem(lista_emails, assunto, corpo))
+
+    def _enviar_lote(self, mensagens, indices):
+        """Envia até 20 mensagens em um único POST /$batch e devolve {indice: (status, retry_after)}."""
+        requisicoes = [
+            {
+                'id': str(indice),
+                'method': 'POST',
+                'url': f'/users/{email_from}/sendMail',
+                'headers': {'Content-Type': 'application/json'},
+                'body': self._montar_mensagem(*mensagens[indice])
+            }
+            for indice in indices
+        ]
+        self._reservar_envio(len(requisicoes))
+        response = self._post_graph('/$batch', {'requests': requisicoes})
+        if response.status_code != 200:
+            logging.error(f'Falha no envio em lote: {response.status_code}: {response.text}')
+            retry_after = response.headers.get('Retry-After')
+            return {indice: (response.status_code, retry_after) for indice in indices}
+
+        # Sem corpo JSON válido, as mensagens ficam sem status e são reenviadas
+        resultado = {indice: (None, None) for indice in indices}
+        for resposta in _json_ou_vazio(response).get('responses', []):
+            indice = int(resposta['id'])
+            retry_after = (resposta.get('headers') or {}).get('Retry-After')
+            resultado[indice] = (resposta.get('status'), retry_after)
+        return resultado
+
+    def enviar_emails_em_lote(self, mensagens, tentativas=graph_tentativas):
+        """
+        Envia várias mensagens (lista de tuplas (lista_emails, assunto, corpo))
+        agrupando até 20 sendMail por chamada ao /$batch.
+        Apenas as sub-requisições com falha transitória são reenviadas.
+        Retorna a lista de status HTTP na mesma ordem das mensagens.
+        """
+        status = [None] * len(mensagens)
+        pendentes = list(range(len(mensagens)))
+
+        for tentativa in range(tentativas):
+            retry_after = None
+            for inicio in range(0, len(pendentes), TAMANHO_LOTE_GRAPH):
+                lote = pendentes[inicio:inicio + TAMANHO_LOTE_GRAPH]
+                for indice, (codigo, retry_after_indice) in self._enviar_lote(mensagens, lote).items():
+                    status[indice] = codigo
+                    segundos = segundos_retry_after(retry_after_indice)
+                    if segundos is not None:
+                        retry_after = max(retry_after or 0.0, segundos)
+                        if codigo in STATUS_LIMITACAO:
+                            # Os próximos lotes (desta e das outras threads) já aguardam o Graph liberar
+                            conexaoGraph._limitador.pausar(segundos)
+
+            pendentes = [indice for indice in pendentes if status[indice] in STATUS_TRANSITORIOS or status[indice] is None]
+            limitadas = sum(1 for indice in pendentes if status[indice] in STATUS_LIMITACAO)
+            self._contar(limitadas=limitadas)
+            if not pendentes or tentativa == tentativas - 1:
+                break
+            self._contar(reenviadas=len(pendentes))
+            self._aguardar_nova_tentativa(
+                tentativa, retry_after, limitadas > 0,
+                f"{len(pendentes)} e-mail(s) do lote falharam ({limitadas} por limite do Graph)."
+            )
+
+        for (lista_emails, _, _), codigo in zip(mensagens, status):
+            if codigo == 202:
+                logging.info(f"Enviado e-mail para {lista_emails}")
+            else:
+                logging.error(f'Falha ao enviar email para {lista_emails}: {codigo}')
+        logging.info("------------------------------------------------------------------------------------")
+        return status
+
+    def enviaEmailGraph(self, email_to, subject, body):
+        email_group = email_to
+        response = self._enviar_mensagem(email_group, subject, body)
         if response.status_code == 202:
             logging.info(f"E-mail enviado para {email_group}")
             logging.info("------------------------------------------------------------------------------------")        
@@ -52,44 +250,28 @@ class conexaoGraph:
             logging.error(f'Falha ao enviar e-mail: {response.status_code}: {response.text}')
     
     # so essa função
-    def enviar_email(self, lista_emails, assunto, corpo):
+    def enviar_email(self, lista_emails, assunto, corpo, tentativas=graph_tentativas):
         email_group = lista_emails  
 
-        # Obter token de acesso
-        url = f'https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token'
-        data = {
-            'grant_type': 'client_credentials',
-            'client_id': client_id,
-            'client_secret': client_secret,
-            'scope': scope
-        }
-        response = requests.post(url, data=data)
-        token = response.json().get('access_token')
-
-        # Preparar lista de destinatários
-        destinatarios = [{'emailAddress': {'address': email}} for email in email_group]
-
-        # Enviar email
-        url = f'https://graph.microsoft.com/v1.0/users/{email_from}/sendMail'
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json'
-        }
-        mensagem = {
-            'message': {
-                'subject': assunto,
-                'body': {
-                    'contentType': 'HTML',
-                    'content': corpo
-                },
-                'toRecipients': destinatarios
-            }
-        }
-        response = requests.post(url, headers=headers, data=json.dumps(mensagem))
+        # Token em cache e conexão reaproveitada da sessão compartilhada; 429/5xx
+        # transitórios são reenviados respeitando o Retry-After
+        for tentativa in range(tentativas):
+            response = self._enviar_mensagem(email_group, assunto, corpo)
+            if response.status_code not in STATUS_TRANSITORIOS:
+                break
+            limitado = response.status_code in STATUS_LIMITACAO
+            self._contar(limitadas=int(limitado))
+            if tentativa == tentativas - 1:
+                break
+            self._contar(reenviadas=1)
+            self._aguardar_nova_tentativa(
+                tentativa, segundos_retry_after(response.headers.get('Retry-After')), limitado,
+                f"Envio para {email_group} recusado ({response.status_code})."
+            )
 
         if response.status_code == 202:
             logging.info(f"Enviado e-mail para {email_group}")
             logging.info("------------------------------------------------------------------------------------")
         else:
             logging.error(f'Falha ao enviar email: {response.status_code}: {response.text}')
-        # pass
\ No newline at end of file
+        return response.status_code
@@ -1,12 +1,169 @@
 import oracledb
 import logging
+import numpy as np
 import pandas as pd
-from dotenv import load_dotenv, find_dotenv
 import time
+from data.fonteDados import fonteDados, compactar_colunas, COLUNAS_SENIOR, CHAVE_REGISTRO
+from data.hierarquiaSenior import indiceHierarquia, QUERY_POSTOS, QUERY_OCUPANTES, COLUNAS_HIERARQUIA
+from utils.datasAniversario import dias_comemorados
+
+# Quantidade de linhas por ida ao banco (arraysize/prefetchrows) e por lote devolvido
+TAMANHO_LOTE_SENIOR = 5000
+
+# Expressão SQL de cada coluna da consulta. As colunas do gestor (Superior,
+# Email_superior, Situacao_superior, Matricula_superior e Empresa_superior) não
+# vêm da consulta: são resolvidas pelo índice da hierarquia (data.hierarquiaSenior)
+# a partir do posto de cada colaborador.
+EXPRESSOES_SENIOR = {
+    'Cpf': 'FUN.NUMCPF',
+    'Nome': 'FUN.NOMFUN',
+    'Situacao': 'FUN.SITAFA',
+    'Matricula': 'FUN.NUMCAD',
+    'Email_pessoal': 'EM.EMAPAR',
+    'Email_corporativo': 'EM.EMACOM',
+    'Data_admissao': 'FUN.DATADM',
+    'Data_demissao': 'FUN.DATAFA',
+    'Data_nascimento': 'FUN.DATNAS',
+    'Tempo_FGM': """ROUND((CASE 
+            WHEN FUN.DATAFA = TO_DATE('1900-12-31', 'YYYY-MM-DD') THEN SYSDATE
+            ELSE FUN.DATAFA
+            END - FUN.DATADM ) / 365.25, 2)""",
+    'Local': 'ORN.NOMLOC',
+}
+# Posto de trabalho do colaborador, selecionado ao final de toda consulta
+EXPRESSOES_POSTO = {
+    'Estpos': 'FUN.ESTPOS',
+    'Postra': 'FUN.POSTRA',
+}
+
+# Colunas usadas pela classificação (classificar_usuarios) e as extras de cada fluxo de e-mail
+COLUNAS_CLASSIFICACAO = [
+    'Cpf', 'Nome', 'Situacao', 'Matricula', 'Email_pessoal',
+    'Data_admissao', 'Data_demissao', 'Superior', 'Situacao_superior'
+]
+COLUNAS_POR_FLUXO = {
+    'empresa': ['Email_corporativo', 'Tempo_FGM', 'Email_superior', 'Local', 'Matricula_superior', 'Empresa_superior'],
+    'nascimento': ['Email_corporativo', 'Data_nascimento', 'Email_superior', 'Local', 'Matricula_superior', 'Empresa_superior'],
+}
+
+QUERY_COLABORADORES = """
+        SELECT
+            {colunas}
+        FROM
+            SENIOR.R034FUN FUN
+        INNER JOIN SENIOR.R030EMP EMP ON
+            FUN.NUMEMP = EMP.NUMEMP
+        INNER JOIN SENIOR.R024CAR CAR ON
+            FUN.CODCAR = CAR.CODCAR
+            AND FUN.ESTCAR = CAR.ESTCAR
+        INNER JOIN SENIOR.R034CPL EM ON
+            FUN.NUMCAD = EM.NUMCAD
+            AND FUN.NUMEMP = EM.NUMEMP
+        INNER JOIN SENIOR.R016ORN ORN ON
+            ORN.NUMLOC = FUN.NUMLOC
+        INNER JOIN SENIOR.R030FIL FIL ON
+            FUN.CODFIL = FIL.CODFIL
+            AND FUN.NUMEMP = FIL.NUMEMP
+        WHERE
+            FUN.TIPCOL = 1
+            AND CAR.TITCAR <> 'PENSIONISTA'
+            AND FUN.NUMEMP <> 100
+            {filtro}
+        ORDER BY
+            FUN.NUMCPF,
+            FUN.DATADM
+        """
+
+# Filtro da carga incremental: admissões e demissões lançadas a partir de :desde.
+# Alterações dos demais campos (e-mail, gestor, local...) só chegam na carga completa do snapshot
+FILTRO_DELTA = "AND (FUN.DATADM >= :desde OR FUN.DATAFA >= :desde)"
+# Chaves dos registros atuais, com os mesmos filtros da consulta completa: o snapshot
+# remove os registros excluídos (ou que deixaram de atender aos filtros) desde a carga completa
+QUERY_CHAVES = QUERY_COLABORADORES.format(
+    colunas=",\n            ".join(f'{EXPRESSOES_SENIOR[nome]} AS "{nome}"' for nome in CHAVE_REGISTRO),
+    filtro="",
+)
+
+def _converter_coluna(valores, tipo):
+    if tipo == 'datetime64[ns]':
+        # pd.to_datetime converte objetos datetime bem mais rápido que o numpy
+        return pd.to_datetime(np.array(valores, dtype=object)).as_unit('ns')
+    return np.array(valores, dtype=tipo)
+
+def _montar_lote(linhas, colunas=None, hierarquia=None):
+    """
+    Converte as tuplas do fetchmany em um DataFrame com colunas já tipadas.
+    Com 'hierarquia' (indiceHierarquia), as colunas do gestor são resolvidas pelo
+    posto de cada linha; um posto pai com vários ocupantes repete a linha, como a
+    junção da consulta fazia. Colunas não consultadas entram vazias, mantendo o
+    mesmo esquema do DataFrame, já com os tipos compactos.
+    """
+    colunas = _colunas_consultadas(colunas or list(COLUNAS_SENIOR)) + list(EXPRESSOES_POSTO)
+    valores = dict(zip(colunas, zip(*linhas))) if linhas else {}
+    quantidade = len(linhas)
+    if hierarquia is not None and linhas:
+        posicoes, gestores = hierarquia.resolver(valores['Estpos'], valores['Postra'])
+        valores = {nome: np.take(np.array(coluna, dtype=object), posicoes) for nome, coluna in valores.items()}
+        valores.update(gestores)
+        quantidade = len(posicoes)
+    return compactar_colunas(pd.DataFrame({
+        nome: _converter_coluna(valores.get(nome, [None] * quantidade), tipo)
+        for nome, tipo in COLUNAS_SENIOR.items()
+    }))
+
+def _concatenar(lotes):
+    """Junta os lotes; as categorias de cada lote são unificadas por compactar_colunas."""
+    return compactar_colunas(pd.concat(lotes, ignore_index=True)) if lotes else _montar_lote([])
+
+def _colunas_consultadas(colunas):
+    """Colunas que saem do SELECT (as do gestor vêm do índice da hierarquia)."""
+    return [nome for nome in colunas if nome not in COLUNAS_HIERARQUIA]
+
+def _selecionar_colunas(colunas):
+    expressoes = {nome: EXPRESSOES_SENIOR[nome] for nome in _colunas_consultadas(colunas)}
+    expressoes.update(EXPRESSOES_POSTO)
+    return ",\n            ".join(f'{expressao} AS "{nome}"' for nome, expressao in expressoes.items())
+
+def montar_consulta_aniversariantes(data_referencia, fluxos=('empresa', 'nascimento'), mensal=True):
+    """
+    Monta a consulta restrita aos CPFs com aniversário (de empresa e/ou de nascimento)
+    no dia de referência (com o 29/02 no 28/02 de anos não bissextos) e, se 'mensal',
+    no mês seguinte. Todos os registros desses CPFs voltam, para que a classificação de readmissões
+    seja a mesma da consulta completa. Retorna (query, parametros, colunas).
+    """
+    campos = {'empresa': 'DATADM', 'nascimento': 'DATNAS'}
+    mes_seguinte = data_referencia.month % 12 + 1
+    # Um par (:mes_N, :dia_N) por dia comemorado na data de referência
+    dias = dias_comemorados(data_referencia)
+    parametros = {}
+    for i, (mes, dia) in enumerate(dias):
+        parametros[f'mes_{i}'], parametros[f'dia_{i}'] = mes, dia
+    predicados = []
+    for fluxo in fluxos:
+        campo = f"F2.{campos[fluxo]}"
+        for i in range(len(dias)):
+            predicados.append(f"(EXTRACT(MONTH FROM {campo}) = :mes_{i} AND EXTRACT(DAY FROM {campo}) = :dia_{i})")
+        if mensal:
+            predicados.append(f"EXTRACT(MONTH FROM {campo}) = :mes_seguinte")
+    if mensal:
+        parametros['mes_seguinte'] = mes_seguinte
+
+    colunas = list(COLUNAS_CLASSIFICACAO)
+    for fluxo in fluxos:
+        colunas += [coluna for coluna in COLUNAS_POR_FLUXO[fluxo] if coluna not in colunas]
+    colunas = [coluna for coluna in COLUNAS_SENIOR if coluna in colunas]
+
+    filtro = (
+        "AND FUN.NUMCPF IN (SELECT F2.NUMCPF FROM SENIOR.R034FUN F2 WHERE "
+        + " OR ".join(predicados) + ")"
+    )
+    query = QUERY_COLABORADORES.format(colunas=_selecionar_colunas(colunas), filtro=filtro)
+    return query, parametros, colunas
+
+class conexaoSenior(fonteDados):
+    descricao = "banco de dados Senior"
 
-class conexaoSenior:
     def __init__(self, **kwargs):
-        load_dotenv(find_dotenv())
         self.connection = None
         self.cursor = None
         self.user_senior = kwargs.get("user_senior")
@@ -14,6 +171,8 @@ class conexaoSenior:
         self.host_senior = kwargs.get("host_senior")
         self.port_senior = kwargs.get("port_senior")
         self.service_name_senior = kwargs.get("service_name_senior")
+        # Índice da hierarquia de postos, lido uma vez por conexão (ver hierarquiaSenior)
+        self.hierarquia = None
 
     def conexaoBancoSenior(self, tentativas=3, atraso=5):
         """
@@ -42,6 +201,9 @@ class conexaoSenior:
                     return False
         return False
 
+    def conectar(self):
+        return self.conexaoBancoSenior()
+
     def desconectar(self):
         """Fecha o cursor e a conexão com o banco de dados de forma segura."""
         if self.cursor:
@@ -61,100 +223,125 @@ class conexaoSenior:
                 logging.error(f">Erro ao fechar a conexão: {e}")
             finally:
                 self.connection = None
+                self.hierarquia = None
+
+    def _consultar_tabela(self, query, tamanho_lote=TAMANHO_LOTE_SENIOR):
+        cursor = self.connection.cursor()
+        cursor.arraysize = tamanho_lote
+        cursor.prefetchrows = tamanho_lote + 1
+        try:
+            cursor.execute(query)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def carregarHierarquia(self):
+        """Lê os postos e os seus ocupantes (uma vez por conexão) e monta o índice da hierarquia."""
+        if self.hierarquia is None:
+            inicio = time.perf_counter()
+            self.hierarquia = indiceHierarquia(self._consultar_tabela(QUERY_POSTOS), self._consultar_tabela(QUERY_OCUPANTES))
+            logging.info(f">Hierarquia de postos carregada: {len(self.hierarquia)} postos em {time.perf_counter() - inicio:.2f}s.")
+        return self.hierarquia
+
+    def carregar(self):
+        """Extração completa, lida em lotes; erros do banco são propagados."""
+        return _concatenar(list(self.consultaDadosSeniorEmLotes()))
 
     def consultaDadosSenior(self):
         """
         Executa a consulta e retorna um DataFrame.
-        Usa pd.read_sql_query para simplificar a obtenção de dados.
+        Os registros são lidos em lotes e já chegam com os tipos finais (compactos) das colunas.
         """
         if not self.connection:
             logging.error("> Conexao com o banco de dados não foi estabelecida.")
             return pd.DataFrame() # Retorna DataFrame vazio
 
-        query = """
-                SELECT
-                    FUN.NUMCPF AS "Cpf",
-                    FUN.NOMFUN AS "Nome",
-                    FUN.SITAFA AS "Situacao",
-                    FUN.NUMCAD AS "Matricula",
-                    EM.EMAPAR AS "Email_pessoal",
-                    EM.EMACOM AS "Email_corporativo",
-                    FUN.DATADM AS "Data_admissao",
-                    FUN.DATAFA AS "Data_demissao",
-                    FUN.DATNAS AS "Data_nascimento",
-                    TO_CHAR(ROUND((CASE 
-                    WHEN FUN.DATAFA = TO_DATE('1900-12-31', 'YYYY-MM-DD') THEN SYSDATE
-                    ELSE FUN.DATAFA
-                    END - FUN.DATADM ) / 365.25, 2)) AS "Tempo_FGM",
-                    O.GESTOR AS "Superior",
-                    EMG.EMACOM AS "Email_superior",
-                    ORN.NOMLOC AS "Local",
-                    GEST.SITAFA AS "Situacao_superior"
-                FROM
-                    SENIOR.R034FUN FUN
-                INNER JOIN SENIOR.R030EMP EMP ON
-                    FUN.NUMEMP = EMP.NUMEMP
-                INNER JOIN SENIOR.R024CAR CAR ON
-                    FUN.CODCAR = CAR.CODCAR
-                    AND FUN.ESTCAR = CAR.ESTCAR
-                INNER JOIN SENIOR.R034CPL EM ON
-                    FUN.NUMCAD = EM.NUMCAD
-                    AND FUN.NUMEMP = EM.NUMEMP
-                INNER JOIN SENIOR.R016ORN ORN ON
-                    ORN.NUMLOC = FUN.NUMLOC
-                INNER JOIN SENIOR.R030FIL FIL ON
-                    FUN.CODFIL = FIL.CODFIL
-                    AND FUN.NUMEMP = FIL.NUMEMP
-                LEFT JOIN (
-                    SELECT
-                        A.ESTPOS,
-                        A.POSTRA,
-                        C.NUMCAD AS NUMCAD_GESTOR,
-                        C.NUMEMP AS NUMEMP_GESTOR,
-                        C.NOMFUN AS GESTOR
-                    FROM
-                        SENIOR.R017HIE A
-                    LEFT JOIN SENIOR.R017HIE B ON
-                        SUBSTR(A.POSPOS, 1, LENGTH(A.POSPOS)-2) = B.POSPOS
-                            AND A.ESTPOS = B.ESTPOS
-                            AND A.CODTHP = B.CODTHP
-                            AND A.REVHIE = B.REVHIE
-                        LEFT JOIN SENIOR.R034FUN C ON
-                            B.ESTPOS = C.ESTPOS
-                            AND B.POSTRA = C.POSTRA
-                        WHERE
-                            A.CODTHP = 1
-                ) O ON
-                    FUN.ESTPOS = O.ESTPOS
-                    AND FUN.POSTRA = O.POSTRA
-                LEFT JOIN SENIOR.R034CPL EMG ON
-                    O.NUMCAD_GESTOR = EMG.NUMCAD
-                    AND O.NUMEMP_GESTOR = EMG.NUMEMP
-                LEFT JOIN SENIOR.R034FUN GEST ON
-                    O.NUMCAD_GESTOR = GEST.NUMCAD
-                    AND O.NUMEMP_GESTOR = GEST.NUMEMP
-                WHERE
-                    FUN.TIPCOL = 1
-                    AND CAR.TITCAR <> 'PENSIONISTA'
-                    AND FUN.NUMEMP <> 100
-                ORDER BY
-                    FUN.NUMCPF,
-                    FUN.DATADM
-                """
         try:
             logging.info("-------------->>>Query---------------------------------")
-            # Usando read_sql_query para mais eficiência
-            df = pd.read_sql_query(query, self.connection)
-            # Renomeia as colunas para o padrão do projeto
-            df.columns = [
-                'Cpf','Nome','Situacao','Matricula','Email_pessoal','Email_corporativo',
-                'Data_admissao','Data_demissao','Data_nascimento','Tempo_FGM','Superior', 'Email_superior',
-                'Local','Situacao_superior'
-            ]
+            df = self.carregar()
             logging.info(f">Consulta executada com sucesso. {len(df)} registros encontrados.")
             return df
-        except (oracledb.DatabaseError, pd.io.sql.DatabaseError) as e:
+        except oracledb.DatabaseError as e:
             logging.error(f">Erro ao executar query: {e}")
             return pd.DataFrame() # Retorna DataFrame vazio em caso de erro
         finally:
-            logging.info("-------------->>>Script Rodando------------------------")
\ No newline at end of file
+            logging.info("-------------->>>Script Rodando------------------------")
+
+    def consultaDadosSeniorDelta(self, desde):
+        """
+        Consulta apenas os registros com admissão ou demissão a partir de 'desde'.
+        Retorna None em caso de erro, para não confundir falha com "nada mudou".
+        """
+        if not self.connection:
+            logging.error("> Conexao com o banco de dados não foi estabelecida.")
+            return None
+        try:
+            query = QUERY_COLABORADORES.format(colunas=_selecionar_colunas(COLUNAS_SENIOR), filtro=FILTRO_DELTA)
+            lotes = list(self.consultaDadosSeniorEmLotes(query=query, parametros={'desde': desde}))
+            df = _concatenar(lotes)
+            logging.info(f">Consulta incremental executada com sucesso. {len(df)} registros alterados desde {desde:%d/%m/%Y}.")
+            return df
+        except oracledb.DatabaseError as e:
+            logging.error(f">Erro ao executar query incremental: {e}")
+            return None
+
+    def consultaChavesSenior(self):
+        """
+        Chaves (CHAVE_REGISTRO) de todos os registros atuais, sem as demais colunas
+        nem a hierarquia. Retorna None em caso de erro.
+        """
+        if not self.connection:
+            logging.error("> Conexao com o banco de dados não foi estabelecida.")
+            return None
+        try:
+            linhas = self._consultar_tabela(QUERY_CHAVES)
+        except oracledb.DatabaseError as e:
+            logging.error(f">Erro ao executar query de chaves: {e}")
+            return None
+        valores = dict(zip(CHAVE_REGISTRO, zip(*linhas))) if linhas else {}
+        return pd.DataFrame({
+            nome: _converter_coluna(valores.get(nome, []), COLUNAS_SENIOR[nome]) for nome in CHAVE_REGISTRO
+        }).drop_duplicates().reset_index(drop=True)
+
+    def consultaDadosSeniorAniversariantes(self, data_referencia, fluxos=('empresa', 'nascimento'), mensal=True):
+        """
+        Consulta apenas os CPFs com aniversário no dia (e no mês seguinte, se 'mensal'),
+        com as colunas dos fluxos informados. Retorna DataFrame vazio em caso de erro.
+        """
+        if not self.connection:
+            logging.error("> Conexao com o banco de dados não foi estabelecida.")
+            return pd.DataFrame()
+        query, parametros, colunas = montar_consulta_aniversariantes(data_referencia, fluxos, mensal)
+        try:
+            logging.info("-------------->>>Query (aniversariantes)---------------")
+            lotes = list(self.consultaDadosSeniorEmLotes(query=query, parametros=parametros, colunas=colunas))
+            df = _concatenar(lotes)
+            logging.info(f">Consulta executada com sucesso. {len(df)} registros encontrados.")
+            return df
+        except oracledb.DatabaseError as e:
+            logging.error(f">Erro ao executar query: {e}")
+            return pd.DataFrame()
+
+    def consultaDadosSeniorEmLotes(self, tamanho_lote=TAMANHO_LOTE_SENIOR, query=None, parametros=None, colunas=None):
+        """
+        Executa a consulta com um cursor dedicado e devolve os registros em
+        DataFrames tipados, de 'tamanho_lote' linhas lidas por fetchmany (mais as
+        repetidas por postos pai com vários ocupantes).
+        Sem 'query', executa a consulta completa de colaboradores.
+        """
+        if query is None:
+            query = QUERY_COLABORADORES.format(colunas=_selecionar_colunas(COLUNAS_SENIOR), filtro="")
+        colunas = colunas or list(COLUNAS_SENIOR)
+        hierarquia = self.carregarHierarquia() if any(nome in COLUNAS_HIERARQUIA for nome in colunas) else None
+        cursor = self.connection.cursor()
+        cursor.arraysize = tamanho_lote
+        cursor.prefetchrows = tamanho_lote + 1
+        try:
+            cursor.execute(query, parametros or {})
+            while True:
+                linhas = cursor.fetchmany(tamanho_lote)
+                if not linhas:
+                    break
+                yield _montar_lote(linhas, colunas, hierarquia)
+        finally:
+            cursor.close()
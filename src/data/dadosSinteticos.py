@@ -0,0 +1,211 @@
+# src/data/dadosSinteticos.py
+"""
+Gerador de dados sintéticos no mesmo esquema de consultaDadosSenior.
+Serve para medir a classificação, a identificação de aniversariantes e a
+renderização sem acesso à base da Senior. A mesma semente gera sempre o mesmo
+DataFrame, com:
+- readmissões (retorno em menos e em mais de 6 meses);
+- colaboradores totalmente demitidos;
+- registros ativos duplicados (mesma admissão);
+- e-mails pessoais e corporativos ausentes;
+- uma hierarquia de gestores, incluindo gestores demitidos (Situacao_superior 7)
+  e colaboradores sem superior.
+"""
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from data.fonteDados import tipar_colunas
+
+# Data usada como "hoje" da extração quando nenhuma é informada
+DATA_EXTRACAO_PADRAO = datetime(2026, 5, 27)
+# Data de demissão gravada pela Senior para quem está ativo
+DATA_SEM_DEMISSAO = np.datetime64('1900-12-31', 'ns')
+
+# Perfil de cada CPF e a sua proporção na base
+ATIVO, READMITIDO, DEMITIDO, DUPLICADO = range(4)
+PROPORCAO_PERFIS = [0.82, 0.06, 0.10, 0.02]
+# Proporção de gestores entre os ativos e de colaboradores ligados a um gestor demitido
+PROPORCAO_GESTORES = 0.08
+PROPORCAO_GESTOR_DEMITIDO = 0.02
+PROPORCAO_SEM_SUPERIOR = 0.01
+PROPORCAO_SEM_EMAIL_PESSOAL = 0.03
+PROPORCAO_SEM_EMAIL_CORPORATIVO = 0.30
+PROPORCAO_GESTOR_SEM_EMAIL = 0.02
+
+PRIMEIROS_NOMES = [
+    'ANA', 'MARIA', 'JOAO', 'JOSE', 'PEDRO', 'LUCAS', 'GABRIEL', 'JULIA', 'FERNANDA', 'CARLOS',
+    'PAULO', 'MARCOS', 'BEATRIZ', 'LARISSA', 'RAFAEL', 'BRUNO', 'CAMILA', 'PATRICIA', 'DIEGO', 'ALINE',
+    'ANTONIO', 'FRANCISCO', 'LUIZ', 'EDUARDO', 'RICARDO', 'VITOR', 'MATEUS', 'THIAGO', 'GUSTAVO', 'LEONARDO',
+    'AMANDA', 'BRUNA', 'CAROLINA', 'DANIELA', 'GABRIELA', 'ISABELA', 'LETICIA', 'MARIANA', 'NATALIA', 'VANESSA',
+]
+SOBRENOMES = [
+    'SILVA', 'SANTOS', 'OLIVEIRA', 'SOUZA', 'RODRIGUES', 'FERREIRA', 'ALVES', 'PEREIRA', 'LIMA', 'GOMES',
+    'COSTA', 'RIBEIRO', 'MARTINS', 'CARVALHO', 'ROCHA', 'SCHMITT', 'MULLER', 'ZANELLA', 'BECKER', 'WEBER',
+    'ALMEIDA', 'LOPES', 'SOARES', 'FERNANDES', 'VIEIRA', 'BARBOSA', 'MOREIRA', 'MENDES', 'CARDOSO', 'TEIXEIRA',
+    'CORREIA', 'DIAS', 'MACHADO', 'NUNES', 'MARQUES', 'FREITAS', 'KRAUSE', 'HOFFMANN', 'BORGES', 'ARAUJO',
+]
+LOCAIS = [f'SETOR {numero:03d}' for numero in range(1, 61)]
+# Empresas (NUMEMP) dos colaboradores
+EMPRESAS = [1, 2, 3]
+
+def _dias(valores):
+    return np.asarray(valores, dtype='int64').astype('timedelta64[D]')
+
+def _nomes(rng, quantidade):
+    """Nome composto com dois sobrenomes, em maiúsculas como na Senior."""
+    primeiros = np.array(PRIMEIROS_NOMES, dtype=object)
+    sobrenomes = np.array(SOBRENOMES, dtype=object)
+    return (
+        primeiros[rng.integers(0, len(primeiros), quantidade)] + ' ' +
+        primeiros[rng.integers(0, len(primeiros), quantidade)] + ' ' +
+        sobrenomes[rng.integers(0, len(sobrenomes), quantidade)] + ' ' +
+        sobrenomes[rng.integers(0, len(sobrenomes), quantidade)]
+    )
+
+def _emails(prefixo, cpfs, dominio):
+    return np.array([f"{prefixo}{cpf}@{dominio}" for cpf in cpfs.tolist()], dtype=object)
+
+def _cpfs(rng, quantidade):
+    """CPFs distintos de até 11 dígitos (sem dígito verificador válido)."""
+    cpfs = np.unique(rng.integers(10**9, 10**11, int(quantidade * 1.01) + 10))
+    while len(cpfs) < quantidade:
+        cpfs = np.unique(np.r_[cpfs, rng.integers(10**9, 10**11, quantidade)])
+    return rng.permutation(cpfs)[:quantidade]
+
+def _registros_por_pessoa(rng, perfis):
+    quantidade = np.ones(len(perfis), dtype='int64')
+    readmitido = perfis == READMITIDO
+    quantidade[readmitido] = rng.choice([2, 3], readmitido.sum(), p=[0.75, 0.25])
+    quantidade[perfis == DUPLICADO] = 2
+    return quantidade
+
+def _perfis(rng, linhas):
+    """Perfil de cada CPF, com a quantidade de pessoas ajustada para somar exatamente 'linhas' registros."""
+    media = np.dot(PROPORCAO_PERFIS, [1, 2.25, 1, 2])
+    perfis = rng.choice(len(PROPORCAO_PERFIS), int(linhas / media) + 1, p=PROPORCAO_PERFIS)
+    quantidade = _registros_por_pessoa(rng, perfis)
+    cabem = np.cumsum(quantidade) <= linhas
+    perfis, quantidade = perfis[cabem], quantidade[cabem]
+    faltam = linhas - quantidade.sum()
+    perfis = np.r_[perfis, np.full(faltam, ATIVO)]
+    quantidade = np.r_[quantidade, np.ones(faltam, dtype='int64')]
+    return perfis, quantidade
+
+def _hierarquia(rng, perfis, ultimo_ativo):
+    """
+    Gestor de cada pessoa (índice da pessoa gestora, -1 sem superior).
+    Diretores não têm superior; os demais gestores respondem a um gestor de nível acima.
+    """
+    pessoas = len(perfis)
+    ativos = np.flatnonzero(ultimo_ativo)
+    gestores = rng.choice(ativos, max(1, int(len(ativos) * PROPORCAO_GESTORES)), replace=False)
+    nivel = np.minimum(rng.geometric(0.45, len(gestores)), 4)
+    nivel[0] = 1
+    superior = np.full(pessoas, -1, dtype='int64')
+    for atual in range(2, 5):
+        acima = gestores[nivel < atual]
+        do_nivel = gestores[nivel == atual]
+        superior[do_nivel] = acima[rng.integers(0, len(acima), len(do_nivel))]
+
+    # Equipes de tamanhos desiguais: poucos gestores com equipes grandes
+    liderados = np.setdiff1d(np.arange(pessoas), gestores)
+    peso = rng.lognormal(0, 0.8, len(gestores))
+    superior[liderados] = gestores[rng.choice(len(gestores), len(liderados), p=peso / peso.sum())]
+
+    # Posto de gestor ocupado por alguém já demitido
+    demitidos = np.flatnonzero(perfis == DEMITIDO)
+    com_demitido = rng.random(pessoas) < PROPORCAO_GESTOR_DEMITIDO
+    if len(demitidos):
+        superior[com_demitido] = demitidos[rng.integers(0, len(demitidos), com_demitido.sum())]
+    superior[rng.random(pessoas) < PROPORCAO_SEM_SUPERIOR] = -1
+    superior[gestores[nivel == 1]] = -1
+    return superior
+
+def gerar_colaboradores(linhas, semente=0, data_extracao=None):
+    """
+    DataFrame com 'linhas' registros no esquema (nomes, ordem e tipos) de
+    COLUNAS_SENIOR, ordenado por CPF e data de admissão como a consulta.
+    """
+    rng = np.random.default_rng(semente)
+    hoje = np.datetime64(data_extracao or DATA_EXTRACAO_PADRAO, 'D')
+    perfis, quantidade = _perfis(rng, linhas)
+    pessoas = len(perfis)
+
+    cpf = _cpfs(rng, pessoas)
+    nome = _nomes(rng, pessoas)
+    nascimento = hoje - _dias(rng.integers(18 * 365, 65 * 365, pessoas))
+    # Readmitidos entram há pelo menos 3 anos, para caberem as passagens anteriores
+    primeira_admissao = hoje - _dias(np.where(perfis == READMITIDO, rng.integers(3 * 365, 35 * 365, pessoas), rng.integers(30, 35 * 365, pessoas)))
+    local = np.array(LOCAIS, dtype=object)[rng.integers(0, len(LOCAIS), pessoas)]
+    email_pessoal = _emails('p', cpf, 'exemplo.com.br')
+    email_pessoal[rng.random(pessoas) < PROPORCAO_SEM_EMAIL_PESSOAL] = None
+    email_corporativo = _emails('c', cpf, 'empresa.com.br')
+
+    # --- Registros: uma linha por passagem pela empresa ---
+    pessoa = np.repeat(np.arange(pessoas), quantidade)
+    ordem = np.arange(len(pessoa)) - np.repeat(np.cumsum(quantidade) - quantidade, quantidade)
+    ultimo = ordem == quantidade[pessoa] - 1
+    perfil = perfis[pessoa]
+
+    admissao = primeira_admissao[pessoa].copy()
+    demissao = np.full(len(pessoa), DATA_SEM_DEMISSAO).astype('datetime64[D]')
+    situacao = rng.choice([1, 1, 1, 1, 2, 3], len(pessoa))
+    # Readmitidos: cada passagem anterior termina em demissão; o retorno vem em menos ou mais de 6 meses
+    readmitido = perfil == READMITIDO
+    for passagem in range(1, 3):
+        anterior = np.flatnonzero(readmitido & (ordem == passagem - 1) & (quantidade[pessoa] > passagem))
+        duracao = _dias(rng.integers(60, 6 * 365, len(anterior)))
+        intervalo = _dias(np.where(rng.random(len(anterior)) < 0.5, rng.integers(1, 180, len(anterior)), rng.integers(180, 4 * 365, len(anterior))))
+        demissao[anterior] = np.maximum(np.minimum(admissao[anterior] + duracao, hoje - _dias(2)), admissao[anterior])
+        admissao[anterior + 1] = np.minimum(demissao[anterior] + intervalo, hoje - _dias(1))
+        situacao[anterior] = 7
+    # Totalmente demitidos
+    demitido = perfil == DEMITIDO
+    demissao[demitido] = admissao[demitido] + ((hoje - admissao[demitido]) * rng.random(demitido.sum())).astype('timedelta64[D]')
+    situacao[demitido] = 7
+
+    fim = np.where(situacao == 7, demissao, hoje)
+    tempo_fgm = np.round((fim - admissao).astype('int64') / 365.25, 2)
+    # Matrículas distintas (como NUMCAD por empresa): a matrícula do gestor o identifica
+    matricula = rng.permutation(np.cumsum(rng.integers(1, 8, len(pessoa))))
+    # Duplicados: a segunda linha repete a primeira (mesma matrícula e admissão)
+    duplicada = (perfil == DUPLICADO) & (ordem == 1)
+    matricula[duplicada] = matricula[np.flatnonzero(duplicada) - 1]
+    situacao[duplicada] = situacao[np.flatnonzero(duplicada) - 1]
+
+    # --- Hierarquia: o superior é o mesmo em todas as passagens da pessoa ---
+    ultimo_ativo = np.zeros(pessoas, dtype=bool)
+    ultimo_ativo[pessoa[ultimo & (situacao != 7)]] = True
+    superior = _hierarquia(rng, perfis, ultimo_ativo)
+    email_gestor = email_corporativo.copy()
+    email_gestor[rng.random(pessoas) < PROPORCAO_GESTOR_SEM_EMAIL] = None
+    situacao_pessoa = np.full(pessoas, 1.0)
+    situacao_pessoa[pessoa[ultimo]] = situacao[ultimo]
+    email_corporativo[rng.random(pessoas) < PROPORCAO_SEM_EMAIL_CORPORATIVO] = None
+    # Identificação do gestor: matrícula do último registro e empresa da pessoa
+    matricula_pessoa = np.zeros(pessoas, dtype='int64')
+    matricula_pessoa[pessoa[ultimo]] = matricula[ultimo]
+    empresa_pessoa = np.array(EMPRESAS)[rng.integers(0, len(EMPRESAS), pessoas)]
+
+    superior_registro = superior[pessoa]
+    tem_superior = superior_registro >= 0
+    indice_superior = np.where(tem_superior, superior_registro, 0)
+    df = pd.DataFrame({
+        'Cpf': cpf[pessoa],
+        'Nome': nome[pessoa],
+        'Situacao': situacao,
+        'Matricula': matricula,
+        'Email_pessoal': email_pessoal[pessoa],
+        'Email_corporativo': email_corporativo[pessoa],
+        'Data_admissao': admissao,
+        'Data_demissao': demissao,
+        'Data_nascimento': nascimento[pessoa],
+        'Tempo_FGM': tempo_fgm,
+        'Superior': np.where(tem_superior, nome[indice_superior], None),
+        'Email_superior': np.where(tem_superior, email_gestor[indice_superior], None),
+        'Local': local[pessoa],
+        'Situacao_superior': np.where(tem_superior, situacao_pessoa[indice_superior], np.nan),
+        'Matricula_superior': np.where(tem_superior, matricula_pessoa[indice_superior], np.nan),
+        'Empresa_superior': np.where(tem_superior, empresa_pessoa[indice_superior], np.nan),
+    })
+    return tipar_colunas(df)
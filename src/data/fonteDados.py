@@ -0,0 +1,168 @@
+# src/data/fonteDados.py
+"""
+Fontes dos dados de colaboradores.
+Toda fonte devolve o mesmo DataFrame tipado (COLUNAS_SENIOR, ordenado por CPF e
+data de admissão): a Senior (conexaoSenior, Oracle) ou um arquivo local
+exportado dela (Parquet ou SQLite), que permite reproduzir a execução, inclusive
+com data_simulada, sem VPN nem acesso ao banco.
+"""
+import logging
+from abc import ABC, abstractmethod
+import numpy as np
+import pandas as pd
+from utils.datasAniversario import dias_comemorados
+
+# Colunas devolvidas pela consulta e o tipo de cada uma no DataFrame final
+COLUNAS_SENIOR = {
+    'Cpf': 'int64',
+    'Nome': object,
+    'Situacao': 'int64',
+    'Matricula': 'int64',
+    'Email_pessoal': object,
+    'Email_corporativo': object,
+    'Data_admissao': 'datetime64[ns]',
+    'Data_demissao': 'datetime64[ns]',
+    'Data_nascimento': 'datetime64[ns]',
+    'Tempo_FGM': 'float64',
+    'Superior': object,
+    'Email_superior': object,
+    'Local': object,
+    'Situacao_superior': 'float64',
+    'Matricula_superior': 'float64',
+    'Empresa_superior': 'float64',
+}
+
+# Tipos compactos aplicados ao DataFrame final (compactar_colunas): CPF numérico
+# (formatado com zeros só na renderização), situações como códigos int8, gestor e
+# local como categorias, e-mails como texto anulável (pd.NA nos ausentes) e a
+# matrícula/empresa do gestor (NUMCAD/NUMEMP) como inteiros anuláveis
+TIPOS_COMPACTOS = {
+    'Situacao': 'int8',
+    'Situacao_superior': 'Int8',
+    'Matricula_superior': 'Int64',
+    'Empresa_superior': 'Int16',
+    'Superior': 'category',
+    'Local': 'category',
+    'Email_pessoal': 'string',
+    'Email_corporativo': 'string',
+    'Email_superior': 'string',
+}
+
+# Chave de um registro (matrícula), usada pelo snapshot para mesclar o delta e remover excluídos
+CHAVE_REGISTRO = ['Cpf', 'Matricula', 'Data_admissao']
+
+# Fontes aceitas em FONTE_DADOS
+FONTES_DADOS = ('senior', 'parquet', 'sqlite')
+
+def compactar_colunas(df):
+    """
+    Aplica TIPOS_COMPACTOS às colunas presentes. Pode ser repetido: lotes ou
+    snapshots concatenados com categorias diferentes voltam a ser categorias.
+    """
+    tipos = {nome: tipo for nome, tipo in TIPOS_COMPACTOS.items() if nome in df.columns and str(df[nome].dtype) != tipo}
+    return df.astype(tipos) if tipos else df
+
+def tipar_colunas(df):
+    """Ajusta um DataFrame lido de arquivo ao esquema de COLUNAS_SENIOR (com TIPOS_COMPACTOS), na ordem da consulta."""
+    colunas = {}
+    for nome, tipo in COLUNAS_SENIOR.items():
+        valores = df[nome].reset_index(drop=True) if nome in df.columns else pd.Series([None] * len(df), dtype=object)
+        if tipo == 'datetime64[ns]':
+            colunas[nome] = pd.to_datetime(valores).astype(tipo)
+        elif tipo is object:
+            # Texto como object (e não o tipo 'str' do pandas), com None nos ausentes, como na consulta
+            textos = np.array(valores, dtype=object)
+            textos[valores.isna().to_numpy()] = None
+            colunas[nome] = pd.Series(textos, dtype=object)
+        else:
+            colunas[nome] = valores.astype(tipo)
+    tipado = compactar_colunas(pd.DataFrame(colunas))
+    return tipado.sort_values(['Cpf', 'Data_admissao'], kind='stable').reset_index(drop=True)
+
+def filtrar_delta(df, desde):
+    """Registros com admissão ou demissão a partir de 'desde' (como FILTRO_DELTA)."""
+    desde = pd.Timestamp(desde)
+    return df[(df['Data_admissao'] >= desde) | (df['Data_demissao'] >= desde)].reset_index(drop=True)
+
+def filtrar_aniversariantes(df, data_referencia, fluxos=('empresa', 'nascimento'), mensal=True):
+    """
+    Todos os registros dos CPFs com aniversário (de empresa e/ou de nascimento) no
+    dia de referência (com o 29/02 no 28/02 de anos não bissextos) e, se 'mensal',
+    no mês seguinte (como montar_consulta_aniversariantes).
+    """
+    campos = {'empresa': 'Data_admissao', 'nascimento': 'Data_nascimento'}
+    mes_seguinte = data_referencia.month % 12 + 1
+    dias = [mes * 100 + dia for mes, dia in dias_comemorados(data_referencia)]
+    mascara = np.zeros(len(df), dtype=bool)
+    for fluxo in fluxos:
+        datas = df[campos[fluxo]]
+        mascara |= (datas.dt.month * 100 + datas.dt.day).isin(dias).to_numpy()
+        if mensal:
+            mascara |= (datas.dt.month == mes_seguinte).to_numpy()
+    return df[df['Cpf'].isin(df.loc[mascara, 'Cpf'])].reset_index(drop=True)
+
+class fonteDados(ABC):
+    """
+    Interface comum das fontes. As fontes locais implementam apenas carregar();
+    a consulta incremental e a de aniversariantes são filtros sobre o DataFrame completo.
+    """
+    descricao = "fonte de dados"
+    # Exceções de leitura tratadas como falha da fonte
+    erros = (OSError, ValueError)
+
+    def conectar(self):
+        return True
+
+    def desconectar(self):
+        pass
+
+    @abstractmethod
+    def carregar(self):
+        """DataFrame completo, já no esquema de COLUNAS_SENIOR."""
+
+    def _ler(self):
+        try:
+            df = self.carregar()
+        except self.erros as e:
+            logging.error(f">Erro ao ler {self.descricao}: {e}")
+            return None
+        logging.info(f">Dados lidos de {self.descricao}. {len(df)} registros encontrados.")
+        return df
+
+    def consultaDadosSenior(self):
+        """Todos os registros. Retorna DataFrame vazio em caso de erro, como a Senior."""
+        df = self._ler()
+        return pd.DataFrame() if df is None else df
+
+    def consultaDadosSeniorDelta(self, desde):
+        """Registros com admissão ou demissão a partir de 'desde'; None em caso de erro."""
+        df = self._ler()
+        return None if df is None else filtrar_delta(df, desde)
+
+    def consultaChavesSenior(self):
+        """Chaves (CHAVE_REGISTRO) de todos os registros atuais; None em caso de erro."""
+        df = self._ler()
+        return None if df is None else df[CHAVE_REGISTRO].drop_duplicates().reset_index(drop=True)
+
+    def consultaDadosSeniorAniversariantes(self, data_referencia, fluxos=('empresa', 'nascimento'), mensal=True):
+        df = self.consultaDadosSenior()
+        return filtrar_aniversariantes(df, data_referencia, fluxos, mensal) if not df.empty else df
+
+def criar_fonte_dados(fonte, caminho=None, **credenciais_senior):
+    """
+    Fonte configurada em FONTE_DADOS. Os módulos de cada fonte só são importados
+    quando escolhidos: as fontes locais não precisam do oracledb.
+    """
+    fonte = (fonte or 'senior').lower()
+    if fonte == 'senior':
+        from data.conexaoSenior import conexaoSenior
+        return conexaoSenior(**credenciais_senior)
+    if not caminho:
+        raise ValueError(f"FONTE_DADOS={fonte} exige o caminho do arquivo em FONTE_DADOS_CAMINHO.")
+    if fonte == 'parquet':
+        from data.fonteParquet import fonteParquet
+        return fonteParquet(caminho)
+    if fonte == 'sqlite':
+        from data.fonteSqlite import fonteSqlite
+        return fonteSqlite(caminho)
+    raise ValueError(f"FONTE_DADOS inválida: {fonte}. Use uma de {', '.join(FONTES_DADOS)}.")
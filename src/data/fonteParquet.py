@@ -0,0 +1,20 @@
+# src/data/fonteParquet.py
+"""
+Fonte local em arquivo Parquet com a extração da Senior (ver script/exportarDados.py).
+"""
+import pyarrow.parquet as pq
+from data.fonteDados import fonteDados, tipar_colunas, COLUNAS_SENIOR
+
+class fonteParquet(fonteDados):
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.descricao = f"arquivo Parquet {caminho}"
+
+    def carregar(self):
+        # Só as colunas do esquema; memory-map evita uma cópia do arquivo em memória
+        colunas = [nome for nome in COLUNAS_SENIOR if nome in pq.read_schema(self.caminho).names]
+        return tipar_colunas(pq.read_table(self.caminho, columns=colunas, memory_map=True).to_pandas())
+
+def exportar_parquet(df, caminho):
+    """Grava o DataFrame (no esquema de COLUNAS_SENIOR) como Parquet."""
+    tipar_colunas(df).to_parquet(caminho, index=False)
@@ -0,0 +1,35 @@
+# src/data/fonteSqlite.py
+"""
+Fonte local em banco SQLite com a extração da Senior (ver script/exportarDados.py).
+Os registros ficam na tabela 'colaboradores', com as colunas de COLUNAS_SENIOR
+e as datas em texto ISO 8601.
+"""
+import sqlite3
+from contextlib import closing
+import pandas as pd
+from data.fonteDados import fonteDados, tipar_colunas, COLUNAS_SENIOR
+
+TABELA_COLABORADORES = 'colaboradores'
+
+class fonteSqlite(fonteDados):
+    erros = fonteDados.erros + (sqlite3.Error, pd.errors.DatabaseError)
+
+    def __init__(self, caminho, tabela=TABELA_COLABORADORES):
+        self.caminho = caminho
+        self.tabela = tabela
+        self.descricao = f"banco SQLite {caminho}"
+
+    def carregar(self):
+        # Modo somente leitura: um caminho errado não cria um banco vazio
+        with closing(sqlite3.connect(f"file:{self.caminho}?mode=ro", uri=True)) as conexao:
+            colunas = {linha[1] for linha in conexao.execute(f'PRAGMA table_info("{self.tabela}")')}
+            if not colunas:
+                raise ValueError(f"tabela '{self.tabela}' não encontrada")
+            selecionadas = ", ".join(f'"{nome}"' for nome in COLUNAS_SENIOR if nome in colunas)
+            df = pd.read_sql_query(f'SELECT {selecionadas} FROM "{self.tabela}"', conexao)
+        return tipar_colunas(df)
+
+def exportar_sqlite(df, caminho, tabela=TABELA_COLABORADORES):
+    """Grava o DataFrame (no esquema de COLUNAS_SENIOR) na tabela do banco SQLite, substituindo-a."""
+    with closing(sqlite3.connect(caminho)) as conexao, conexao:
+        tipar_colunas(df).to_sql(tabela, conexao, if_exists='replace', index=False)
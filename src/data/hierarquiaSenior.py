@@ -0,0 +1,129 @@
+# src/data/hierarquiaSenior.py
+"""
+Índice da hierarquia de postos (R017HIE) para resolver o gestor de cada colaborador.
+Em vez da auto-junção de R017HIE por SUBSTR(POSPOS) na consulta de colaboradores,
+os postos e os seus ocupantes são lidos uma única vez como tabelas simples e o
+posto pai de cada posto (o POSPOS sem os dois últimos dígitos, na mesma estrutura
+e revisão) é ligado em memória. O resultado reproduz a consulta antiga linha a linha:
+- um posto sem pai, ou cujo pai não tem ocupante, fica sem gestor;
+- todos os ocupantes do posto pai (inclusive demitidos) geram uma linha cada.
+Além do nome, cada gestor vem com a matrícula e a empresa (NUMCAD/NUMEMP), que o
+identificam nos e-mails de gestores mesmo quando há homônimos.
+"""
+import numpy as np
+import pandas as pd
+
+# Postos do tipo de hierarquia 1, com a revisão de cada um
+QUERY_POSTOS = """
+        SELECT
+            A.ESTPOS,
+            A.POSTRA,
+            A.POSPOS,
+            A.REVHIE
+        FROM
+            SENIOR.R017HIE A
+        WHERE
+            A.CODTHP = 1
+        """
+
+# Ocupantes de cada posto, com o e-mail corporativo, a situação e a identificação de cada um como gestor.
+# A situação vem de GEST, como na consulta antiga: a junção não filtra TIPCOL, então
+# um gestor com várias linhas em R034FUN (vários TIPCOL) gera uma linha para cada uma.
+QUERY_OCUPANTES = """
+        SELECT
+            C.ESTPOS,
+            C.POSTRA,
+            C.NOMFUN,
+            EMG.EMACOM,
+            GEST.SITAFA,
+            C.NUMCAD,
+            C.NUMEMP
+        FROM
+            SENIOR.R034FUN C
+        LEFT JOIN SENIOR.R034CPL EMG ON
+            C.NUMCAD = EMG.NUMCAD
+            AND C.NUMEMP = EMG.NUMEMP
+        LEFT JOIN SENIOR.R034FUN GEST ON
+            C.NUMCAD = GEST.NUMCAD
+            AND C.NUMEMP = GEST.NUMEMP
+        WHERE
+            C.ESTPOS IS NOT NULL
+            AND C.POSTRA IS NOT NULL
+        """
+
+COLUNAS_POSTOS = ['Estpos', 'Postra', 'Pospos', 'Revhie']
+COLUNAS_OCUPANTES = ['Estpos', 'Postra', 'Superior', 'Email_superior', 'Situacao_superior', 'Matricula_superior', 'Empresa_superior']
+# Chave do posto de um colaborador
+CHAVE_POSTO = ['Estpos', 'Postra']
+COLUNAS_HIERARQUIA = ['Superior', 'Email_superior', 'Situacao_superior', 'Matricula_superior', 'Empresa_superior']
+
+def _tabela(linhas, colunas):
+    return pd.DataFrame(list(linhas), columns=colunas, dtype=object)
+
+def _sem_chave_nula(df, chave):
+    """No SQL, NULL não casa com nada na junção; no merge do pandas, casaria com NULL."""
+    return df[df[chave].notna().all(axis=1)]
+
+def _posto_pai(pospos):
+    """SUBSTR(POSPOS, 1, LENGTH(POSPOS) - 2); no Oracle, o resultado vazio é NULL."""
+    texto = pospos.astype(object)
+    pai = texto.str[:-2]
+    return pai.where(texto.str.len() > 2)
+
+class indiceHierarquia:
+    def __init__(self, postos, ocupantes):
+        """
+        'postos' e 'ocupantes' são DataFrames (ou linhas) com as colunas de
+        QUERY_POSTOS e QUERY_OCUPANTES, na mesma ordem.
+        """
+        if not isinstance(postos, pd.DataFrame):
+            postos = _tabela(postos, COLUNAS_POSTOS)
+        if not isinstance(ocupantes, pd.DataFrame):
+            ocupantes = _tabela(ocupantes, COLUNAS_OCUPANTES)
+        postos = _sem_chave_nula(postos, CHAVE_POSTO)
+
+        # Ponteiro para o posto pai na mesma estrutura e revisão
+        filhos = postos.assign(Pai=_posto_pai(postos['Pospos']))[CHAVE_POSTO + ['Revhie', 'Pai']]
+        pais = _sem_chave_nula(postos, ['Estpos', 'Revhie', 'Pospos'])[['Estpos', 'Revhie', 'Pospos', 'Postra']]
+        pais = pais.rename(columns={'Pospos': 'Pai', 'Postra': 'Postra_pai'})
+        ligados = filhos.merge(pais, how='left', on=['Estpos', 'Revhie', 'Pai'], sort=False)
+
+        # Ocupantes do posto pai: nome, e-mail e situação do gestor
+        ocupantes = _sem_chave_nula(ocupantes, CHAVE_POSTO).rename(columns={'Postra': 'Postra_pai'})
+        superiores = ligados.merge(ocupantes, how='left', on=['Estpos', 'Postra_pai'], sort=False)
+        self.superiores = superiores[CHAVE_POSTO + COLUNAS_HIERARQUIA].reset_index(drop=True)
+
+        # Índice do posto: as linhas de cada posto ficam contíguas em 'ordem', a partir de 'inicio'
+        codigos, self._postos = pd.MultiIndex.from_frame(self.superiores[CHAVE_POSTO]).factorize()
+        self._ordem = np.argsort(codigos, kind='stable')
+        self._quantidade = np.bincount(codigos, minlength=len(self._postos))
+        self._inicio = np.cumsum(self._quantidade) - self._quantidade
+        self._valores = {coluna: self.superiores[coluna].to_numpy(dtype=object)[self._ordem] for coluna in COLUNAS_HIERARQUIA}
+
+    def __len__(self):
+        return len(self._postos)
+
+    def resolver(self, estpos, postra):
+        """
+        Gestor(es) de cada posto informado, sem junção: uma busca no índice e um np.repeat.
+        Retorna (posicoes, colunas): a posição de origem de cada linha resultante
+        (repetida quando o posto pai tem vários ocupantes) e as colunas de
+        COLUNAS_HIERARQUIA alinhadas a ela. Posto fora da hierarquia fica sem gestor.
+        """
+        chaves = pd.MultiIndex.from_arrays([pd.Index(estpos, dtype=object), pd.Index(postra, dtype=object)])
+        if len(self._postos) == 0:
+            return np.arange(len(chaves)), {coluna: np.full(len(chaves), None, dtype=object) for coluna in COLUNAS_HIERARQUIA}
+        posto = self._postos.get_indexer(chaves)
+        achou = posto >= 0
+        posto = np.where(achou, posto, 0)
+        quantidade = np.where(achou, self._quantidade[posto], 1)
+        posicoes = np.repeat(np.arange(len(chaves)), quantidade)
+        deslocamento = np.arange(len(posicoes)) - np.repeat(np.cumsum(quantidade) - quantidade, quantidade)
+        linhas = np.repeat(self._inicio[posto], quantidade) + deslocamento
+        achou = np.repeat(achou, quantidade)
+        colunas = {}
+        for coluna, valores in self._valores.items():
+            resolvidos = np.full(len(posicoes), None, dtype=object)
+            resolvidos[achou] = valores[linhas[achou]]
+            colunas[coluna] = resolvidos
+        return posicoes, colunas
@@ -0,0 +1,121 @@
+# src/data/snapshotSenior.py
+"""
+Snapshot local (Arrow IPC) da extração da Senior.
+A carga completa acontece a cada 'dias_carga_completa' dias (por data de
+calendário), quando o arquivo não existe ou quando o esquema das colunas muda.
+Nas demais execuções, duas consultas leves atualizam o snapshot, lido via memory-map:
+- o delta, com os registros de admissão ou demissão recentes, que substituem os do snapshot;
+- as chaves dos registros atuais, para remover os excluídos (ou que deixaram de
+  atender aos filtros da consulta) desde a carga completa.
+A Senior não marca a data de alteração dos demais campos: mudanças de e-mail,
+gestor, nome, local, situação ou tempo de FGM sem admissão/demissão só chegam
+na próxima carga completa.
+"""
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+import pandas as pd
+import pyarrow as pa
+from data.fonteDados import compactar_colunas, COLUNAS_SENIOR, CHAVE_REGISTRO, TIPOS_COMPACTOS
+
+# Colunas de texto sem tipo compacto (object no DataFrame da consulta)
+TEXTOS_LIVRES = [nome for nome, tipo in COLUNAS_SENIOR.items() if tipo is object and nome not in TIPOS_COMPACTOS]
+# Lançamentos retroativos de admissão/demissão entram com datas passadas
+MARGEM_DELTA_DIAS = 35
+
+class snapshotSenior:
+    def __init__(self, fonte, caminho, dias_carga_completa=7):
+        """
+        'fonte' é uma fonteDados (Senior ou arquivo local), com consultaDadosSenior(),
+        consultaDadosSeniorDelta(desde) e consultaChavesSenior().
+        'dias_carga_completa' é o intervalo, em dias de calendário, entre as cargas completas.
+        """
+        self.fonte = fonte
+        self.caminho = caminho
+        self.caminho_metadados = f"{caminho}.json"
+        self.dias_carga_completa = dias_carga_completa
+
+    def _ler_metadados(self):
+        if not (os.path.exists(self.caminho) and os.path.exists(self.caminho_metadados)):
+            return None
+        with open(self.caminho_metadados, encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+
+    def _precisa_carga_completa(self, metadados, agora):
+        if metadados is None:
+            logging.info(">Snapshot inexistente. Executando carga completa.")
+            return True
+        if metadados.get('colunas') != list(COLUNAS_SENIOR):
+            logging.info(">Esquema do snapshot diferente do atual. Executando carga completa.")
+            return True
+        ultima_carga_completa = datetime.fromisoformat(metadados['ultima_carga_completa'])
+        if (agora.date() - ultima_carga_completa.date()).days >= self.dias_carga_completa:
+            logging.info(f">Última carga completa do snapshot em {ultima_carga_completa:%d/%m/%Y}. Executando carga completa.")
+            return True
+        return False
+
+    def _gravar(self, df, metadados):
+        """Grava o snapshot e os metadados em arquivos temporários antes de substituir os atuais."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.caminho)), exist_ok=True)
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+        temporario = f"{self.caminho}.tmp"
+        with pa.OSFile(temporario, 'wb') as arquivo, pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+            escritor.write_table(tabela)
+        os.replace(temporario, self.caminho)
+        with open(f"{self.caminho_metadados}.tmp", 'w', encoding='utf-8') as arquivo:
+            json.dump(metadados, arquivo)
+        os.replace(f"{self.caminho_metadados}.tmp", self.caminho_metadados)
+
+    def carregar(self):
+        """Lê o snapshot com memory-map, sem consultar a Senior."""
+        with pa.memory_map(self.caminho, 'r') as arquivo:
+            df = pa.ipc.open_file(arquivo).read_all().to_pandas()
+        # O pandas lê o texto do Arrow como 'str'; as colunas de texto livre voltam a object, como na consulta
+        textos = [nome for nome in TEXTOS_LIVRES if nome in df.columns and df[nome].dtype != object]
+        for nome in textos:
+            valores = df[nome].to_numpy(dtype=object)
+            valores[df[nome].isna().to_numpy()] = None
+            df[nome] = pd.Series(valores, index=df.index, dtype=object)
+        return compactar_colunas(df)
+
+    def _mesclar(self, base, delta, chaves):
+        """
+        Aplica o delta sobre o snapshot: as linhas do snapshot com uma chave presente
+        no delta são substituídas pelas do delta, e as com uma chave ausente de
+        'chaves' (registros atuais) são removidas. A chave pode se repetir (ex.: posto
+        pai com vários ocupantes, registros duplicados), então não há deduplicação global.
+        """
+        chaves_base = pd.MultiIndex.from_frame(base[CHAVE_REGISTRO])
+        alteradas = chaves_base.isin(pd.MultiIndex.from_frame(delta[CHAVE_REGISTRO]))
+        atuais = chaves_base.isin(pd.MultiIndex.from_frame(chaves[CHAVE_REGISTRO]))
+        removidas = ~alteradas & ~atuais
+        if removidas.any():
+            logging.info(f">{removidas.sum()} registros do snapshot excluídos na origem.")
+        df = compactar_colunas(pd.concat([base[~alteradas & atuais], delta], ignore_index=True))
+        return df.sort_values(['Cpf', 'Data_admissao'], kind='stable').reset_index(drop=True)
+
+    def atualizar(self, agora=None):
+        """Atualiza o snapshot (carga completa ou incremental) e devolve o DataFrame mesclado."""
+        agora = agora or datetime.now()
+        metadados = self._ler_metadados()
+
+        if self._precisa_carga_completa(metadados, agora):
+            df = self.fonte.consultaDadosSenior()
+            if df.empty:
+                logging.warning(">Carga completa sem registros. Snapshot anterior mantido.")
+                return self.carregar() if metadados else df
+            metadados = {'colunas': list(COLUNAS_SENIOR), 'ultima_carga_completa': agora.isoformat()}
+        else:
+            desde = datetime.fromisoformat(metadados['ultima_atualizacao']) - timedelta(days=MARGEM_DELTA_DIAS)
+            delta = self.fonte.consultaDadosSeniorDelta(desde)
+            chaves = self.fonte.consultaChavesSenior() if delta is not None else None
+            if chaves is None:
+                logging.warning(">Falha na consulta incremental. Usando o snapshot anterior.")
+                return self.carregar()
+            df = self._mesclar(self.carregar(), delta, chaves)
+
+        metadados['ultima_atualizacao'] = agora.isoformat()
+        self._gravar(df, metadados)
+        logging.info(f">Snapshot atualizado em {self.caminho} com {len(df)} registros.")
+        return self.carregar()
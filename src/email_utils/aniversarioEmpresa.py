@@ -1,48 +1,32 @@
 # src/email_utils/aniversarioEmpresa.py
 import logging
-from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
 from dateutil.relativedelta import relativedelta
-from utils.utilitariosComuns import utilitariosComuns
-from data.conexaoGraph import conexaoGraph
-from email_utils.email_config import EMAIL_TEMPLATES
-from utils.config import pictureBirth, linkRedirect
-import pandas as pd
-import locale
-import os
-
-locale.setlocale(locale.LC_TIME, 'pt_BR.UTF-8')
-EMAIL_RH = os.getenv("EMAIL_RH", "comunicacaointerna@fgmdentalgroup.com")
-EMAIL_TESTE = [
-    os.getenv("EMAIL_TESTE", "sophia.alberton@fgmdentalgroup.com"),
-    "sophia.alberton@fgmdentalgroup.com"
-]
-AMBIENTE = os.getenv("AMBIENTE", "QAS")
+from utils.utilitariosComuns import utilitariosComuns, corpo_email_com_imagem
+from email_utils.modelosEmail import MODELOS_EMAIL
+from utils.config import configurar_locale
+
+@lru_cache(maxsize=None)
+def _corpo_tempo_de_casa(anos, e_star):
+    """Corpo do e-mail de tempo de casa; é o mesmo para todos com os mesmos anos (e tipo Star)."""
+    imagem_sufixo = "-anos-estrela.jpg" if e_star else "-anos.jpg"
+    imagem_src = f"https://fgmdentalgroup.com/wp-content/uploads/2025/02/{anos}{imagem_sufixo}"
+    link_redirect = f"https://fgmdentalgroup.com/Endomarketing/Tempo%20de%20casa/{anos}%20anos/index.html" if e_star else "https://fgmdentalgroup.com/Endomarketing/Tempo%20de%20casa/Geral/index.html"
+    return corpo_email_com_imagem(imagem_src=imagem_src, texto_alt=f"{anos} anos de FGM!", link=link_redirect)
 
 class aniversarioEmpresa:
-    def __init__(self):
-        self.utilitariosComuns = utilitariosComuns()
-        self.conexaoGraph = conexaoGraph()
-
-    def _deve_enviar_email_mensal(self, data_referencia):
-        """Verifica se o e-mail mensal deve ser enviado com base na data."""
-        if AMBIENTE == "PRD" and data_referencia.day != 27:
-            logging.info("Hoje não é dia 27. E-mail mensal não será enviado.")
-            return False
-        return True
-
-    def enviar_email_rh_aniversariante_empresa_duplicados(self, aniversariantes_df_mais_6_meses, aniversariantes_df_menos_6_meses, data_simulada=None):
-        """Envia o e-mail consolidado para a Vanessa com duas listas de aniversariantes de tempo de empresa com múltiplas admissões."""
-        data_referencia = data_simulada or datetime.now()
-        if not self._deve_enviar_email_mensal(data_referencia):
-            return
-
-        if aniversariantes_df_mais_6_meses.empty and aniversariantes_df_menos_6_meses.empty:
-            logging.info("Nenhum aniversariante de tempo de empresa com múltiplas admissões para o próximo mês. E-mail para Vanessa não enviado.")
-            return
+    def __init__(self, utilitarios=None):
+        """'utilitarios' permite compartilhar o mesmo utilitariosComuns (e cliente do Graph) entre os fluxos."""
+        configurar_locale()
+        self.utilitariosComuns = utilitarios or utilitariosComuns()
 
-        template = EMAIL_TEMPLATES["RH_ANIVERSARIANTES_EMPRESA_DUPLICADOS"]
-        mes_seguinte = (data_referencia + relativedelta(months=1)).strftime("%B").title()
+    def enviar_email_rh_aniversariante_empresa_duplicados(self, plano):
+        """Envia o e-mail consolidado para a Vanessa com duas listas de aniversariantes de tempo de empresa com múltiplas admissões."""
+        template = MODELOS_EMAIL["RH_ANIVERSARIANTES_EMPRESA_DUPLICADOS"]
+        mes_seguinte = (plano.data_referencia + relativedelta(months=1)).strftime("%B").title()
         assunto = f"Aniversariantes de tempo de empresa com múltiplas admissões - {mes_seguinte}"
+        mensagem = template.formatar("mensagem", mes_seguinte=mes_seguinte)
 
         def gerar_tabela(df, titulo):
             try:
@@ -51,184 +35,145 @@ class aniversarioEmpresa:
                 df = df.copy()
                 df['DiaMes'] = df['Data_primeira_admissao'].dt.strftime('%m-%d')
                 df = df.sort_values(by='DiaMes')
-                dados_tabela = [
-                    [row['Nome'], row['Data_primeira_admissao'].strftime('%d/%m/%Y'), row['Tempo_total_anos']]
-                    for _, row in df.iterrows()
-                ]
+                dados_tabela = df[['Nome', 'Data_primeira_admissao', 'Tempo_total_anos']].assign(
+                    Data_primeira_admissao=df['Data_primeira_admissao'].dt.strftime('%d/%m/%Y')
+                )
                 colunas_tabela = template["colunas"]
                 return self.utilitariosComuns.gerar_corpo_email_aniversariantes_duplicados(titulo, "", colunas_tabela, dados_tabela)
             except Exception as e:
                 logging.error(f"Erro ao gerar tabela para '{titulo}': {e}")
                 return f"<p><strong>{titulo}:</strong> Erro ao gerar tabela.</p>"
 
-        corpo_menos_6_meses = gerar_tabela(aniversariantes_df_menos_6_meses, "Lista dos que retornaram em menos de 6 meses fora")
-        corpo_mais_6_meses = gerar_tabela(aniversariantes_df_mais_6_meses, "Lista dos que retornaram em mais de 6 meses fora")
-
-        body = f"""
-        <p>{template['saudacao']}</p>
-        <p>{template['mensagem'].format(mes_seguinte=mes_seguinte)}</p>
+        itens = plano.pendentes("RH_ANIVERSARIANTES_EMPRESA_DUPLICADOS")
+        mensagens = []
+        for item in itens:
+            aniversariantes_df = plano.dados(item)
+            menos_6_meses = aniversariantes_df['Retorno_menos_6_meses'].astype(bool)
+            corpo_menos_6_meses = gerar_tabela(aniversariantes_df[menos_6_meses], "Lista dos que retornaram em menos de 6 meses fora")
+            corpo_mais_6_meses = gerar_tabela(aniversariantes_df[~menos_6_meses], "Lista dos que retornaram em mais de 6 meses fora")
+
+            body = f"""
+        <p>{template.formatar('saudacao')}</p>
+        <p>{mensagem}</p>
         {corpo_menos_6_meses}
         <br>
         {corpo_mais_6_meses}
         """
 
-        logging.info(f"Enviando e-mail para Vanessa com {len(aniversariantes_df_menos_6_meses)} (menos de 6 meses) e {len(aniversariantes_df_mais_6_meses)} (mais de 6 meses) aniversariantes.")
-        self.utilitariosComuns.enviar_email_formatado(EMAIL_TESTE, assunto, body)
+            logging.info(f"Enviando e-mail para Vanessa com {menos_6_meses.sum()} (menos de 6 meses) e {(~menos_6_meses).sum()} (mais de 6 meses) aniversariantes.")
+            mensagens.append((item.destinatarios, assunto, body))
+        return self.utilitariosComuns.enviar_emails_plano(plano, itens, mensagens)
 
-    def enviar_email_rh_aniversariante_empresa(self, aniversariantes_df, data_simulada=None):
+    def enviar_email_rh_aniversariante_empresa(self, plano):
         """Envia o e-mail consolidado para o RH."""
-        data_referencia = data_simulada or datetime.now()
-        if not self._deve_enviar_email_mensal(data_referencia):
-            return
-
-        if aniversariantes_df.empty:
-            logging.info("Nenhum aniversariante de tempo de empresa para o proximo mes. E-mail para o RH nao enviado.")
-            return
-
-        template = EMAIL_TEMPLATES["RH_ANIVERSARIANTES_EMPRESA"]
-        mes_seguinte = (data_referencia + relativedelta(months=1)).strftime("%B").title()
-        assunto = template["assunto"].format(mes_seguinte=mes_seguinte)
-        
-        aniversariantes_df = aniversariantes_df.copy()
-        aniversariantes_df['DiaMes'] = aniversariantes_df['Data_admissao'].dt.strftime('%m-%d')
-        aniversariantes_df = aniversariantes_df.sort_values(by='DiaMes')
-
-        dados_tabela = [
-            [row['Nome'], row['Data_admissao'].strftime('%d/%m/%Y'), row['Anos_de_casa'], row.get('Local', 'N/A'), row.get('Superior', 'N/A')]
-            for _, row in aniversariantes_df.iterrows()
-        ]
-            
-        body = self.utilitariosComuns.gerar_corpo_email_aniversariantes(
-            template["saudacao"],
-            template["mensagem"].format(mes_seguinte=mes_seguinte),
-            template["colunas"],
-            dados_tabela
-        )
-
-        logging.info(f"Enviando e-mail para o RH com {len(dados_tabela)} aniversariantes.")
-        self.utilitariosComuns.enviar_email_formatado([EMAIL_RH], assunto, body)
-
-    def enviar_emails_gestores_aniversariante_empresa(self, aniversariantes_df, data_simulada=None):
-        """Envia e-mails individuais para cada gestor com seus liderados."""
-        data_referencia = data_simulada or datetime.now()
-        if not self._deve_enviar_email_mensal(data_referencia):
-            return
-
-        if aniversariantes_df.empty:
-            logging.info("Nenhum aniversariante para notificar os gestores.")
-            return
-
-        template = EMAIL_TEMPLATES["GESTOR_ANIVERSARIANTES_EMPRESA"]
-        mes_seguinte = (data_referencia + relativedelta(months=1)).strftime("%B").title()
-        assunto = template["assunto"].format(mes_seguinte=mes_seguinte)
-        
-        for gestor, grupo in aniversariantes_df.groupby('Superior'):
-            email_gestor = grupo['Email_superior'].iloc[0]
-            if not email_gestor or pd.isna(email_gestor):
-                logging.warning(f"Gestor {gestor} nao possui e-mail cadastrado. Pulando notificacao.")
-                continue
-            
-            nome_gestor_formatado = self.utilitariosComuns.formatar_nome(gestor)
-            
-            grupo = grupo.copy()
-            grupo['DiaMes'] = grupo['Data_admissao'].dt.strftime('%m-%d')
-            grupo = grupo.sort_values(by='DiaMes')
-            dados_tabela = [
-                [row['Nome'], row['Data_admissao'].strftime('%d/%m/%Y'), row['Anos_de_casa']]
-                for _, row in grupo.iterrows()
-            ]
+        template = MODELOS_EMAIL["RH_ANIVERSARIANTES_EMPRESA"]
+        mes_seguinte = (plano.data_referencia + relativedelta(months=1)).strftime("%B").title()
+        assunto = template.formatar("assunto", mes_seguinte=mes_seguinte)
+        mensagem = template.formatar("mensagem", mes_seguinte=mes_seguinte)
+
+        itens = plano.pendentes("RH_ANIVERSARIANTES_EMPRESA")
+        mensagens = []
+        for item in itens:
+            aniversariantes = sorted(plano.registros(item), key=attrgetter('dia_mes_admissao'))
+            dados_tabela = [[c.nome, c.admissao, c.anos_de_casa, c.local, c.superior] for c in aniversariantes]
 
             body = self.utilitariosComuns.gerar_corpo_email_aniversariantes(
-                template["saudacao"].format(nome_gestor=nome_gestor_formatado),
-                template["mensagem"].format(mes_seguinte=mes_seguinte),
+                template.formatar("saudacao"),
+                mensagem,
                 template["colunas"],
                 dados_tabela
             )
 
-            logging.info(f"Enviando e-mail para o gestor {gestor} ({email_gestor}) com {len(dados_tabela)} aniversariantes.")
-            self.utilitariosComuns.enviar_email_formatado([email_gestor], assunto, body)
-    
-    def _enviar_email_individual(self, row, template, hoje_str, e_star=False):
-        """Envia um e-mail individual de aniversário de tempo de empresa."""
-        nome = self.utilitariosComuns.formatar_nome(row['Nome'])
-        anos = row['Anos_de_casa']
-        destinatarios = [email for email in [row.get('Email_corporativo'), row.get('Email_pessoal')] if email and not pd.isna(email)]
-
-        if not destinatarios:
-            logging.warning(f"{nome} não possui e-mail válido cadastrado. Pulando envio.")
-            return
-
-        assunto = template["assunto"].format(nome=nome, anos_de_casa=anos)
-        
-        imagem_sufixo = "-anos-estrela.jpg" if e_star else "-anos.jpg"
-        imagem_src = f"https://fgmdentalgroup.com/wp-content/uploads/2025/02/{anos}{imagem_sufixo}"
-        link_redirect = f"https://fgmdentalgroup.com/Endomarketing/Tempo%20de%20casa/{anos}%20anos/index.html" if e_star else "https://fgmdentalgroup.com/Endomarketing/Tempo%20de%20casa/Geral/index.html"
-
-        corpo_email = self.utilitariosComuns.gerar_email_com_imagem(
-            imagem_src=imagem_src,
-            texto_alt=f"{anos} anos de FGM!",
-            link=link_redirect
-        )
-        
-        tipo_email = "STAR " if e_star else ""
-        logging.info(f"Enviando e-mail {tipo_email}de parabéns (tempo de empresa) para {nome} ({', '.join(destinatarios)}).")
-        self.utilitariosComuns.enviar_email_formatado(destinatarios, assunto, corpo_email)
+            logging.info(f"Enviando e-mail para o RH com {len(dados_tabela)} aniversariantes.")
+            mensagens.append((item.destinatarios, assunto, body))
+        return self.utilitariosComuns.enviar_emails_plano(plano, itens, mensagens)
 
-    def enviar_email_individual_aniversariante_empresa(self, aniversariantes_df, data_simulada=None):
-        """Envia e-mails individuais para cada colaborador aniversariante de tempo de empresa no dia."""
-        if aniversariantes_df.empty:
-            logging.info("Nenhum aniversariante de tempo de empresa hoje.")
-            return
-        template = EMAIL_TEMPLATES["INDIVIDUAL_ANIVERSARIANTE_EMPRESA"]
-        hoje = data_simulada or datetime.now()
-        hoje_str = hoje.strftime('%d/%m/%Y')
+    def secao_gestor(self, plano, item, gestor):
+        """
+        Mensagem, colunas e linhas da tabela de uma mensagem de gestor do fluxo
+        (mensal ou diária); é também a seção do fluxo no e-mail consolidado do gestor.
+        """
+        template = MODELOS_EMAIL[item.tipo]
+        if item.tipo == "GESTOR_ANIVERSARIANTES_EMPRESA":
+            mes_seguinte = (plano.data_referencia + relativedelta(months=1)).strftime("%B").title()
+            mensagem = template.formatar("mensagem", mes_seguinte=mes_seguinte)
+            liderados = sorted(gestor.liderados, key=attrgetter('dia_mes_admissao'))
+        else:
+            mensagem = template.formatar("mensagem", hoje_str=plano.data_referencia.strftime('%d/%m/%Y'))
+            liderados = gestor.liderados
+        return mensagem, template["colunas"], [[c.nome, c.admissao, c.anos_de_casa] for c in liderados]
+
+    def enviar_emails_gestores_aniversariante_empresa(self, plano):
+        """Envia e-mails individuais para cada gestor com seus liderados."""
+        template = MODELOS_EMAIL["GESTOR_ANIVERSARIANTES_EMPRESA"]
+        mes_seguinte = (plano.data_referencia + relativedelta(months=1)).strftime("%B").title()
+        assunto = template.formatar("assunto", mes_seguinte=mes_seguinte)
 
-        for _, row in aniversariantes_df.iterrows():
-            self._enviar_email_individual(row, template, hoje_str)
+        itens = plano.pendentes("GESTOR_ANIVERSARIANTES_EMPRESA")
+        mensagens = []
+        for item in itens:
+            gestor = plano.gestor(item)
+            nome_gestor_formatado = self.utilitariosComuns.formatar_nome(gestor.nome)
+            mensagem, colunas, dados_tabela = self.secao_gestor(plano, item, gestor)
 
-    def enviar_email_individual_aniversariante_empresa_star(self, aniversariantes_df, data_simulada=None):
-        """Envia e-mails individuais para colaboradores que fazem aniversário de tempo de casa (Star)."""
-        if aniversariantes_df.empty:
-            logging.info("Nenhum aniversariante de tempo de casa (STAR) hoje.")
-            return
+            body = self.utilitariosComuns.gerar_corpo_email_aniversariantes(
+                template.formatar("saudacao", nome_gestor=nome_gestor_formatado),
+                mensagem,
+                colunas,
+                dados_tabela
+            )
 
-        template = EMAIL_TEMPLATES["INDIVIDUAL_ANIVERSARIANTE_EMPRESA"]
-        hoje = data_simulada or datetime.now()
-        hoje_str = hoje.strftime('%d/%m/%Y')
+            logging.info(f"Enviando e-mail para o gestor {gestor.nome} ({gestor.email}) com {len(dados_tabela)} aniversariantes.")
+            mensagens.append((item.destinatarios, assunto, body))
+        return self.utilitariosComuns.enviar_emails_plano(plano, itens, mensagens)
 
-        for _, row in aniversariantes_df.iterrows():
-            self._enviar_email_individual(row, template, hoje_str, e_star=True)
+    def _montar_email_individual(self, aniversariante, destinatarios, template, e_star=False):
+        """Monta a mensagem (destinatarios, assunto, corpo) de aniversário de tempo de empresa."""
+        nome = self.utilitariosComuns.formatar_nome(aniversariante.nome)
+        anos = aniversariante.anos_de_casa
+        assunto = template.formatar("assunto", nome=nome, anos_de_casa=anos)
+        corpo_email = _corpo_tempo_de_casa(int(anos), e_star)
 
-    def enviar_email_diario_gestor_aniversariante_empresa(self, aniversariantes_df, data_simulada=None):
-        """Envia e-mail diário para o gestor com os aniversariantes de tempo de empresa do dia."""
-        if aniversariantes_df.empty:
-            logging.info("Nenhum aniversariante de tempo de empresa hoje para notificar gestores.")
-            return
+        tipo_email = "STAR " if e_star else ""
+        logging.info(f"Enviando e-mail {tipo_email}de parabéns (tempo de empresa) para {nome} ({', '.join(destinatarios)}).")
+        return (destinatarios, assunto, corpo_email)
+
+    def _enviar_emails_individuais(self, plano, tipo, e_star=False):
+        template = MODELOS_EMAIL["INDIVIDUAL_ANIVERSARIANTE_EMPRESA"]
+        itens = plano.pendentes(tipo)
+        mensagens = [
+            self._montar_email_individual(plano.registros(item)[0], item.destinatarios, template, e_star)
+            for item in itens
+        ]
+        return self.utilitariosComuns.enviar_emails_plano(plano, itens, mensagens)
 
-        template = EMAIL_TEMPLATES["GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA"]
-        hoje = data_simulada or datetime.now()
-        hoje_str = hoje.strftime('%d/%m/%Y')
+    def enviar_email_individual_aniversariante_empresa(self, plano):
+        """Envia e-mails individuais para cada colaborador aniversariante de tempo de empresa no dia."""
+        return self._enviar_emails_individuais(plano, "INDIVIDUAL_ANIVERSARIANTE_EMPRESA")
 
-        for gestor, grupo in aniversariantes_df.groupby('Superior'):
-            email_gestor = grupo['Email_superior'].iloc[0]
-            if not email_gestor or pd.isna(email_gestor):
-                logging.warning(f"Gestor {gestor} não possui e-mail cadastrado. Pulando envio.")
-                continue
+    def enviar_email_individual_aniversariante_empresa_star(self, plano):
+        """Envia e-mails individuais para colaboradores que fazem aniversário de tempo de casa (Star)."""
+        return self._enviar_emails_individuais(plano, "INDIVIDUAL_ANIVERSARIANTE_EMPRESA_STAR", e_star=True)
 
-            nome_gestor_formatado = self.utilitariosComuns.formatar_nome(gestor)
-            assunto = template["assunto"].format(hoje_str=hoje_str)
+    def enviar_email_diario_gestor_aniversariante_empresa(self, plano):
+        """Envia e-mail diário para o gestor com os aniversariantes de tempo de empresa do dia."""
+        template = MODELOS_EMAIL["GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA"]
+        assunto = template.formatar("assunto", hoje_str=plano.data_referencia.strftime('%d/%m/%Y'))
 
-            dados_tabela = [
-                [row['Nome'], row['Data_admissao'].strftime('%d/%m/%Y'), row['Anos_de_casa']]
-                for _, row in grupo.iterrows()
-            ]
+        itens = plano.pendentes("GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA")
+        mensagens = []
+        for item in itens:
+            gestor = plano.gestor(item)
+            nome_gestor_formatado = self.utilitariosComuns.formatar_nome(gestor.nome)
+            mensagem, colunas, dados_tabela = self.secao_gestor(plano, item, gestor)
 
             body = self.utilitariosComuns.gerar_corpo_email_aniversariantes(
-                template["saudacao"].format(nome_gestor=nome_gestor_formatado),
-                template["mensagem"].format(hoje_str=hoje_str),
-                template["colunas"],
+                template.formatar("saudacao", nome_gestor=nome_gestor_formatado),
+                mensagem,
+                colunas,
                 dados_tabela
             )
 
-            logging.info(f"Enviando e-mail diário (tempo de empresa) para o gestor {gestor} ({email_gestor}) com {len(dados_tabela)} aniversariantes.")
-            self.utilitariosComuns.enviar_email_formatado([email_gestor], assunto, body)
\ No newline at end of file
+            logging.info(f"Enviando e-mail diário (tempo de empresa) para o gestor {gestor.nome} ({gestor.email}) com {len(dados_tabela)} aniversariantes.")
+            mensagens.append((item.destinatarios, assunto, body))
+        return self.utilitariosComuns.enviar_emails_plano(plano, itens, mensagens)
@@ -1,158 +1,118 @@
 import logging
-from datetime import datetime
+from operator import attrgetter
 from dateutil.relativedelta import relativedelta
 from utils.utilitariosComuns import utilitariosComuns
-from data.conexaoGraph import conexaoGraph
-from email_utils.email_config import EMAIL_TEMPLATES
-from utils.config import pictureBirth, linkRedirect
-import pandas as pd
-import locale
-import os
-
-locale.setlocale(locale.LC_TIME, 'pt_BR.UTF-8')
-# ["gestaodepessoas@fgmdentalgroup.com", "grupo.coordenadores@fgmdentalgroup.com", "grupo.supervisores@fgmdentalgroup.com", "grupo.gerentes@fgmdentalgroup.com"]
-EMAIL_RH = os.getenv("EMAIL_RH", "comunicacaointerna@fgmdentalgroup.com")
-EMAIL_TESTE = [
-    os.getenv("EMAIL_TESTE", "sophia.albertong@fgmdentalgroup.com"),
-    "sophia.alberton@fgmdentalgroup.com"
-]
-AMBIENTE = os.getenv("AMBIENTE", "QAS")
+from email_utils.modelosEmail import MODELOS_EMAIL
+from utils.config import pictureBirth, linkRedirect, configurar_locale
 
 class aniversarioNascimento:
-    def __init__(self):
-        self.utilitariosComuns = utilitariosComuns()
-        self.conexaoGraph = conexaoGraph()
+    def __init__(self, utilitarios=None):
+        """'utilitarios' permite compartilhar o mesmo utilitariosComuns (e cliente do Graph) entre os fluxos."""
+        configurar_locale()
+        self.utilitariosComuns = utilitarios or utilitariosComuns()
     # Mensal RH
-    def enviar_email_rh_aniversariantes_nascimento(self, aniversariantes_df, data_simulada=None):
+    def enviar_email_rh_aniversariantes_nascimento(self, plano):
         """Envia o e-mail consolidado de aniversariantes de nascimento para o RH."""
-        data_referencia = data_simulada or datetime.now()
-        if AMBIENTE == "PRD" and data_referencia.day != 27:
-            logging.info("Hoje não é dia 27. E-mail de aniversariantes de nascimento para RH não será enviado.")
-            return
-        if aniversariantes_df.empty:
-            logging.info("Nenhum aniversariante de nascimento no próximo mês. E-mail para o RH não enviado.")
-            return
-        template = EMAIL_TEMPLATES["RH_ANIVERSARIANTES_NASCIMENTO"]
-        mes_seguinte = (data_referencia + relativedelta(months=1)).strftime("%B").title()
-        assunto = template["assunto"].format(mes_seguinte=mes_seguinte)
-        
-        aniversariantes_df['DiaMes'] = aniversariantes_df['Data_nascimento'].dt.strftime('%m-%d')
-        aniversariantes_df = aniversariantes_df.sort_values(by='DiaMes')
+        template = MODELOS_EMAIL["RH_ANIVERSARIANTES_NASCIMENTO"]
+        mes_seguinte = (plano.data_referencia + relativedelta(months=1)).strftime("%B").title()
+        assunto = template.formatar("assunto", mes_seguinte=mes_seguinte)
+        mensagem = template.formatar("mensagem", mes_seguinte=mes_seguinte)
 
-        dados_tabela = [
-            [
-                row['Nome'],
-                row['Data_nascimento'].strftime('%d/%m'),
-                row.get('Local', 'N/A'),
-                row.get('Superior', 'N/A')
-            ] for _, row in aniversariantes_df.iterrows()
-        ]
-            
-        body = self.utilitariosComuns.gerar_corpo_email_aniversariantes(
-            template["saudacao"],
-            template["mensagem"].format(mes_seguinte=mes_seguinte),
-            template["colunas"],
-            dados_tabela
-        )
+        itens = plano.pendentes("RH_ANIVERSARIANTES_NASCIMENTO")
+        mensagens = []
+        for item in itens:
+            aniversariantes = sorted(plano.registros(item), key=attrgetter('dia_mes_nascimento'))
+            dados_tabela = [[c.nome, c.nascimento, c.local, c.superior] for c in aniversariantes]
 
-        logging.info(f"Enviando e-mail para o RH com {len(dados_tabela)} aniversariantes de nascimento.")
-        self.utilitariosComuns.enviar_email_formatado([EMAIL_RH], assunto, body)
+            body = self.utilitariosComuns.gerar_corpo_email_aniversariantes(
+                template.formatar("saudacao"),
+                mensagem,
+                template["colunas"],
+                dados_tabela
+            )
+
+            logging.info(f"Enviando e-mail para o RH com {len(dados_tabela)} aniversariantes de nascimento.")
+            mensagens.append((item.destinatarios, assunto, body))
+        return self.utilitariosComuns.enviar_emails_plano(plano, itens, mensagens)
+    # Seção de gestor (mensagem mensal, diária ou parte do e-mail consolidado)
+    def secao_gestor(self, plano, item, gestor):
+        """
+        Mensagem, colunas e linhas da tabela de uma mensagem de gestor do fluxo
+        (mensal ou diária); é também a seção do fluxo no e-mail consolidado do gestor.
+        """
+        template = MODELOS_EMAIL[item.tipo]
+        if item.tipo == "GESTOR_ANIVERSARIANTES_NASCIMENTO":
+            mes_seguinte = (plano.data_referencia + relativedelta(months=1)).strftime("%B").title()
+            mensagem = template.formatar("mensagem", mes_seguinte=mes_seguinte)
+            liderados = sorted(gestor.liderados, key=attrgetter('dia_mes_nascimento'))
+        else:
+            mensagem = template.formatar("mensagem", hoje_str=plano.data_referencia.strftime('%d/%m'))
+            liderados = gestor.liderados
+        return mensagem, template["colunas"], [[c.nome, c.nascimento] for c in liderados]
     # Mensal Gestores
-    def enviar_emails_gestores_aniversariantes_nascimento(self, aniversariantes_df, data_simulada=None):
+    def enviar_emails_gestores_aniversariantes_nascimento(self, plano):
         """Envia e-mails mensais para cada gestor com seus liderados aniversariantes de nascimento."""
-        data_referencia = data_simulada or datetime.now()
-        if AMBIENTE == "PRD" and data_referencia.day != 27:
-            logging.info("Hoje não é dia 27. E-mails de aniversariantes de nascimento para gestores não serão enviados.")
-            return
-        if aniversariantes_df.empty:
-            logging.info("Nenhum aniversariante de nascimento para notificar os gestores no próximo mês.")
-            return
+        template = MODELOS_EMAIL["GESTOR_ANIVERSARIANTES_NASCIMENTO"]
+        mes_seguinte = (plano.data_referencia + relativedelta(months=1)).strftime("%B").title()
+        assunto = template.formatar("assunto", mes_seguinte=mes_seguinte)
 
-        template = EMAIL_TEMPLATES["GESTOR_ANIVERSARIANTES_NASCIMENTO"]
-        mes_seguinte = (data_referencia + relativedelta(months=1)).strftime("%B").title()
-        assunto = template["assunto"].format(mes_seguinte=mes_seguinte)
-
-        for gestor, grupo in aniversariantes_df.groupby('Superior'):
-            email_gestor = grupo['Email_superior'].iloc[0]
-            if not email_gestor or pd.isna(email_gestor):
-                logging.warning(f"Gestor {gestor} não possui e-mail cadastrado. Pulando notificação de aniversário de nascimento.")
-                continue
-            
-            nome_gestor_formatado = self.utilitariosComuns.formatar_nome(gestor)            
-            grupo['DiaMes'] = grupo['Data_nascimento'].dt.strftime('%m-%d')
-            grupo = grupo.sort_values(by='DiaMes')
-            dados_tabela = [
-                [row['Nome'], row['Data_nascimento'].strftime('%d/%m')]
-                for _, row in grupo.iterrows()
-            ]
+        itens = plano.pendentes("GESTOR_ANIVERSARIANTES_NASCIMENTO")
+        mensagens = []
+        for item in itens:
+            gestor = plano.gestor(item)
+            nome_gestor_formatado = self.utilitariosComuns.formatar_nome(gestor.nome)
+            mensagem, colunas, dados_tabela = self.secao_gestor(plano, item, gestor)
 
             body = self.utilitariosComuns.gerar_corpo_email_aniversariantes(
-                template["saudacao"].format(nome_gestor=nome_gestor_formatado),
-                template["mensagem"].format(mes_seguinte=mes_seguinte),
-                template["colunas"],
+                template.formatar("saudacao", nome_gestor=nome_gestor_formatado),
+                mensagem,
+                colunas,
                 dados_tabela
             )
 
-            logging.info(f"Enviando e-mail para o gestor {gestor} ({email_gestor}) com {len(dados_tabela)} aniversariantes de nascimento.")
-            self.utilitariosComuns.enviar_email_formatado([email_gestor], assunto, body)
+            logging.info(f"Enviando e-mail para o gestor {gestor.nome} ({gestor.email}) com {len(dados_tabela)} aniversariantes de nascimento.")
+            mensagens.append((item.destinatarios, assunto, body))
+        return self.utilitariosComuns.enviar_emails_plano(plano, itens, mensagens)
     # Dia do aniversário aniversariante
-    def enviar_email_individual_aniversariante_nascimento(self, aniversariantes_df, data_simulada=None):
+    def enviar_email_individual_aniversariante_nascimento(self, plano):
         """Envia e-mails individuais para cada colaborador aniversariante de nascimento no dia."""
-        if aniversariantes_df.empty:
-            logging.info("Nenhum aniversariante de nascimento hoje.")
-            return
-
-        template = EMAIL_TEMPLATES["INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO"]
-
-        for _, row in aniversariantes_df.iterrows():
-            nome = self.utilitariosComuns.formatar_nome(row['Nome'])
-            destinatarios = [email for email in [row.get('Email_corporativo'), row.get('Email_pessoal')] if email and not pd.isna(email)]
-
-            if not destinatarios:
-                logging.warning(f"{nome} não possui e-mail válido cadastrado. Pulando envio.")
-                continue
+        template = MODELOS_EMAIL["INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO"]
+        # O corpo (imagem) é o mesmo para todos; só o assunto muda por aniversariante
+        body = self.utilitariosComuns.gerar_email_com_imagem(
+            imagem_src=pictureBirth,
+            texto_alt=template.formatar("texto_alt_imagem"),
+            link=linkRedirect
+        )
 
-            assunto = template["assunto"].format(nome=nome)
-            body = self.utilitariosComuns.gerar_email_com_imagem(
-                imagem_src=pictureBirth,
-                texto_alt=template["texto_alt_imagem"],
-                link=linkRedirect
-            )
+        itens = plano.pendentes("INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO")
+        mensagens = []
+        for item in itens:
+            nome = self.utilitariosComuns.formatar_nome(plano.registros(item)[0].nome)
+            assunto = template.formatar("assunto", nome=nome)
 
-            logging.info(f"Enviando e-mail de feliz aniversário para {nome} ({', '.join(destinatarios)}).")
-            self.utilitariosComuns.enviar_email_formatado(destinatarios, assunto, body)
+            logging.info(f"Enviando e-mail de feliz aniversário para {nome} ({', '.join(item.destinatarios)}).")
+            mensagens.append((item.destinatarios, assunto, body))
+        return self.utilitariosComuns.enviar_emails_plano(plano, itens, mensagens)
     # Dia do aniversário gestores de aniversariantes
-    def enviar_email_diario_gestor_aniversariante_nascimento(self, aniversariantes_df, data_simulada=None):
+    def enviar_email_diario_gestor_aniversariante_nascimento(self, plano):
         """Envia e-mail diário para o gestor com os aniversariantes de nascimento do dia."""
-        data_referencia = data_simulada or datetime.now()
-        if aniversariantes_df.empty:
-            logging.info("Nenhum aniversariante de nascimento hoje para notificar gestores.")
-            return
-
-        template = EMAIL_TEMPLATES["GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO"]
-        hoje = data_simulada if data_simulada else data_referencia
-        hoje_str = hoje.strftime('%d/%m')
+        template = MODELOS_EMAIL["GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO"]
+        assunto = template.formatar("assunto")
 
-        for gestor, grupo in aniversariantes_df.groupby('Superior'):
-            email_gestor = grupo['Email_superior'].iloc[0]
-            if not email_gestor or pd.isna(email_gestor):
-                logging.warning(f"Gestor {gestor} não possui e-mail cadastrado. Pulando notificação diária de aniversário de nascimento.")
-                continue
-
-            nome_gestor_formatado = self.utilitariosComuns.formatar_nome(gestor)
-            assunto = template["assunto"]
-            
-            dados_tabela = [
-                [row['Nome'], row['Data_nascimento'].strftime('%d/%m')]
-                for _, row in grupo.iterrows()
-            ]
+        itens = plano.pendentes("GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO")
+        mensagens = []
+        for item in itens:
+            gestor = plano.gestor(item)
+            nome_gestor_formatado = self.utilitariosComuns.formatar_nome(gestor.nome)
+            mensagem, colunas, dados_tabela = self.secao_gestor(plano, item, gestor)
 
             body = self.utilitariosComuns.gerar_corpo_email_aniversariantes(
-                template["saudacao"].format(nome_gestor=nome_gestor_formatado),
-                template["mensagem"].format(hoje_str=hoje_str),
-                template["colunas"],
+                template.formatar("saudacao", nome_gestor=nome_gestor_formatado),
+                mensagem,
+                colunas,
                 dados_tabela
             )
 
-            logging.info(f"Enviando e-mail diário (nascimento) para o gestor {gestor} ({email_gestor}) com {len(dados_tabela)} aniversariantes.")
-            self.utilitariosComuns.enviar_email_formatado([email_gestor], assunto, body)
\ No newline at end of file
+            logging.info(f"Enviando e-mail diário (nascimento) para o gestor {gestor.nome} ({gestor.email}) com {len(dados_tabela)} aniversariantes.")
+            mensagens.append((item.destinatarios, assunto, body))
+        return self.utilitariosComuns.enviar_emails_plano(plano, itens, mensagens)
@@ -0,0 +1,41 @@
+# src/email_utils/consolidadoGestores.py
+"""
+E-mail consolidado do gestor (GESTOR_CONSOLIDADO): as mensagens de gestor do dia
+(diárias e, nos dias mensais, as do mês seguinte, dos dois fluxos) saem numa única
+mensagem, com uma seção por mensagem. Cada seção é montada pelo seu fluxo, com o
+template do próprio fluxo em EMAIL_TEMPLATES.
+"""
+import logging
+from email_utils.modelosEmail import MODELOS_EMAIL
+
+class consolidadoGestores:
+    def __init__(self, utilitarios, email_empresa, email_nascimento):
+        """Usa o mesmo utilitariosComuns (e cliente do Graph) e os objetos de envio dos dois fluxos."""
+        self.utilitariosComuns = utilitarios
+        # Fluxo que monta cada tipo de seção (secao_gestor)
+        self.fluxos = {
+            "GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA": email_empresa,
+            "GESTOR_ANIVERSARIANTES_EMPRESA": email_empresa,
+            "GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO": email_nascimento,
+            "GESTOR_ANIVERSARIANTES_NASCIMENTO": email_nascimento,
+        }
+
+    def enviar_emails_gestores_consolidados(self, plano):
+        """Envia a cada gestor um único e-mail com uma tabela por seção."""
+        template = MODELOS_EMAIL["GESTOR_CONSOLIDADO"]
+        assunto = template.formatar("assunto", hoje_str=plano.data_referencia.strftime('%d/%m/%Y'))
+
+        itens = plano.pendentes("GESTOR_CONSOLIDADO")
+        mensagens = []
+        for item in itens:
+            secoes = [self.fluxos[secao.tipo].secao_gestor(plano, secao, plano.gestor(secao)) for secao in item.secoes]
+            nome_gestor = item.parametros['gestor']
+            body = self.utilitariosComuns.gerar_corpo_email_secoes(
+                template.formatar("saudacao", nome_gestor=self.utilitariosComuns.formatar_nome(nome_gestor)),
+                secoes
+            )
+
+            total = sum(len(dados_tabela) for _, _, dados_tabela in secoes)
+            logging.info(f"Enviando e-mail consolidado para o gestor {nome_gestor} ({item.destinatarios[0]}) com {len(secoes)} seções e {total} aniversariantes.")
+            mensagens.append((item.destinatarios, assunto, body))
+        return self.utilitariosComuns.enviar_emails_plano(plano, itens, mensagens)
@@ -64,5 +64,11 @@ EMAIL_TEMPLATES = {
         "saudacao": "Olá, {nome_gestor}!",
         "mensagem": "Lembre-se de desejar um feliz aniversário para o(s) seguinte(s) membro(s) da sua equipe hoje ({hoje_str}):",
         "colunas": ["🎂 Nome", "📅 Data de Nascimento"],
+    },
+    # E-mail consolidado do gestor (GESTOR_CONSOLIDADO): cada seção usa a mensagem e as
+    # colunas do template do seu fluxo (GESTOR_DIARIO_* e GESTOR_ANIVERSARIANTES_*)
+    "GESTOR_CONSOLIDADO": {
+        "assunto": "Aniversariantes da sua Equipe - {hoje_str}",
+        "saudacao": "Olá, {nome_gestor}!",
     }
 }
\ No newline at end of file
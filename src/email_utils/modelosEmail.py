@@ -0,0 +1,55 @@
+# src/email_utils/modelosEmail.py
+"""
+Templates de e-mail compilados.
+Cada entrada de EMAIL_TEMPLATES é analisada uma única vez, na importação:
+os placeholders de cada texto são extraídos e validados, e os textos sem
+placeholder são devolvidos prontos, sem passar por .format a cada envio.
+"""
+from string import Formatter
+from email_utils.email_config import EMAIL_TEMPLATES
+
+# Placeholders aceitos nos textos de EMAIL_TEMPLATES
+CAMPOS_MODELOS = {'mes_seguinte', 'nome_gestor', 'nome', 'anos_de_casa', 'hoje_str', 'data_admissao'}
+
+def _campos_texto(chave, nome, texto):
+    """Placeholders de um texto; levanta ValueError se o texto for inválido."""
+    campos = set()
+    try:
+        partes = list(Formatter().parse(texto))
+    except ValueError as e:
+        raise ValueError(f"Template {chave}.{nome} inválido: {e}") from e
+    for _, campo, especificacao, conversao in partes:
+        if campo is None:
+            continue
+        if campo not in CAMPOS_MODELOS or especificacao or conversao:
+            raise ValueError(f"Template {chave}.{nome} com placeholder não suportado: {{{campo}}}")
+        campos.add(campo)
+    return campos
+
+class modeloEmail:
+    """Uma entrada de EMAIL_TEMPLATES com os placeholders de cada texto já conhecidos."""
+    def __init__(self, chave, modelo):
+        self.chave = chave
+        self.modelo = modelo
+        self.campos = {
+            nome: _campos_texto(chave, nome, texto)
+            for nome, texto in modelo.items() if isinstance(texto, str)
+        }
+
+    def __getitem__(self, nome):
+        return self.modelo[nome]
+
+    def formatar(self, texto, /, **valores):
+        """Preenche o texto indicado; textos sem placeholders são devolvidos diretamente."""
+        campos = self.campos[texto]
+        if not campos:
+            return self.modelo[texto]
+        faltando = campos - valores.keys()
+        if faltando:
+            raise KeyError(f"Template {self.chave}.{texto} sem valor para: {', '.join(sorted(faltando))}")
+        return self.modelo[texto].format_map(valores)
+
+def compilar_modelos(templates):
+    return {chave: modeloEmail(chave, modelo) for chave, modelo in templates.items()}
+
+MODELOS_EMAIL = compilar_modelos(EMAIL_TEMPLATES)
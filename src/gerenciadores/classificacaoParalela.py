@@ -0,0 +1,163 @@
+# src/gerenciadores/classificacaoParalela.py
+"""
+Classificação dos colaboradores em paralelo (CLASSIFICACAO_PROCESSOS > 1).
+Nenhuma regra de classificar_usuarios cruza CPFs: o DataFrame preparado é dividido
+em faixas de CPF com quantidades de linhas parecidas, cada parte é classificada num
+processo separado e os nove conjuntos são mesclados na mesma ordem da classificação
+em um único processo.
+As partes seguem para os processos em Arrow IPC numa memória compartilhada, e os
+resultados voltam em Arrow IPC, sem serializar DataFrames com pickle. As colunas
+categóricas viajam como códigos: o dicionário de cada uma (ex.: os nomes de todos
+os gestores) é gravado uma única vez na memória compartilhada.
+"""
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from gerenciadores.gerenciarColaboradores import RESULTADOS_CLASSIFICACAO, _preparar_dataframe, classificar_usuarios
+
+# Abaixo disso, abrir os processos custa mais do que a classificação de uma parte
+LINHAS_MINIMAS_POR_PROCESSO = 50_000
+
+# Conjuntos cujo índice é a posição do cadastro no CPF (e não 0..n-1)
+RESULTADOS_COM_INDICE = ('voltaram_menos_6_meses', 'voltaram_mais_6_meses')
+
+def _para_arrow(df):
+    """Serializa o DataFrame (com o índice) em um buffer Arrow IPC."""
+    tabela = pa.Table.from_pandas(df, preserve_index=True)
+    destino = pa.BufferOutputStream()
+    with pa.ipc.new_stream(destino, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+    return destino.getvalue()
+
+def _de_arrow(buffer):
+    with pa.ipc.open_stream(buffer) as leitor:
+        return leitor.read_all().to_pandas()
+
+def _codificar(df, tipos):
+    """Troca as colunas categóricas com as categorias da entrada pelos seus códigos."""
+    for nome in df.columns:
+        tipo = tipos.get(nome)
+        if isinstance(tipo, pd.CategoricalDtype) and df[nome].dtype == tipo:
+            df[nome] = df[nome].cat.codes
+    return df
+
+def _decodificar(df, tipos):
+    """Desfaz _codificar: códigos das colunas categóricas de volta às categorias da entrada."""
+    for nome in df.columns:
+        tipo = tipos.get(nome)
+        if isinstance(tipo, pd.CategoricalDtype) and pd.api.types.is_integer_dtype(df[nome].dtype):
+            df[nome] = pd.Categorical.from_codes(df[nome], dtype=tipo)
+    return df
+
+def _ler_memoria(nome_memoria, trechos):
+    """Copia os trechos (início, tamanho) da memória compartilhada, que pode ser fechada em seguida."""
+    memoria = shared_memory.SharedMemory(name=nome_memoria)
+    try:
+        return [pa.py_buffer(bytes(memoria.buf[inicio:inicio + tamanho])) for inicio, tamanho in trechos]
+    finally:
+        memoria.close()
+
+def _classificar_parte(nome_memoria, categorias, parte):
+    """
+    Executado em cada processo: lê as categorias e a parte na memória compartilhada
+    e devolve os conjuntos em Arrow IPC.
+    """
+    categorias, parte = _ler_memoria(nome_memoria, [categorias, parte])
+    tipos = _de_arrow(categorias).dtypes.to_dict()
+    resultados = classificar_usuarios(_decodificar(_de_arrow(parte), tipos))
+    return [
+        None if resultados[chave].empty else _para_arrow(_codificar(resultados[chave], tipos)).to_pybytes()
+        for chave in RESULTADOS_CLASSIFICACAO
+    ]
+
+def _restaurar_tipos(df, tipos):
+    """Devolve às colunas os tipos do DataFrame de entrada, alterados pelo Arrow ou pela concatenação."""
+    for nome in df.columns:
+        tipo = tipos.get(nome)
+        if tipo is None or str(df[nome].dtype) == str(tipo):
+            continue
+        if tipo == object:
+            # O Arrow devolve texto no tipo 'str' do pandas; volta a object, com None nos ausentes
+            textos = df[nome].to_numpy(dtype=object)
+            textos[df[nome].isna().to_numpy()] = None
+            df[nome] = pd.Series(textos, index=df.index, dtype=object)
+        elif isinstance(tipo, pd.CategoricalDtype):
+            # Partes com categorias diferentes (gestor substituto) voltam a object na concatenação
+            df[nome] = df[nome].astype('category')
+        else:
+            df[nome] = df[nome].astype(tipo)
+    return df
+
+def _dividir_por_cpf(cpf, processos):
+    """
+    Posições das linhas de cada parte: faixas de CPF com quantidades de linhas
+    parecidas (cortes nos quantis do CPF). Faixas vazias são descartadas.
+    """
+    limites = np.unique(np.sort(cpf)[np.arange(1, processos) * len(cpf) // processos])
+    faixa = np.searchsorted(limites, cpf, side='right')
+    partes = [np.flatnonzero(faixa == parte) for parte in range(len(limites) + 1)]
+    return [linhas for linhas in partes if len(linhas)]
+
+def _selecionar(df, linhas):
+    """Linhas de uma parte; com o DataFrame ordenado por CPF (como as fontes o devolvem), uma fatia."""
+    if linhas[-1] - linhas[0] + 1 == len(linhas):
+        return df.iloc[linhas[0]:linhas[-1] + 1]
+    return df.iloc[linhas]
+
+def _mesclar(partes, tipos, manter_indice):
+    """
+    Junta o mesmo conjunto de todas as partes. As partes cobrem faixas crescentes de
+    CPF e todos os conjuntos saem ordenados por CPF: concatenados na ordem das partes,
+    reproduzem a ordem da classificação em um único processo.
+    """
+    partes = [_decodificar(_de_arrow(pa.py_buffer(parte)), tipos) for parte in partes if parte is not None]
+    if not partes:
+        return pd.DataFrame()
+    return _restaurar_tipos(pd.concat(partes, ignore_index=not manter_indice), tipos)
+
+def classificar_usuarios_paralelo(usuarios, processos, linhas_minimas=LINHAS_MINIMAS_POR_PROCESSO):
+    """
+    Mesmo resultado de classificar_usuarios, com os CPFs divididos entre até 'processos'
+    processos, com pelo menos 'linhas_minimas' linhas por processo. Extrações pequenas
+    (ou processos <= 1) são classificadas no processo atual.
+    """
+    usuarios = _preparar_dataframe(usuarios).reset_index(drop=True)
+    processos = min(processos, len(usuarios) // max(linhas_minimas, 1))
+    # Faixas de CPF (e não o hash do CPF): os conjuntos das partes, concatenados, já saem em ordem
+    partes = _dividir_por_cpf(usuarios['Cpf'].to_numpy(), processos) if processos > 1 else []
+    if len(partes) <= 1:
+        return classificar_usuarios(usuarios)
+    processos = len(partes)
+
+    logging.info(f"Classificando usuários em {processos} processos...")
+    tipos = usuarios.dtypes.to_dict()
+    # Primeiro trecho da memória: as categorias de cada coluna categórica, numa linha
+    # de ausentes (sem nenhuma linha, o Arrow não grava o dicionário)
+    categorias = pd.DataFrame({
+        nome: pd.Categorical.from_codes([-1], dtype=tipo) for nome, tipo in tipos.items() if isinstance(tipo, pd.CategoricalDtype)
+    })
+    codificado = _codificar(usuarios.copy(deep=False), tipos)
+    buffers = [_para_arrow(categorias)] + [_para_arrow(_selecionar(codificado, linhas)) for linhas in partes]
+
+    posicoes = np.cumsum([0] + [buffer.size for buffer in buffers]).tolist()
+    trechos = list(zip(posicoes[:-1], np.diff(posicoes).tolist()))
+    memoria = shared_memory.SharedMemory(create=True, size=posicoes[-1])
+    try:
+        for buffer, (inicio, tamanho) in zip(buffers, trechos):
+            memoria.buf[inicio:inicio + tamanho] = memoryview(buffer).cast('B')
+        del buffers, codificado
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            resultados = list(executor.map(
+                _classificar_parte, [memoria.name] * processos, [trechos[0]] * processos, trechos[1:]
+            ))
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+    return {
+        chave: _mesclar([resultado[i] for resultado in resultados], tipos, chave in RESULTADOS_COM_INDICE)
+        for i, chave in enumerate(RESULTADOS_CLASSIFICACAO)
+    }
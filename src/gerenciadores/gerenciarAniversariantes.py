@@ -3,10 +3,129 @@ import logging
 from datetime import datetime
 import pandas as pd
 from dateutil.relativedelta import relativedelta
+import numpy as np
+from gerenciadores.indiceGestores import indiceGestores
+from utils.datasAniversario import comemora_29_fevereiro, dias_comemorados
+
+# Colunas do resultado de aniversariantes com múltiplas admissões
+COLUNAS_DUPLICADOS = ['Cpf', 'Nome', 'Email', 'Data_primeira_admissao', 'Tempo_total_anos']
+DIA_NS = 86_400_000_000_000
+
+def _somar_por_grupo(valores, primeiro, ultimo):
+    """
+    Soma os valores de cada grupo contíguo [primeiro, ultimo] na ordem das linhas,
+    como a soma por grupo feita antes, para que o arredondamento de x.5 não mude.
+    """
+    tamanhos = ultimo - primeiro + 1
+    grupo = np.repeat(np.arange(len(primeiro)), tamanhos)
+    posicao = np.arange(len(valores)) - np.repeat(primeiro, tamanhos)
+    total = np.zeros(len(primeiro))
+    for k in range(tamanhos.max(initial=0)):
+        na_posicao = posicao == k
+        total[grupo[na_posicao]] += valores[na_posicao]
+    return total
+
+def _anos_de_casa(referencias, admissoes):
+    """
+    Anos de casa como sempre foram calculados: dias completos entre a admissão e a
+    data de referência, divididos por 365 (em nanossegundos, como (referencia - admissao).days).
+    """
+    referencias = np.asarray(referencias, dtype='datetime64[ns]').view('int64')
+    return (referencias - admissoes) // DIA_NS // 365
+
+def _separar_por_dia(df, dia, quantidade_dias):
+    """Fatias contíguas de df (ordenado por dia) para cada uma das datas."""
+    limites = np.searchsorted(dia, np.arange(quantidade_dias + 1), side='left')
+    return [df.iloc[limites[i]:limites[i + 1]] for i in range(quantidade_dias)]
+
+class _indiceDatas:
+    """Índice (mês, dia) -> posições das linhas, sobre uma coluna de datas."""
+    def __init__(self, datas):
+        datas = pd.to_datetime(datas)
+        validas = np.flatnonzero(datas.notna().to_numpy())
+        # Instante de cada data em nanossegundos, para os anos de casa (ver _anos_de_casa)
+        self.instante = datas.to_numpy(dtype='datetime64[ns]').view('int64')
+        self.mes = datas.dt.month.fillna(0).to_numpy(dtype='int64')
+        self.dia = datas.dt.day.fillna(0).to_numpy(dtype='int64')
+        chave = self.mes[validas] * 100 + self.dia[validas]
+        ordem = np.argsort(chave, kind='stable')
+        self._chaves = chave[ordem]
+        self._posicoes = validas[ordem]
+
+    def _intervalo(self, inicio, fim):
+        esquerda = np.searchsorted(self._chaves, inicio, side='left')
+        direita = np.searchsorted(self._chaves, fim, side='right')
+        return self._posicoes[esquerda:direita]
+
+    def do_dia(self, data):
+        """Posições com aniversário na data; em anos não bissextos, 29/02 é comemorado em 28/02."""
+        posicoes = [self._intervalo(mes * 100 + dia, mes * 100 + dia) for mes, dia in dias_comemorados(data)]
+        return np.sort(np.concatenate(posicoes))
+
+    def dos_dias(self, datas):
+        """
+        do_dia para várias datas de uma vez: uma única busca no índice para todas.
+        Retorna (posicoes, dia): as posições, na ordem das datas, e o índice da data de cada uma.
+        """
+        chaves = np.array([data.month * 100 + data.day for data in datas], dtype='int64')
+        esquerda = np.searchsorted(self._chaves, chaves, side='left')
+        direita = np.searchsorted(self._chaves, chaves, side='right')
+        # 28/02 de ano não bissexto também leva os nascidos/admitidos em 29/02, logo após 28/02 no índice
+        bissexto = np.searchsorted(self._chaves, 229, side='right')
+        fevereiro_28 = np.array([comemora_29_fevereiro(data) for data in datas], dtype=bool)
+        direita = np.where(fevereiro_28, np.maximum(direita, bissexto), direita)
+        quantidade = direita - esquerda
+        dia = np.repeat(np.arange(len(chaves)), quantidade)
+        deslocamento = np.arange(len(dia)) - np.repeat(np.cumsum(quantidade) - quantidade, quantidade)
+        posicoes = self._posicoes[np.repeat(esquerda, quantidade) + deslocamento]
+        # Na ordem das linhas dentro de cada data, como do_dia
+        ordem = np.lexsort((posicoes, dia))
+        return posicoes[ordem], dia[ordem]
+
+    def do_mes(self, mes):
+        return np.sort(self._intervalo(mes * 100, mes * 100 + 99))
+
+class indiceAniversariantes:
+    """
+    Índices de aniversário de um df_validos, montados uma única vez por execução:
+    admissão e nascimento de cada linha e a admissão mais antiga de cada CPF.
+    Não dependem da data de referência; servem a todas as datas de um período.
+    """
+    def __init__(self, df_validos):
+        self.df = df_validos
+        vazio = pd.Series(dtype='datetime64[ns]')
+        self.admissao = _indiceDatas(df_validos.get('Data_admissao', vazio))
+        self.nascimento = _indiceDatas(df_validos.get('Data_nascimento', vazio))
+
+        # Agrupa por CPF e pega a admissão mais antiga
+        if df_validos.empty:
+            self.primeiras_admissoes = df_validos.copy()
+        else:
+            df_ordenado = df_validos.assign(Data_admissao=pd.to_datetime(df_validos['Data_admissao']))
+            self.primeiras_admissoes = df_ordenado.sort_values('Data_admissao').groupby('Cpf').first().reset_index()
+        self.primeira_admissao = _indiceDatas(self.primeiras_admissoes.get('Data_admissao', vazio))
+        # Montado na primeira mensagem de gestor (ver gerenciadorAniversariantes.indice_gestores)
+        self.gestores = None
+
+    def corresponde(self, df_validos):
+        return self.df is df_validos
 
 class gerenciadorAniversariantes:
     def __init__(self):
-        pass
+        self.indice = None
+
+    def _indice(self, df_validos):
+        """Reaproveita o índice da execução enquanto o DataFrame for o mesmo."""
+        if self.indice is None or not self.indice.corresponde(df_validos):
+            self.indice = indiceAniversariantes(df_validos)
+        return self.indice
+
+    def indice_gestores(self, df_validos):
+        """Índice dos gestores (indiceGestores) do df_validos, montado uma única vez por execução."""
+        indice = self._indice(df_validos)
+        if indice.gestores is None:
+            indice.gestores = indiceGestores(df_validos)
+        return indice.gestores
 
     def identificar_aniversariantes_mes_seguinte_duplicados(self, df_duplicados, data_simulada=None):
         """
@@ -15,41 +134,43 @@ class gerenciadorAniversariantes:
         """
         data_referencia = data_simulada or datetime.now()
         mes_seguinte = (data_referencia + relativedelta(months=1)).month
-        aniversariantes = []
-
-        for cpf, grupo in df_duplicados.groupby('Cpf'):
-            if grupo.empty:
-                continue
-            
-            
-            grupo['Data_admissao'] = pd.to_datetime(grupo['Data_admissao'])
-            grupo['Tempo_FGM'] = pd.to_numeric(grupo['Tempo_FGM'], errors='coerce')
-
-            # ✅ Remove registros com mesma data de admissão, mantendo o ativo
-            grupo = grupo.sort_values(['Data_admissao', 'Situacao'], ascending=[True, True])
-            grupo = grupo.drop_duplicates(subset=['Data_admissao'], keep='first').reset_index(drop=True)
-
-            nome = grupo.iloc[-1]['Nome']
-            email = grupo.iloc[-1]['Email_pessoal']
-            primeira_admissao = grupo.iloc[0]['Data_admissao']
-            tempo_total_anos = round(grupo['Tempo_FGM'].sum())
-
-
-            # --- PONTO 1: A DATA DE ANIVERSÁRIO É SEMPRE A PRIMEIRA ADMISSÃO ---
-            # Independentemente de quantas vezes o colaborador saiu e voltou,
-            # a data comemorativa será sempre baseada na sua entrada original na empresa.
-            # primeira_admissao = grupo['Data_admissao'].min()
-
-            if primeira_admissao.month == mes_seguinte and tempo_total_anos >= 1:
-                aniversariantes.append({
-                        'Cpf': cpf,
-                        'Nome': nome,
-                        'Email': email,
-                        'Data_primeira_admissao': primeira_admissao,
-                        'Tempo_total_anos': tempo_total_anos
-                    })
-        
-        aniversariantes_df = pd.DataFrame(aniversariantes)
+        if df_duplicados.empty:
+            logging.info("Encontrados 0 aniversariantes (múltiplas admissões) para o próximo mês.")
+            return pd.DataFrame(columns=COLUNAS_DUPLICADOS)
+
+        registros = pd.DataFrame({
+            'Cpf': df_duplicados['Cpf'].to_numpy(),
+            'Nome': df_duplicados['Nome'].to_numpy(),
+            'Email': df_duplicados['Email_pessoal'].to_numpy(dtype=object, na_value=None),
+            'Data_admissao': pd.to_datetime(df_duplicados['Data_admissao']).to_numpy(),
+            'Situacao': df_duplicados['Situacao'].to_numpy(),
+            'Tempo_FGM': pd.to_numeric(df_duplicados['Tempo_FGM'], errors='coerce').to_numpy(),
+        })
+
+        # ✅ Remove registros com mesma data de admissão, mantendo o ativo
+        registros = registros.sort_values(['Cpf', 'Data_admissao', 'Situacao'], kind='stable')
+        registros = registros.drop_duplicates(subset=['Cpf', 'Data_admissao'], keep='first')
+
+        # --- PONTO 1: A DATA DE ANIVERSÁRIO É SEMPRE A PRIMEIRA ADMISSÃO ---
+        # Independentemente de quantas vezes o colaborador saiu e voltou,
+        # a data comemorativa será sempre baseada na sua entrada original na empresa.
+        # Nome e e-mail vêm do registro mais recente; o tempo total soma todas as passagens.
+        cpfs = registros['Cpf'].to_numpy()
+        primeiro = np.flatnonzero(np.r_[True, cpfs[1:] != cpfs[:-1]])
+        ultimo = np.r_[primeiro[1:], len(cpfs)] - 1
+        tempo_total = _somar_por_grupo(registros['Tempo_FGM'].fillna(0).to_numpy(), primeiro, ultimo)
+        aniversariantes_df = pd.DataFrame({
+            'Cpf': cpfs[primeiro],
+            'Nome': registros['Nome'].to_numpy()[ultimo],
+            'Email': registros['Email'].to_numpy()[ultimo],
+            'Data_primeira_admissao': registros['Data_admissao'].to_numpy()[primeiro],
+            'Tempo_total_anos': np.round(tempo_total).astype('int64'),
+        })
+
+        aniversariantes_df = aniversariantes_df[
+            (aniversariantes_df['Data_primeira_admissao'].dt.month == mes_seguinte) &
+            (aniversariantes_df['Tempo_total_anos'] >= 1)
+        ].reset_index(drop=True)
         logging.info(f"Encontrados {len(aniversariantes_df)} aniversariantes (múltiplas admissões) para o próximo mês.")
         return aniversariantes_df
 
@@ -60,19 +181,14 @@ class gerenciadorAniversariantes:
         """
         data_referencia = data_simulada or datetime.now()
         mes_seguinte = (data_referencia + relativedelta(months=1)).month
-
-        # Agrupa por CPF e pega a admissão mais antiga
-        df_validos['Data_admissao'] = pd.to_datetime(df_validos['Data_admissao'])
-        df_agrupado = df_validos.sort_values('Data_admissao').groupby('Cpf').first().reset_index()
+        indice = self._indice(df_validos)
 
         # Filtra aniversariantes do mês seguinte
-        aniversariantes_df = df_agrupado[df_agrupado['Data_admissao'].dt.month == mes_seguinte].copy()
+        posicoes = indice.primeira_admissao.do_mes(mes_seguinte)
+        aniversariantes_df = indice.primeiras_admissoes.iloc[posicoes].copy()
 
-        # Calcula anos de casa
-        aniversariantes_df['Anos_de_casa'] = aniversariantes_df.apply(
-            lambda row: (data_referencia - row['Data_admissao']).days // 365,
-            axis=1
-        )
+        # Calcula anos de casa na data de referência
+        aniversariantes_df['Anos_de_casa'] = _anos_de_casa(data_referencia, indice.primeira_admissao.instante[posicoes])
 
         # Filtra quem tem pelo menos 1 ano de casa
         aniversariantes_df = aniversariantes_df[aniversariantes_df['Anos_de_casa'] >= 1]
@@ -84,11 +200,10 @@ class gerenciadorAniversariantes:
     def identificar_aniversariantes_do_dia(self, df_validos, data_simulada=None):
         """Filtra o DataFrame para encontrar aniversariantes de tempo de casa no dia atual."""
         hoje = data_simulada or datetime.now()
-        aniversariantes_df = df_validos[
-            (df_validos['Data_admissao'].dt.day == hoje.day) &
-            (df_validos['Data_admissao'].dt.month == hoje.month)
-        ].copy()
-        aniversariantes_df['Anos_de_casa'] = (hoje - aniversariantes_df['Data_admissao']).dt.days // 365
+        indice = self._indice(df_validos)
+        posicoes = indice.admissao.do_dia(hoje)
+        aniversariantes_df = df_validos.iloc[posicoes].copy()
+        aniversariantes_df['Anos_de_casa'] = _anos_de_casa(hoje, indice.admissao.instante[posicoes])
         aniversariantes_df = aniversariantes_df[aniversariantes_df['Anos_de_casa'] >= 1]
         logging.info(f"Encontrados {len(aniversariantes_df)} aniversariantes de tempo de empresa para o dia {hoje.strftime('%d/%m')}.")
         return aniversariantes_df
@@ -96,10 +211,8 @@ class gerenciadorAniversariantes:
     def identificar_aniversariantes_de_nascimento_do_dia(self, df_validos, data_simulada=None):
         """Filtra o DataFrame para encontrar aniversariantes de nascimento no dia atual."""
         hoje = data_simulada or datetime.now()
-        aniversariantes_df = df_validos[
-            (df_validos['Data_nascimento'].dt.day == hoje.day) &
-            (df_validos['Data_nascimento'].dt.month == hoje.month)
-        ].copy()
+        posicoes = self._indice(df_validos).nascimento.do_dia(hoje)
+        aniversariantes_df = df_validos.iloc[posicoes].copy()
         logging.info(f"Encontrados {len(aniversariantes_df)} aniversariantes de nascimento para o dia {hoje.strftime('%d/%m')}.")
         return aniversariantes_df
 
@@ -107,8 +220,28 @@ class gerenciadorAniversariantes:
         """Filtra o DataFrame para encontrar aniversariantes de nascimento no próximo mês."""
         data_referencia = data_simulada or datetime.now()
         mes_seguinte = (data_referencia + relativedelta(months=1)).month
-        aniversariantes_df = df_validos[
-            pd.to_datetime(df_validos['Data_nascimento']).dt.month == mes_seguinte
-        ].copy()
+        posicoes = self._indice(df_validos).nascimento.do_mes(mes_seguinte)
+        aniversariantes_df = df_validos.iloc[posicoes].copy()
         logging.info(f"Encontrados {len(aniversariantes_df)} aniversariantes de nascimento para o próximo mês.")
-        return aniversariantes_df
\ No newline at end of file
+        return aniversariantes_df
+
+    def identificar_aniversariantes_do_periodo(self, df_validos, datas):
+        """
+        identificar_aniversariantes_do_dia para todas as datas de uma vez.
+        Retorna um DataFrame por data, na ordem de 'datas'.
+        """
+        indice = self._indice(df_validos)
+        posicoes, dia = indice.admissao.dos_dias(datas)
+        anos = _anos_de_casa(np.array(datas, dtype='datetime64[ns]')[dia], indice.admissao.instante[posicoes])
+        aniversariantes_df = df_validos.iloc[posicoes].assign(Anos_de_casa=anos)
+        mantidos = anos >= 1
+        por_dia = _separar_por_dia(aniversariantes_df[mantidos], dia[mantidos], len(datas))
+        logging.info(f"Encontrados {int(mantidos.sum())} aniversariantes de tempo de empresa em {len(datas)} dia(s).")
+        return por_dia
+
+    def identificar_aniversariantes_de_nascimento_do_periodo(self, df_validos, datas):
+        """identificar_aniversariantes_de_nascimento_do_dia para todas as datas de uma vez."""
+        posicoes, dia = self._indice(df_validos).nascimento.dos_dias(datas)
+        por_dia = _separar_por_dia(df_validos.iloc[posicoes], dia, len(datas))
+        logging.info(f"Encontrados {len(posicoes)} aniversariantes de nascimento em {len(datas)} dia(s).")
+        return por_dia
@@ -10,166 +10,191 @@ Caso contrario desses requisitos se torna um usuário inválido, que sera separa
 - Colaborador sem superior
 """
 import logging
+import numpy as np
 import pandas as pd
-from datetime import timedelta
-
-def _identificar_duplicados(grupo):
-    """Identifica e processa colaboradores com múltiplos registros."""
-    grupo_ativos = grupo[grupo['Situacao'] != 7]
-    if len(grupo) > 1 and not grupo_ativos.empty and any(grupo['Situacao'] == 7):
-        demissao_anterior = grupo.loc[len(grupo) - 2, 'Data_demissao']
-        admissao_recente = grupo.loc[len(grupo) - 1, 'Data_admissao']
-        intervalo = (admissao_recente - demissao_anterior).days
-        grupo['Retorno_em_menos_de_6_meses'] = intervalo < 180
-        return grupo
-    return None
+
+RESULTADOS_CLASSIFICACAO = [
+    'validos', 'invalidos_demitidos', 'invalidos_sem_email', 'invalidos_sem_superior',
+    'cadastros_duplicados', 'voltaram_menos_6_meses', 'voltaram_mais_6_meses',
+    'cadastros_menos_6_meses', 'cadastros_mais_6_meses'
+]
+
 def _preparar_dataframe(usuarios):
-    """Função auxiliar para garantir que as colunas tenham os tipos de dados corretos antes do processamento."""
-    usuarios['Cpf'] = usuarios['Cpf'].astype(str).str.strip().str.zfill(11)
-    usuarios['Situacao'] = usuarios['Situacao'].astype(int)
-    usuarios['Situacao_superior'] = usuarios['Situacao_superior'].fillna(0).astype(int)
+    """
+    Função auxiliar para garantir que as colunas tenham os tipos de dados corretos antes do processamento.
+    O CPF continua numérico (int64); os zeros à esquerda só entram na renderização.
+    """
+    usuarios['Cpf'] = pd.to_numeric(usuarios['Cpf']).astype('int64')
+    usuarios['Situacao'] = usuarios['Situacao'].astype('int8')
+    usuarios['Situacao_superior'] = usuarios['Situacao_superior'].fillna(0).astype('int8')
     usuarios['Data_admissao'] = pd.to_datetime(usuarios['Data_admissao'])
     usuarios['Data_demissao'] = pd.to_datetime(usuarios['Data_demissao'])
     return usuarios
 
+def _por_cpf(codigos, mascara, total_cpfs):
+    """Conta, para cada CPF, quantas linhas satisfazem a máscara."""
+    return np.bincount(codigos, weights=mascara, minlength=total_cpfs)
+
+def _contem(serie, texto):
+    """Aplica str.contains apenas sobre os valores distintos da coluna."""
+    codigos, valores = pd.factorize(serie)
+    encontrados = pd.Series(valores).str.contains(texto, case=False, na=False).to_numpy(dtype=bool)
+    return np.append(encontrados, False)[codigos]
+
+def _linhas(usuarios, mascara, ordem):
+    """Seleciona as linhas da máscara seguindo a ordem informada."""
+    return usuarios.take(ordem[mascara[ordem]]).reset_index(drop=True)
+
+def _ou_vazio(df):
+    """Mantém o contrato de devolver um DataFrame sem colunas quando não há registros."""
+    return df if not df.empty else pd.DataFrame()
+
 def classificar_usuarios(usuarios):
     """
-    Função central que itera sobre cada colaborador (agrupado por CPF)
-    e o classifica em uma das seguintes categorias:
+    Função central que classifica cada colaborador (agrupado por CPF)
+    em uma das seguintes categorias:
     - validos: Cadastro único e ativo, pronto para e-mails normais.
     - cadastros_duplicados: Colaborador readmitido, requer tratamento especial.
     - invalidos_*: Colaboradores que não devem receber e-mails (demitidos, sem e-mail, etc.).
     - voltaram_menos_6_meses / voltaram_mais_6_meses: apenas o último registro por CPF.
     - cadastros_menos_6_meses / cadastros_mais_6_meses: todos os registros por CPF.
+
+    As regras são aplicadas de forma colunar: cada condição "por CPF" é
+    calculada uma única vez e propagada para as linhas com máscaras.
     """
     logging.info("Classificando usuários...")
-    usuarios = _preparar_dataframe(usuarios)
-
-    validos = []
-    invalidos_demitidos = []
-    invalidos_sem_email = []
-    invalidos_sem_superior = []
-    cadastros_duplicados = []
-    voltaram_menos_6_meses = []
-    voltaram_mais_6_meses = []
-    cadastros_menos_6_meses = []
-    cadastros_mais_6_meses = []
-
-    cpfs_readmitidos = set()
-
-    for _, grupo in usuarios.groupby('Cpf'):
-        if grupo['Nome'].str.contains("Mittelstadt", case=False).any() or \
-           grupo['Superior'].str.contains("Bianca De Oliveira Luiz Mittelstadt", case=False, na=False).any():
-            continue
-
-        # Filtra registros ativos
-        grupo_ativos = grupo[grupo['Situacao'] != 7]
-        # Remove duplicados exatos de ativos com mesma admissão/demissão/CPF
-        grupo_ativos_unicos = grupo_ativos.drop_duplicates(subset=['Cpf', 'Data_admissao', 'Data_demissao'])
-        # Junta com os registros demitidos
-        grupo_demitidos = grupo[grupo['Situacao'] == 7]
-        grupo = pd.concat([grupo_demitidos, grupo_ativos_unicos]).sort_values('Data_admissao').reset_index(drop=True)
-
-        tem_multiplas_admissoes = len(grupo) > 1
-        tem_registro_ativo = not grupo_ativos.empty
-        # Lógica de duplicados com base em Tempo_FGM
-        # Remove duplicados ativos com mesma admissão/demissão
-        if not grupo_ativos.empty:
-            data_admissao_ativa = grupo_ativos.iloc[0]['Data_admissao']
-            data_demissao_ativa = grupo_ativos.iloc[0]['Data_demissao']
-            grupo_duplicado = grupo[
-                (grupo['Data_admissao'] == data_admissao_ativa) &
-                (grupo['Data_demissao'] == data_demissao_ativa) &
-                (grupo['Situacao'] == 7)]
-            grupo_sem_duplicados = grupo.drop(grupo_duplicado.index)
-
-            if not grupo_duplicado.empty:
-                invalidos_demitidos.append(grupo_duplicado)
-
-            grupo = grupo_sem_duplicados
-        # Lógica de readmissão
-        if tem_multiplas_admissoes and tem_registro_ativo and not grupo_demitidos.empty:
-            cadastros_duplicados.append(grupo)
-
-            grupo_ordenado = grupo.sort_values('Data_admissao').reset_index(drop=True)
-            for i in range(1, len(grupo_ordenado)):
-                admissao_atual = grupo_ordenado.loc[i, 'Data_admissao']
-                demissao_anterior = grupo_ordenado.loc[i - 1, 'Data_demissao']
-                cpf_atual = grupo_ordenado.loc[i, 'Cpf']
-                cpf_anterior = grupo_ordenado.loc[i - 1, 'Cpf']
-                if pd.notnull(demissao_anterior) and pd.notnull(admissao_atual) and cpf_atual == cpf_anterior:
-                    intervalo = (admissao_atual - demissao_anterior).days
-                    destino_lista = (
-                        (voltaram_menos_6_meses, cadastros_menos_6_meses)
-                        if intervalo < 180
-                        else (voltaram_mais_6_meses, cadastros_mais_6_meses)
-                    )
-
-                    destino_lista[0].append(grupo_ordenado.iloc[i])
-                    destino_lista[1].extend(grupo_ordenado.to_dict('records'))
-                    cpfs_readmitidos.add(cpf_atual)
-                    break
-
-        todas_demitidas = grupo['Situacao'].eq(7).all()
-        tem_email_pessoal = grupo_ativos['Email_pessoal'].notnull().any()
-        grupo_ativos_com_superior = grupo_ativos[
-            grupo_ativos['Superior'].notnull() & (grupo_ativos['Situacao_superior'] != 7)
-        ]
-        tem_superior_valido = not grupo_ativos_com_superior.empty
-
-        cpf_atual = grupo_ativos_com_superior['Cpf'].iloc[0] if not grupo_ativos_com_superior.empty else None
-
-        if todas_demitidas:
-            invalidos_demitidos.append(grupo)
-        elif not tem_email_pessoal:
-            invalidos_sem_email.append(grupo_ativos)
-        elif not tem_superior_valido:
-            todos_superiores_demitidos = grupo_ativos['Situacao_superior'].eq(7).all()
-            if todos_superiores_demitidos:
-                grupo_corrigido = grupo_ativos.copy()
-                grupo_corrigido = grupo_corrigido.groupby('Cpf', as_index=False).first()
-                grupo_corrigido['Superior'] = "Posto de trabalho de superior não ocupado"
-                if cpf_atual not in cpfs_readmitidos:
-                    validos.append(grupo_corrigido)
-            else:
-                invalidos_sem_superior.append(grupo_ativos)
-        else:
-            if cpf_atual and cpf_atual not in cpfs_readmitidos:
-                validos.append(grupo_ativos_com_superior)
+    usuarios = _preparar_dataframe(usuarios).reset_index(drop=True)
+
+    # Ignora por completo os CPFs da exceção "Mittelstadt" (nome ou superior)
+    excecao = (
+        _contem(usuarios['Nome'], "Mittelstadt") |
+        _contem(usuarios['Superior'], "Bianca De Oliveira Luiz Mittelstadt")
+    )
+    codigos, cpfs = pd.factorize(usuarios['Cpf'], sort=True)
+    usuarios = usuarios[_por_cpf(codigos, excecao, len(cpfs))[codigos] == 0].reset_index(drop=True)
+    if usuarios.empty:
+        return {chave: pd.DataFrame() for chave in RESULTADOS_CLASSIFICACAO}
+
+    codigos, cpfs = pd.factorize(usuarios['Cpf'], sort=True)
+    total_cpfs = len(cpfs)
+    admissao = usuarios['Data_admissao']
+    demissao = usuarios['Data_demissao']
+
+    ativo = (usuarios['Situacao'] != 7).to_numpy()
+    qtd_ativos = _por_cpf(codigos, ativo, total_cpfs)
+    tem_ativo = qtd_ativos > 0
+    tem_demitido = _por_cpf(codigos, ~ativo, total_cpfs) > 0
+
+    # Remove duplicados exatos de ativos com mesma admissão/demissão/CPF
+    no_grupo = np.ones(len(usuarios), dtype=bool)
+    no_grupo[ativo] = ~usuarios[ativo].duplicated(subset=['Cpf', 'Data_admissao', 'Data_demissao']).to_numpy()
+    tem_multiplas_admissoes = _por_cpf(codigos, no_grupo, total_cpfs) > 1
+
+    # Demitidos com a mesma admissão/demissão do primeiro registro ativo vão para inválidos
+    # reindex (e não map): sem nenhum ativo, o map converteria as datas vazias para float
+    primeiro_ativo = usuarios[ativo].drop_duplicates(subset='Cpf').set_index('Cpf')
+    demitido_duplicado = (
+        ~ativo &
+        (admissao.to_numpy() == primeiro_ativo['Data_admissao'].reindex(usuarios['Cpf']).to_numpy()) &
+        (demissao.to_numpy() == primeiro_ativo['Data_demissao'].reindex(usuarios['Cpf']).to_numpy())
+    )
+    no_grupo &= ~demitido_duplicado
+
+    # Cadastros de cada CPF por admissão (vazias por último), demitidos antes dos ativos
+    posicao = np.arange(len(usuarios))
+    ordem_cadastros = np.lexsort((
+        posicao, ativo, admissao.to_numpy().astype('int64'), admissao.isna().to_numpy(), codigos
+    ))
+    ordem_original = np.lexsort((posicao, codigos))
+
+    # Lógica de readmissão: o primeiro retorno com demissão anterior e admissão conhecidas
+    readmissao = no_grupo & (tem_multiplas_admissoes & tem_ativo & tem_demitido)[codigos]
+    cadastros = ordem_cadastros[readmissao[ordem_cadastros]]
+    cpf_cadastro = codigos[cadastros]
+    admissao_cadastro = admissao.to_numpy()[cadastros]
+    demissao_anterior = np.roll(demissao.to_numpy()[cadastros], 1)
+    candidato = np.flatnonzero(
+        np.r_[False, cpf_cadastro[1:] == cpf_cadastro[:-1]] &
+        ~np.isnat(demissao_anterior) & ~np.isnat(admissao_cadastro)
+    )
+    retorno = candidato[~pd.Series(cpf_cadastro[candidato]).duplicated().to_numpy()]
+    intervalo = pd.Series(admissao_cadastro[retorno] - demissao_anterior[retorno]).dt.days.to_numpy()
+
+    readmitido = np.zeros(total_cpfs, dtype=bool)
+    readmitido[cpf_cadastro[retorno]] = True
+    menos_6_meses = np.zeros(total_cpfs, dtype=bool)
+    menos_6_meses[cpf_cadastro[retorno][intervalo < 180]] = True
+    mais_6_meses = readmitido & ~menos_6_meses
+    posicao_no_cpf = pd.Series(cpf_cadastro).groupby(cpf_cadastro).cumcount().to_numpy()
+
+    def voltaram(cpfs_destino):
+        linhas = retorno[cpfs_destino[cpf_cadastro[retorno]]]
+        if not len(linhas):
+            return pd.DataFrame()
+        df = usuarios.take(cadastros[linhas])
+        df.index = posicao_no_cpf[linhas]
+        return df
+
+    def todos_cadastros(cpfs_destino):
+        return _ou_vazio(usuarios.take(cadastros[cpfs_destino[cpf_cadastro]]).reset_index(drop=True))
+
+    # Situação de cada CPF a partir dos seus registros ativos
+    tem_email_pessoal = _por_cpf(codigos, ativo & usuarios['Email_pessoal'].notnull().to_numpy(), total_cpfs) > 0
+    superior_valido = ativo & (usuarios['Superior'].notnull() & (usuarios['Situacao_superior'] != 7)).to_numpy()
+    tem_superior_valido = _por_cpf(codigos, superior_valido, total_cpfs) > 0
+    superiores_demitidos = _por_cpf(codigos, ativo & (usuarios['Situacao_superior'] == 7).to_numpy(), total_cpfs)
+
+    sem_email = tem_ativo & ~tem_email_pessoal
+    sem_superior = tem_ativo & tem_email_pessoal & ~tem_superior_valido
+    superior_corrigido = sem_superior & (superiores_demitidos == qtd_ativos)
+
+    validos = [_linhas(usuarios, superior_valido & (tem_email_pessoal & ~readmitido)[codigos], ordem_original)]
+    if superior_corrigido.any():
+        corrigidos = _linhas(usuarios, ativo & superior_corrigido[codigos], ordem_original)
+        corrigidos = corrigidos.groupby('Cpf', as_index=False).first()[list(usuarios.columns)]
+        corrigidos['Superior'] = "Posto de trabalho de superior não ocupado"
+        # O gestor substituto não é uma pessoa: sem matrícula/empresa, é agrupado pelo nome
+        for coluna in ('Matricula_superior', 'Empresa_superior'):
+            if coluna in corrigidos:
+                corrigidos[coluna] = pd.Series(pd.NA, index=corrigidos.index, dtype=corrigidos[coluna].dtype)
+        validos.append(corrigidos)
+    validos = pd.concat(validos, ignore_index=True)
+    if isinstance(usuarios['Superior'].dtype, pd.CategoricalDtype):
+        # O gestor substituto fica fora das categorias de 'Superior' e a concatenação volta a object
+        validos['Superior'] = validos['Superior'].astype('category')
+    validos = validos.iloc[np.argsort(validos['Cpf'].to_numpy(), kind='stable')].reset_index(drop=True)
 
     return {
-        'validos': pd.concat(validos, ignore_index=True) if validos else pd.DataFrame(),
-        'invalidos_demitidos': pd.concat(invalidos_demitidos, ignore_index=True) if invalidos_demitidos else pd.DataFrame(),
-        'invalidos_sem_email': pd.concat(invalidos_sem_email, ignore_index=True) if invalidos_sem_email else pd.DataFrame(),
-        'invalidos_sem_superior': pd.concat(invalidos_sem_superior, ignore_index=True) if invalidos_sem_superior else pd.DataFrame(),
-        'cadastros_duplicados': pd.concat(cadastros_duplicados, ignore_index=True) if cadastros_duplicados else pd.DataFrame(),
-        'voltaram_menos_6_meses': pd.DataFrame(voltaram_menos_6_meses),
-        'voltaram_mais_6_meses': pd.DataFrame(voltaram_mais_6_meses),
-        'cadastros_menos_6_meses': pd.DataFrame(cadastros_menos_6_meses),
-        'cadastros_mais_6_meses': pd.DataFrame(cadastros_mais_6_meses)
+        'validos': _ou_vazio(validos),
+        'invalidos_demitidos': _ou_vazio(_linhas(usuarios, demitido_duplicado | ~tem_ativo[codigos], ordem_cadastros)),
+        'invalidos_sem_email': _ou_vazio(_linhas(usuarios, ativo & sem_email[codigos], ordem_original)),
+        'invalidos_sem_superior': _ou_vazio(_linhas(usuarios, ativo & (sem_superior & ~superior_corrigido)[codigos], ordem_original)),
+        'cadastros_duplicados': _ou_vazio(_linhas(usuarios, readmissao, ordem_cadastros)),
+        'voltaram_menos_6_meses': voltaram(menos_6_meses),
+        'voltaram_mais_6_meses': voltaram(mais_6_meses),
+        'cadastros_menos_6_meses': todos_cadastros(menos_6_meses),
+        'cadastros_mais_6_meses': todos_cadastros(mais_6_meses)
     }
 
 def verificar_cpfs_repetidos(df):
-    cpfs = df['Cpf'].astype(str).str.strip().str.zfill(11)
+    cpfs = df['Cpf']
     cpfs_repetidos = cpfs[cpfs.duplicated()].unique().tolist()
-    print(f"> Total de CPFs repetidos encontrados: {len(cpfs_repetidos)}")
+    logging.info(f"Total de CPFs repetidos encontrados: {len(cpfs_repetidos)}")
     return cpfs_repetidos
 
 def agrupar_por_cpf_df(df_validos):
-    df_validos['Cpf'] = df_validos['Cpf'].astype(str).str.strip().str.zfill(11)
     verificar_cpfs_repetidos(df_validos)
     return {cpf: grupo for cpf, grupo in df_validos.groupby('Cpf')}
 
 def processar_cpf_df(cpf, registros_df):
-    registros_df['Situacao'] = registros_df['Situacao'].astype(int)
+    registros_df['Situacao'] = registros_df['Situacao'].astype('int8')
     todas_demitidas = (registros_df['Situacao'] == 7).all()
     registros_ativos = registros_df[registros_df['Situacao'] != 7]
 
     if len(registros_ativos) > 1:
-        logging.warning(f"Inconsistencia: CPF {cpf} com multiplos registros ativos")
-        print(f"> CPF {cpf} com {len(registros_ativos)} registros ativos")
+        logging.warning(f"Inconsistencia: CPF {cpf} com {len(registros_ativos)} registros ativos")
         for _, row in registros_ativos.iterrows():
-            print(f">  Matrícula - {row['Matricula']} | Situação: {row['Situacao']} | Nome: {row['Nome']} | Email: {row['Email']}")
+            logging.warning(f"  Matrícula - {row['Matricula']} | Situação: {row['Situacao']} | Nome: {row['Nome']} | Email: {row['Email']}")
 
     return {
         'cpf': cpf,
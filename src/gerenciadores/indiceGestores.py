@@ -0,0 +1,96 @@
+# src/gerenciadores/indiceGestores.py
+"""
+Índice dos gestores de um df_validos, montado uma única vez por execução e
+compartilhado por todas as mensagens de gestores (mensais e diárias, dos dois fluxos).
+O gestor é identificado pela empresa e matrícula (NUMEMP/NUMCAD), e não pelo nome:
+gestores homônimos recebem mensagens separadas. Linhas sem essa identificação
+(ex.: arquivos exportados antes dessas colunas ou o gestor substituto da
+classificação) são agrupadas pelo nome, como antes.
+"""
+import numpy as np
+import pandas as pd
+
+# A chave de um gestor identificado junta empresa e matrícula num único inteiro
+BITS_MATRICULA = 40
+
+def _identificacao(df, coluna):
+    if coluna not in df:
+        return np.full(len(df), -1, dtype='int64')
+    return pd.to_numeric(df[coluna]).astype('Int64').to_numpy(dtype='int64', na_value=-1)
+
+def _coluna(df, nome):
+    if nome not in df:
+        return np.full(len(df), None, dtype=object)
+    return df[nome].to_numpy(dtype=object, na_value=None)
+
+def _identificados(df):
+    """Chave (empresa, matrícula) de cada linha; -1 quando falta a identificação."""
+    empresa = _identificacao(df, 'Empresa_superior')
+    matricula = _identificacao(df, 'Matricula_superior')
+    return np.where((empresa >= 0) & (matricula >= 0), (empresa << BITS_MATRICULA) | matricula, -1)
+
+class indiceGestores:
+    def __init__(self, df_validos):
+        identificado = _identificados(df_validos)
+        nomes = _coluna(df_validos, 'Superior')
+        # Sem identificação, o gestor é o nome: chaves negativas, uma por nome distinto
+        sem_identificacao = (identificado < 0) & pd.notna(nomes)
+        self._nomes_sem_identificacao = pd.Index(pd.unique(nomes[sem_identificacao]), dtype=object)
+        chave = self._chave(identificado, nomes)
+        linhas = np.flatnonzero(chave != -1)
+        codigos, chaves = pd.factorize(chave[linhas])
+
+        # Nome, e-mail e situação de cada gestor vêm da sua primeira linha
+        primeira = linhas[np.unique(codigos, return_index=True)[1]]
+        nomes = nomes[primeira]
+        emails = _coluna(df_validos, 'Email_superior')[primeira]
+        situacoes = _coluna(df_validos, 'Situacao_superior')[primeira]
+
+        # Códigos em ordem de nome (como o groupby('Superior') fazia), desempatados pela chave
+        ordem_nome = pd.factorize(pd.Series(nomes, dtype=object), sort=True)[0]
+        ordem = np.lexsort((chaves, ordem_nome))
+        recodificar = np.empty(len(ordem), dtype='int64')
+        recodificar[ordem] = np.arange(len(ordem))
+        codigos = recodificar[codigos]
+        self._chaves = pd.Index(chaves[ordem])
+        self.nomes = nomes[ordem]
+        self.emails = emails[ordem]
+        self.situacoes = situacoes[ordem]
+
+        # Liderados diretos de cada gestor: posições em df_validos, contíguas em 'ordem' a partir de 'inicio'
+        self._ordem = linhas[np.argsort(codigos, kind='stable')]
+        self._quantidade = np.bincount(codigos, minlength=len(self._chaves))
+        self._inicio = np.cumsum(self._quantidade) - self._quantidade
+
+    def _chave(self, identificado, nomes):
+        """Chave de cada linha: a identificação, -2 - posição do nome sem identificação, ou -1 sem gestor."""
+        sem_identificacao = self._nomes_sem_identificacao.get_indexer(pd.Index(nomes, dtype=object))
+        return np.where(identificado >= 0, identificado, np.where(sem_identificacao >= 0, -2 - sem_identificacao, -1))
+
+    def __len__(self):
+        return len(self._chaves)
+
+    def chave(self, codigo):
+        """Chave do gestor na caixa de saída: 'NUMEMP-NUMCAD' ou, sem identificação, o nome."""
+        chave = int(self._chaves[codigo])
+        if chave >= 0:
+            return f"{chave >> BITS_MATRICULA}-{chave & ((1 << BITS_MATRICULA) - 1)}"
+        return str(self.nomes[codigo])
+
+    def liderados(self, codigo):
+        """Posições, em df_validos, dos liderados diretos do gestor."""
+        inicio = self._inicio[codigo]
+        return self._ordem[inicio:inicio + self._quantidade[codigo]]
+
+    def codigos(self, df):
+        """Código do gestor de cada linha de um quadro com as colunas de df_validos (-1 sem gestor)."""
+        chave = self._chave(_identificados(df), _coluna(df, 'Superior'))
+        return np.where(chave != -1, self._chaves.get_indexer(chave), -1)
+
+    def agrupar(self, df):
+        """(código, posições das linhas) de cada gestor presente no quadro, na ordem dos códigos."""
+        codigos = self.codigos(df)
+        linhas = np.flatnonzero(codigos >= 0)
+        linhas = linhas[np.argsort(codigos[linhas], kind='stable')]
+        presentes, inicio = np.unique(codigos[linhas], return_index=True)
+        return list(zip(presentes.tolist(), np.split(linhas, inicio[1:])))
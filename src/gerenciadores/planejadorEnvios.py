@@ -0,0 +1,345 @@
+# src/gerenciadores/planejadorEnvios.py
+"""
+Planejamento dos envios do dia.
+Uma única passagem sobre os dados classificados gera o plano com todas as
+mensagens a enviar (tipo, destinatários e linhas de que cada uma precisa).
+Os métodos enviar_* de email_utils apenas renderizam e enviam a partir dele.
+"""
+import json
+import logging
+from dataclasses import dataclass, field, asdict, replace
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+from utils.config import EMAIL_RH, EMAIL_TESTE
+from gerenciadores import registrosColaboradores
+
+# Anos de casa que recebem o e-mail "Estrela"
+ANOS_STAR = [5, 10, 15, 20, 25, 30]
+# Destinatários do e-mail de aniversariantes com múltiplas admissões
+EMAIL_RH_DUPLICADOS = [
+    EMAIL_TESTE,
+    "sophia.alberton@fgmdentalgroup.com"
+]
+
+# Tipos de mensagem do plano. São as chaves de EMAIL_TEMPLATES, com exceção do
+# e-mail individual "Estrela", que usa o template INDIVIDUAL_ANIVERSARIANTE_EMPRESA.
+RH_ANIVERSARIANTES_EMPRESA_DUPLICADOS = "RH_ANIVERSARIANTES_EMPRESA_DUPLICADOS"
+RH_ANIVERSARIANTES_EMPRESA = "RH_ANIVERSARIANTES_EMPRESA"
+GESTOR_ANIVERSARIANTES_EMPRESA = "GESTOR_ANIVERSARIANTES_EMPRESA"
+INDIVIDUAL_ANIVERSARIANTE_EMPRESA = "INDIVIDUAL_ANIVERSARIANTE_EMPRESA"
+INDIVIDUAL_ANIVERSARIANTE_EMPRESA_STAR = "INDIVIDUAL_ANIVERSARIANTE_EMPRESA_STAR"
+GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA = "GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA"
+RH_ANIVERSARIANTES_NASCIMENTO = "RH_ANIVERSARIANTES_NASCIMENTO"
+GESTOR_ANIVERSARIANTES_NASCIMENTO = "GESTOR_ANIVERSARIANTES_NASCIMENTO"
+INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO = "INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO"
+GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO = "GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO"
+GESTOR_CONSOLIDADO = "GESTOR_CONSOLIDADO"
+
+# Mensagens de gestor que viram seções do GESTOR_CONSOLIDADO, na ordem em que aparecem nele
+SECOES_GESTOR_CONSOLIDADO = (
+    GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA,
+    GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO,
+    GESTOR_ANIVERSARIANTES_EMPRESA,
+    GESTOR_ANIVERSARIANTES_NASCIMENTO,
+)
+
+@dataclass
+class itemEnvio:
+    """
+    Uma mensagem do plano: as linhas usadas são posições no quadro indicado.
+    O GESTOR_CONSOLIDADO não tem linhas próprias: as suas seções são as mensagens de gestor que ele substitui.
+    """
+    tipo: str
+    destinatarios: list
+    quadro: str
+    linhas: list
+    chave: str = ""
+    parametros: dict = field(default_factory=dict)
+    secoes: list = field(default_factory=list)
+
+class planoEnvios:
+    """
+    Mensagens do dia e os quadros (DataFrames) de onde saem as suas linhas.
+    Com uma caixa de saída, as mensagens já enviadas na data ficam de fora de pendentes().
+    """
+    def __init__(self, data_referencia, caixa_saida=None):
+        self.data_referencia = data_referencia
+        self.caixa_saida = caixa_saida
+        self.quadros = {}
+        self.itens = []
+        self._registros = {}
+
+    def adicionar_quadro(self, nome, df):
+        self.quadros[nome] = df.reset_index(drop=True)
+        self._registros.pop(nome, None)
+        return self.quadros[nome]
+
+    def adicionar(self, tipo, destinatarios, quadro, linhas, chave="", **parametros):
+        self.itens.append(itemEnvio(tipo, list(destinatarios), quadro, [int(i) for i in linhas], str(chave), parametros))
+
+    def itens_do_tipo(self, tipo):
+        return [item for item in self.itens if item.tipo == tipo]
+
+    def pendentes(self, tipo):
+        """
+        Mensagens do tipo que ainda não constam como enviadas na caixa de saída.
+        Itens repetidos (mesma chave, ex.: CPF com linhas duplicadas) saem uma única vez.
+        Nas mensagens com seções, a caixa de saída guarda cada seção com o seu tipo:
+        as seções já enviadas (em qualquer modo) saem da mensagem.
+        """
+        itens = self.itens_do_tipo(tipo)
+        if self.caixa_saida is None or not itens:
+            return itens
+        if any(item.secoes for item in itens):
+            return self._secoes_pendentes(tipo, itens)
+        vistos = self.caixa_saida.enviados(self.data_referencia, tipo)
+        pendentes = []
+        for item in itens:
+            if item.chave not in vistos:
+                vistos.add(item.chave)
+                pendentes.append(item)
+        if len(pendentes) < len(itens):
+            logging.info(f"{len(itens) - len(pendentes)} mensagem(ns) {tipo} já enviada(s) em {self.data_referencia:%d/%m/%Y} ou repetida(s). Pulando.")
+        return pendentes
+
+    def _secoes_pendentes(self, tipo, itens):
+        vistos = {}
+        pendentes = []
+        for item in itens:
+            secoes = []
+            for secao in item.secoes:
+                if secao.tipo not in vistos:
+                    vistos[secao.tipo] = self.caixa_saida.enviados(self.data_referencia, secao.tipo)
+                if secao.chave not in vistos[secao.tipo]:
+                    vistos[secao.tipo].add(secao.chave)
+                    secoes.append(secao)
+            if len(secoes) == len(item.secoes):
+                pendentes.append(item)
+            elif secoes:
+                pendentes.append(replace(item, secoes=secoes))
+        if len(pendentes) < len(itens):
+            logging.info(f"{len(itens) - len(pendentes)} mensagem(ns) {tipo} já enviada(s) em {self.data_referencia:%d/%m/%Y}. Pulando.")
+        return pendentes
+
+    def dados(self, item):
+        """Linhas de que a mensagem precisa, na ordem em que foram planejadas."""
+        return self.quadros[item.quadro].iloc[item.linhas]
+
+    def registros(self, item):
+        """Registros (colaborador) das linhas do item; o quadro é convertido uma única vez."""
+        if item.quadro not in self._registros:
+            self._registros[item.quadro] = registrosColaboradores.montar_colaboradores(self.quadros[item.quadro])
+        registros = self._registros[item.quadro]
+        return [registros[linha] for linha in item.linhas]
+
+    def gestor(self, item):
+        """Gestor destinatário de uma mensagem de gestor, com os seus liderados."""
+        return registrosColaboradores.gestor(item.parametros['gestor'], item.destinatarios[0], self.registros(item))
+
+    def resumo(self):
+        """Quantidade de mensagens por tipo."""
+        resumo = {}
+        for item in self.itens:
+            resumo[item.tipo] = resumo.get(item.tipo, 0) + 1
+        return resumo
+
+    def para_dict(self):
+        """Representação serializável do plano (datas em ISO 8601)."""
+        return {
+            'data_referencia': self.data_referencia.isoformat(),
+            'quadros': {
+                nome: json.loads(df.to_json(orient='records', date_format='iso', force_ascii=False))
+                for nome, df in self.quadros.items()
+            },
+            'itens': [asdict(item) for item in self.itens],
+        }
+
+    def salvar(self, caminho):
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(self.para_dict(), arquivo, ensure_ascii=False, indent=2, default=str)
+
+def _emails_individuais(df):
+    """E-mails corporativo e pessoal válidos de cada linha, sem criar uma Series por linha."""
+    colunas = [df[coluna].to_numpy(dtype=object, na_value=None) for coluna in ('Email_corporativo', 'Email_pessoal') if coluna in df]
+    return [[email for email in emails if email and not pd.isna(email)] for emails in zip(*colunas)]
+
+def _planejar_individuais(plano, tipo, quadro, linhas):
+    df = plano.quadros[quadro]
+    for posicao, destinatarios in zip(linhas, _emails_individuais(df.iloc[linhas])):
+        if not destinatarios:
+            logging.warning(f"{df['Nome'].iloc[posicao]} não possui e-mail válido cadastrado. Pulando envio.")
+            continue
+        plano.adicionar(tipo, destinatarios, quadro, [posicao], chave=registrosColaboradores.formatar_cpf(df['Cpf'].iloc[posicao]))
+
+def _planejar_gestores(plano, tipo, quadro, gestores):
+    """
+    Uma mensagem por gestor com as linhas dos seus liderados no quadro.
+    'gestores' é o indiceGestores da execução: o gestor é identificado pela
+    matrícula/empresa, não pelo nome, e o nome e o e-mail vêm do índice.
+    """
+    df = plano.quadros[quadro]
+    if df.empty:
+        return
+    for codigo, linhas in gestores.agrupar(df):
+        nome_gestor = gestores.nomes[codigo]
+        email_gestor = gestores.emails[codigo]
+        if not email_gestor:
+            logging.warning(f"Gestor {nome_gestor} não possui e-mail cadastrado. Pulando envio.")
+            continue
+        plano.adicionar(tipo, [email_gestor], quadro, linhas, chave=gestores.chave(codigo), gestor=nome_gestor)
+
+def _planejar_empresa(plano, resultados, gerenciador, envios_ativos, mensal, do_dia=None):
+    data_referencia = plano.data_referencia
+    df_validos = resultados['validos']
+
+    if mensal:
+        # --- LÓGICA PARA COLABORADORES READMITIDOS (CASOS ESPECIAIS) ---
+        df_duplicados = resultados['cadastros_duplicados']
+        if RH_ANIVERSARIANTES_EMPRESA_DUPLICADOS in envios_ativos and not df_duplicados.empty:
+            aniversariantes_duplicados_df = gerenciador.identificar_aniversariantes_mes_seguinte_duplicados(df_duplicados, data_referencia)
+            # Separa as duas listas do e-mail da Vanessa numa coluna do próprio quadro (join por CPF)
+            retornos = pd.concat([
+                pd.DataFrame({'Cpf': resultados['cadastros_menos_6_meses'].get('Cpf', pd.Series(dtype=object)).unique(), 'Retorno_menos_6_meses': True}),
+                pd.DataFrame({'Cpf': resultados['cadastros_mais_6_meses'].get('Cpf', pd.Series(dtype=object)).unique(), 'Retorno_menos_6_meses': False}),
+            ]).drop_duplicates(subset='Cpf')
+            aniversariantes_duplicados_df = aniversariantes_duplicados_df.merge(retornos, on='Cpf', how='inner')
+            aniversariantes_duplicados_df = aniversariantes_duplicados_df.sort_values('Retorno_menos_6_meses', ascending=False, kind='stable')
+            duplicados = plano.adicionar_quadro('empresa_duplicados_mes_seguinte', aniversariantes_duplicados_df)
+            if duplicados.empty:
+                logging.info("Nenhum aniversariante de tempo de empresa com múltiplas admissões para o próximo mês. E-mail para Vanessa não enviado.")
+            else:
+                plano.adicionar(RH_ANIVERSARIANTES_EMPRESA_DUPLICADOS, EMAIL_RH_DUPLICADOS, 'empresa_duplicados_mes_seguinte', range(len(duplicados)))
+
+        # --- LÓGICA MENSAL PARA COLABORADORES COM CADASTRO ÚNICO ---
+        mes_seguinte = plano.adicionar_quadro(
+            'empresa_mes_seguinte', gerenciador.identificar_aniversariantes_mes_seguinte(df_validos, data_referencia)
+        )
+        if RH_ANIVERSARIANTES_EMPRESA in envios_ativos:
+            if mes_seguinte.empty:
+                logging.info("Nenhum aniversariante de tempo de empresa para o proximo mes. E-mail para o RH nao enviado.")
+            else:
+                plano.adicionar(RH_ANIVERSARIANTES_EMPRESA, [EMAIL_RH], 'empresa_mes_seguinte', range(len(mes_seguinte)))
+        if GESTOR_ANIVERSARIANTES_EMPRESA in envios_ativos:
+            _planejar_gestores(plano, GESTOR_ANIVERSARIANTES_EMPRESA, 'empresa_mes_seguinte', gerenciador.indice_gestores(df_validos))
+    else:
+        logging.info("Hoje não é dia 27. E-mails mensais de tempo de empresa não serão enviados.")
+
+    # --- LÓGICA DIÁRIA (E-MAILS DE PARABÉNS) ---
+    if do_dia is None:
+        do_dia = gerenciador.identificar_aniversariantes_do_dia(df_validos, data_referencia)
+    do_dia = plano.adicionar_quadro('empresa_do_dia', do_dia)
+    # Separa aniversariantes "Estrela" (5, 10, 15... anos) dos demais
+    e_star = np.isin(do_dia['Anos_de_casa'].to_numpy(), ANOS_STAR)
+    if INDIVIDUAL_ANIVERSARIANTE_EMPRESA_STAR in envios_ativos:
+        _planejar_individuais(plano, INDIVIDUAL_ANIVERSARIANTE_EMPRESA_STAR, 'empresa_do_dia', np.flatnonzero(e_star))
+    if INDIVIDUAL_ANIVERSARIANTE_EMPRESA in envios_ativos:
+        _planejar_individuais(plano, INDIVIDUAL_ANIVERSARIANTE_EMPRESA, 'empresa_do_dia', np.flatnonzero(~e_star))
+    if GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA in envios_ativos:
+        _planejar_gestores(plano, GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA, 'empresa_do_dia', gerenciador.indice_gestores(df_validos))
+
+def _planejar_nascimento(plano, resultados, gerenciador, envios_ativos, mensal, do_dia=None):
+    data_referencia = plano.data_referencia
+    df_validos = resultados['validos']
+
+    # --- LÓGICA MENSAL ---
+    if mensal:
+        mes_seguinte = plano.adicionar_quadro(
+            'nascimento_mes_seguinte', gerenciador.identificar_aniversariantes_de_nascimento_mes_seguinte(df_validos, data_referencia)
+        )
+        if RH_ANIVERSARIANTES_NASCIMENTO in envios_ativos:
+            if mes_seguinte.empty:
+                logging.info("Nenhum aniversariante de nascimento no próximo mês. E-mail para o RH não enviado.")
+            else:
+                plano.adicionar(RH_ANIVERSARIANTES_NASCIMENTO, [EMAIL_RH], 'nascimento_mes_seguinte', range(len(mes_seguinte)))
+        if GESTOR_ANIVERSARIANTES_NASCIMENTO in envios_ativos:
+            _planejar_gestores(plano, GESTOR_ANIVERSARIANTES_NASCIMENTO, 'nascimento_mes_seguinte', gerenciador.indice_gestores(df_validos))
+    else:
+        logging.info("Hoje não é dia 27. E-mails mensais de aniversariantes de nascimento não serão enviados.")
+
+    # --- LÓGICA DIÁRIA ---
+    if do_dia is None:
+        do_dia = gerenciador.identificar_aniversariantes_de_nascimento_do_dia(df_validos, data_referencia)
+    do_dia = plano.adicionar_quadro('nascimento_do_dia', do_dia)
+    if INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO in envios_ativos:
+        _planejar_individuais(plano, INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO, 'nascimento_do_dia', range(len(do_dia)))
+    if GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO in envios_ativos:
+        _planejar_gestores(plano, GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO, 'nascimento_do_dia', gerenciador.indice_gestores(df_validos))
+
+def _consolidar_gestores(plano):
+    """
+    Junta as mensagens de gestor do dia (diárias e mensais, dos dois fluxos) de cada
+    gestor com mais de uma delas num único GESTOR_CONSOLIDADO, com uma seção por
+    mensagem. Os gestores com uma só mensagem continuam recebendo a do seu fluxo.
+    """
+    por_gestor = {}
+    for item in plano.itens:
+        if item.tipo in SECOES_GESTOR_CONSOLIDADO:
+            por_gestor.setdefault(item.chave, []).append(item)
+    consolidados = {chave: secoes for chave, secoes in por_gestor.items() if len(secoes) > 1}
+    if not consolidados:
+        return
+    plano.itens = [item for item in plano.itens if item.tipo not in SECOES_GESTOR_CONSOLIDADO or item.chave not in consolidados]
+    for chave, secoes in consolidados.items():
+        secoes.sort(key=lambda secao: SECOES_GESTOR_CONSOLIDADO.index(secao.tipo))
+        plano.itens.append(itemEnvio(
+            GESTOR_CONSOLIDADO, list(secoes[0].destinatarios), "", [], chave,
+            {'gestor': secoes[0].parametros['gestor']}, secoes
+        ))
+
+def planejar_envios(resultados, gerenciador, data_referencia, fluxos, envios_ativos, mensal, caixa_saida=None, consolidar_gestores=False):
+    """
+    Monta o plano de envios do dia a partir do resultado de classificar_usuarios.
+    - fluxos: 'empresa' e/ou 'nascimento'.
+    - envios_ativos: tipos de mensagem que devem entrar no plano.
+    - mensal: se os e-mails mensais (aniversariantes do mês seguinte) saem hoje.
+    - caixa_saida: caixaSaida opcional usada para não reenviar mensagens do dia.
+    - consolidar_gestores: junta as mensagens de gestor do dia num GESTOR_CONSOLIDADO por gestor.
+    """
+    plano = planoEnvios(data_referencia, caixa_saida)
+    if 'empresa' in fluxos:
+        _planejar_empresa(plano, resultados, gerenciador, envios_ativos, mensal)
+    if 'nascimento' in fluxos:
+        _planejar_nascimento(plano, resultados, gerenciador, envios_ativos, mensal)
+    if consolidar_gestores:
+        _consolidar_gestores(plano)
+    logging.info(f"Plano de envios montado com {len(plano.itens)} mensagem(ns): {plano.resumo()}")
+    return plano
+
+def planejar_envios_periodo(resultados, gerenciador, datas, fluxos, envios_ativos, mensal, caixa_saida=None, consolidar_gestores=False):
+    """
+    Planos de envio de várias datas (ex.: os dias em que a execução diária não rodou),
+    a partir de uma única classificação. Os aniversariantes do dia de todas as datas
+    saem de uma única busca no índice. Retorna um plano por data, em ordem cronológica.
+    - mensal: função que diz se os e-mails mensais saem na data; os de cada mês
+      seguinte entram uma única vez, no plano da primeira data em que sairiam.
+    Os demais parâmetros são os de planejar_envios.
+    """
+    datas = sorted(set(datas))
+    df_validos = resultados['validos']
+    do_dia = {}
+    if 'empresa' in fluxos:
+        do_dia['empresa'] = gerenciador.identificar_aniversariantes_do_periodo(df_validos, datas)
+    if 'nascimento' in fluxos:
+        do_dia['nascimento'] = gerenciador.identificar_aniversariantes_de_nascimento_do_periodo(df_validos, datas)
+
+    planos = []
+    meses_planejados = set()
+    for posicao, data in enumerate(datas):
+        mes_seguinte = data + relativedelta(months=1)
+        mensal_na_data = mensal(data)
+        if mensal_na_data and (mes_seguinte.year, mes_seguinte.month) in meses_planejados:
+            logging.info(f"E-mails mensais de {mes_seguinte:%m/%Y} já planejados em data anterior do período.")
+            mensal_na_data = False
+        elif mensal_na_data:
+            meses_planejados.add((mes_seguinte.year, mes_seguinte.month))
+        plano = planoEnvios(data, caixa_saida)
+        if 'empresa' in fluxos:
+            _planejar_empresa(plano, resultados, gerenciador, envios_ativos, mensal_na_data, do_dia['empresa'][posicao])
+        if 'nascimento' in fluxos:
+            _planejar_nascimento(plano, resultados, gerenciador, envios_ativos, mensal_na_data, do_dia['nascimento'][posicao])
+        if consolidar_gestores:
+            _consolidar_gestores(plano)
+        logging.info(f"Plano de envios de {data:%d/%m/%Y} montado com {len(plano.itens)} mensagem(ns): {plano.resumo()}")
+        planos.append(plano)
+    return planos
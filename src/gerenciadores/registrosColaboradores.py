@@ -0,0 +1,80 @@
+# src/gerenciadores/registrosColaboradores.py
+"""
+Registros compactos (__slots__) usados na renderização dos e-mails.
+São montados uma única vez por quadro do plano, com as conversões feitas por
+coluna (cada data distinta é formatada uma única vez), e evitam criar uma
+Series por linha nos loops de gestores e de e-mails individuais.
+"""
+import numpy as np
+import pandas as pd
+
+class colaborador:
+    """Um colaborador de um quadro do plano, com as datas já formatadas."""
+    __slots__ = (
+        'cpf', 'nome', 'local', 'superior', 'anos_de_casa',
+        'admissao', 'nascimento', 'dia_mes_admissao', 'dia_mes_nascimento'
+    )
+
+    def __init__(self, cpf, nome, local, superior, anos_de_casa, admissao, nascimento, dia_mes_admissao, dia_mes_nascimento):
+        self.cpf = cpf
+        self.nome = nome
+        self.local = local
+        self.superior = superior
+        self.anos_de_casa = anos_de_casa
+        self.admissao = admissao
+        self.nascimento = nascimento
+        self.dia_mes_admissao = dia_mes_admissao
+        self.dia_mes_nascimento = dia_mes_nascimento
+
+    def __repr__(self):
+        return f"colaborador({self.cpf!r}, {self.nome!r})"
+
+class gestor:
+    """Um gestor e os liderados (registros de colaborador) de uma mensagem do plano."""
+    __slots__ = ('nome', 'email', 'liderados')
+
+    def __init__(self, nome, email, liderados):
+        self.nome = nome
+        self.email = email
+        self.liderados = liderados
+
+    def __repr__(self):
+        return f"gestor({self.nome!r}, {len(self.liderados)} liderados)"
+
+def formatar_cpf(cpf):
+    """CPF numérico (int64 no DataFrame) com os 11 dígitos, como exibido e usado nas chaves."""
+    return f"{int(cpf):011d}"
+
+def _coluna(df, nome, padrao):
+    """Valores como objetos Python; ausentes (NaN, pd.NA de texto ou de categoria) viram None."""
+    if nome not in df:
+        return [padrao] * len(df)
+    return df[nome].to_numpy(dtype=object, na_value=None)
+
+def _cpfs(df):
+    if 'Cpf' not in df:
+        return [None] * len(df)
+    return [formatar_cpf(cpf) for cpf in df['Cpf'].to_numpy()]
+
+def _datas(df, nome, formato):
+    """Formata uma coluna de datas de uma vez (cada data distinta uma única vez); datas vazias viram ''."""
+    if nome not in df:
+        return [''] * len(df)
+    codigos, datas = pd.factorize(pd.to_datetime(df[nome]))
+    formatadas = np.append(pd.DatetimeIndex(datas).strftime(formato).to_numpy(dtype=object), '')
+    return formatadas[codigos]
+
+def montar_colaboradores(df):
+    """Lista de colaborador, na ordem das linhas do DataFrame."""
+    return list(map(
+        colaborador,
+        _cpfs(df),
+        _coluna(df, 'Nome', None),
+        _coluna(df, 'Local', 'N/A'),
+        _coluna(df, 'Superior', 'N/A'),
+        _coluna(df, 'Anos_de_casa', None),
+        _datas(df, 'Data_admissao', '%d/%m/%Y'),
+        _datas(df, 'Data_nascimento', '%d/%m'),
+        _datas(df, 'Data_admissao', '%m-%d'),
+        _datas(df, 'Data_nascimento', '%m-%d'),
+    ))
@@ -0,0 +1,112 @@
+# src/script/benchmark.py
+"""
+Microbenchmarks da classificação, da identificação de aniversariantes, do
+planejamento e da renderização das tabelas HTML, sobre dados sintéticos
+(data.dadosSinteticos). Não acessa a Senior nem o Graph.
+
+Uso: python src/script/benchmark.py [--linhas 10000 100000] [--repeticoes 5] [--semente 0] [--processos 1 2 4 8]
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from data.dadosSinteticos import gerar_colaboradores, DATA_EXTRACAO_PADRAO
+from gerenciadores.gerenciarColaboradores import classificar_usuarios
+from gerenciadores.classificacaoParalela import classificar_usuarios_paralelo
+from gerenciadores.gerenciarAniversariantes import gerenciadorAniversariantes
+from gerenciadores.planejadorEnvios import planejar_envios
+from utils.config import configurar_locale
+from utils.utilitariosComuns import utilitariosComuns
+
+TAMANHOS_PADRAO = (10_000, 100_000, 1_000_000)
+COLUNAS_TABELA = ['Nome', 'Data_admissao', 'Anos_de_casa', 'Local', 'Superior']
+IDENTIFICACOES = (
+    'identificar_aniversariantes_do_dia',
+    'identificar_aniversariantes_mes_seguinte',
+    'identificar_aniversariantes_de_nascimento_do_dia',
+    'identificar_aniversariantes_de_nascimento_mes_seguinte',
+)
+TODOS_ENVIOS = {
+    "RH_ANIVERSARIANTES_EMPRESA_DUPLICADOS", "RH_ANIVERSARIANTES_EMPRESA",
+    "GESTOR_ANIVERSARIANTES_EMPRESA", "INDIVIDUAL_ANIVERSARIANTE_EMPRESA_STAR",
+    "INDIVIDUAL_ANIVERSARIANTE_EMPRESA", "GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA",
+    "RH_ANIVERSARIANTES_NASCIMENTO", "GESTOR_ANIVERSARIANTES_NASCIMENTO",
+    "INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO", "GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO",
+}
+
+def medir(funcao, repeticoes, preparar=None):
+    """Executa 'funcao' 'repeticoes' vezes; 'preparar' monta os argumentos fora da medição."""
+    tempos = []
+    for _ in range(repeticoes):
+        argumentos = preparar() if preparar else ()
+        inicio = time.perf_counter()
+        funcao(*argumentos)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), statistics.median(tempos)
+
+def casos(df, data_referencia, processos=()):
+    """Casos medidos para um DataFrame: (nome, função, preparar)."""
+    resultados = classificar_usuarios(df.copy())
+    validos = resultados['validos']
+    duplicados = resultados['cadastros_duplicados']
+    mes_seguinte = gerenciadorAniversariantes().identificar_aniversariantes_mes_seguinte(validos, data_referencia)
+    tabela_df = mes_seguinte.reindex(columns=COLUNAS_TABELA)
+    tabela_linhas = tabela_df.values.tolist()
+    utilitarios = utilitariosComuns()
+
+    yield 'classificar_usuarios', classificar_usuarios, lambda: (df.copy(),)
+    # Sem o mínimo de linhas por processo: mede exatamente 'quantidade' processos
+    for quantidade in processos:
+        yield (
+            f'classificar_usuarios_paralelo ({quantidade} processos)',
+            lambda usuarios, q=quantidade: classificar_usuarios_paralelo(usuarios, q, linhas_minimas=1),
+            lambda: (df.copy(),),
+        )
+    # Um gerenciador novo a cada repetição: o índice de datas é montado dentro da medição
+    for metodo in IDENTIFICACOES:
+        yield metodo, lambda g, m=metodo: getattr(g, m)(validos, data_referencia), lambda: (gerenciadorAniversariantes(),)
+    yield (
+        'identificar_aniversariantes_mes_seguinte_duplicados',
+        lambda g: g.identificar_aniversariantes_mes_seguinte_duplicados(duplicados, data_referencia),
+        lambda: (gerenciadorAniversariantes(),),
+    )
+    yield (
+        'planejar_envios',
+        lambda g: planejar_envios(resultados, g, data_referencia, ('empresa', 'nascimento'), TODOS_ENVIOS, True),
+        lambda: (gerenciadorAniversariantes(),),
+    )
+    yield f'tabela_html_linhas ({len(tabela_linhas)})', lambda: utilitarios._gerar_tabela_html(COLUNAS_TABELA, tabela_linhas), None
+    yield f'tabela_html_dataframe ({len(tabela_df)})', lambda: utilitarios._gerar_tabela_html(COLUNAS_TABELA, tabela_df), None
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks sobre dados sintéticos da Senior.")
+    parser.add_argument('--linhas', type=int, nargs='+', default=list(TAMANHOS_PADRAO))
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--processos', type=int, nargs='*', default=[], help="Mede também a classificação em paralelo com cada número de processos.")
+    argumentos = parser.parse_args(argumentos)
+
+    configurar_locale()
+    # Os logs de cada chamada medida (inclusive os avisos de gestor sem e-mail)
+    # poluiriam a saída e entrariam na medição
+    logging.disable(logging.WARNING)
+
+    data_referencia = DATA_EXTRACAO_PADRAO
+    print(f"{'caso':<58}{'linhas':>10}{'mín (ms)':>12}{'mediana (ms)':>14}")
+    for linhas in argumentos.linhas:
+        inicio = time.perf_counter()
+        df = gerar_colaboradores(linhas, argumentos.semente, data_referencia)
+        print(f"{'gerar_colaboradores':<58}{linhas:>10}{(time.perf_counter() - inicio) * 1000:>12.1f}{'':>14}")
+        for nome, funcao, preparar in casos(df, data_referencia, argumentos.processos):
+            minimo, mediana = medir(funcao, argumentos.repeticoes, preparar)
+            print(f"{nome:<58}{linhas:>10}{minimo * 1000:>12.1f}{mediana * 1000:>14.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# src/script/exportarDados.py
+"""
+Exporta os dados de colaboradores para um arquivo local (Parquet ou SQLite),
+usado com FONTE_DADOS=parquet/sqlite para reproduzir a execução sem a Senior.
+
+Uso:
+    python src/script/exportarDados.py Logs/colaboradores.parquet              # extração completa da Senior
+    python src/script/exportarDados.py dados.sqlite3 --sinteticos 100000       # dados sintéticos (semente 0)
+"""
+import argparse
+import logging
+import os
+import sys
+
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from utils.config import dict_extract
+
+EXTENSOES_PARQUET = ('.parquet',)
+EXTENSOES_SQLITE = ('.sqlite', '.sqlite3', '.db')
+
+def _dados_senior():
+    from data.conexaoSenior import conexaoSenior
+    conexao = conexaoSenior(**dict_extract["Senior"])
+    if not conexao.conectar():
+        return None
+    try:
+        return conexao.consultaDadosSenior()
+    finally:
+        conexao.desconectar()
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Exporta os dados de colaboradores para Parquet ou SQLite.")
+    parser.add_argument('destino', help="Arquivo de saída (.parquet, .sqlite, .sqlite3 ou .db).")
+    parser.add_argument('--sinteticos', type=int, metavar='LINHAS', help="Gera LINHAS registros sintéticos em vez de consultar a Senior.")
+    parser.add_argument('--semente', type=int, default=0)
+    argumentos = parser.parse_args(argumentos)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s", force=True)
+
+    extensao = os.path.splitext(argumentos.destino)[1].lower()
+    if extensao not in EXTENSOES_PARQUET + EXTENSOES_SQLITE:
+        parser.error(f"extensão não suportada: '{extensao}'.")
+
+    if argumentos.sinteticos:
+        from data.dadosSinteticos import gerar_colaboradores
+        df = gerar_colaboradores(argumentos.sinteticos, argumentos.semente)
+    else:
+        df = _dados_senior()
+    if df is None or df.empty:
+        logging.error("Nenhum registro para exportar.")
+        return 1
+
+    diretorio = os.path.dirname(os.path.abspath(argumentos.destino))
+    os.makedirs(diretorio, exist_ok=True)
+    if extensao in EXTENSOES_PARQUET:
+        from data.fonteParquet import exportar_parquet
+        exportar_parquet(df, argumentos.destino)
+    else:
+        from data.fonteSqlite import exportar_sqlite
+        exportar_sqlite(df, argumentos.destino)
+    logging.info(f"{len(df)} registros exportados para {argumentos.destino}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
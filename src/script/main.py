@@ -3,8 +3,8 @@ import sys
 import os
 import logging
 import socket
-from datetime import datetime
-from dotenv import load_dotenv, find_dotenv
+import argparse
+from datetime import datetime, timedelta
 
 # --- INICIALIZAÇÃO E CONFIGURAÇÃO DE AMBIENTE ---
 # Adiciona o caminho da pasta 'src' ao sys.path para permitir importações diretas
@@ -13,20 +13,53 @@ src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if src_path not in sys.path:
     sys.path.append(src_path)
 
-from data.conexaoSenior import conexaoSenior
+# O cliente do Graph (requests), os módulos de e-mail, o snapshot (pyarrow) e a fonte de
+# dados escolhida (oracledb só para a Senior) são importados apenas quando usados.
+from data.fonteDados import criar_fonte_dados
+from data.caixaSaida import caixaSaida
 from gerenciadores.gerenciarColaboradores import classificar_usuarios
 from gerenciadores.gerenciarAniversariantes import gerenciadorAniversariantes
-from email_utils.aniversarioEmpresa import aniversarioEmpresa
-from email_utils.aniversarioNascimento import aniversarioNascimento
-from utils.config import dict_extract
+from gerenciadores.planejadorEnvios import planejar_envios, planejar_envios_periodo
+from utils.config import dict_extract, fonte_dados, fonte_dados_caminho, senior_snapshot, senior_snapshot_dias_carga_completa, senior_filtro_aniversariantes, classificacao_processos, caixa_saida, metricas_prometheus, gestor_consolidado, AMBIENTE, configurar_locale
+from utils.metricasExecucao import metricasExecucao
 
 # --- PONTO DE CONFIGURAÇÃO PARA SIMULAÇÃO ---
 # Para testar o comportamento do script em uma data específica,
 # descomente a linha abaixo e defina a data desejada.
 # Se 'data_simulada' for None, o script usará a data atual.
+# Para recuperar vários dias de uma vez, use --inicio/--fim na linha de comando.
 data_simulada = datetime.strptime("01/05/2026", "%d/%m/%Y")
 # data_simulada = None
 
+# Fluxos de aniversário executados: 'empresa' (tempo de casa) e/ou 'nascimento'
+FLUXOS_ATIVOS = ('empresa',)
+# Mensagens que entram no plano de envios (chaves de EMAIL_TEMPLATES)
+ENVIOS_ATIVOS = {
+    "RH_ANIVERSARIANTES_EMPRESA_DUPLICADOS",
+    "RH_ANIVERSARIANTES_EMPRESA",
+    # "GESTOR_ANIVERSARIANTES_EMPRESA",
+    # "INDIVIDUAL_ANIVERSARIANTE_EMPRESA_STAR",
+    # "INDIVIDUAL_ANIVERSARIANTE_EMPRESA",
+    # "GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA",
+    "RH_ANIVERSARIANTES_NASCIMENTO",
+    "GESTOR_ANIVERSARIANTES_NASCIMENTO",
+    "INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO",
+    "GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO",
+}
+
+def _ip_local():
+    """IP da interface de saída, sem consulta de DNS (o connect UDP não envia pacotes)."""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("10.255.255.255", 1))
+            return s.getsockname()[0]
+    except OSError:
+        return "desconhecido"
+
+def e_dia_mensal(data):
+    """Os e-mails mensais (aniversariantes do mês seguinte) saem no dia 27 em produção e todo dia fora dela."""
+    return AMBIENTE != "PRD" or data.day == 27
+
 def configurar_logs():
     """Configura o sistema de logging para registrar as operações em um arquivo e no console."""
     log_directory = os.path.join(os.getcwd(), "Logs")
@@ -40,101 +73,212 @@ def configurar_logs():
         handlers=[logging.FileHandler(log_filename), logging.StreamHandler(sys.stdout)],
         force=True
     )
-    logging.info(f"Executando em: HOST={socket.gethostname()}, IP={socket.gethostbyname(socket.gethostname())}")
+    logging.info(f"Executando em: HOST={socket.gethostname()}, IP={_ip_local()}")
 
 # --- CLASSE PRINCIPAL QUE ORQUESTRA A EXECUÇÃO ---
 class Main:
-    def __init__(self):
-        """Inicializa a aplicação, carregando configurações e instanciando as classes necessárias."""
-        load_dotenv(find_dotenv()) # Carrega as variáveis de ambiente do arquivo .env
-        self.conexao_senior = conexaoSenior(**dict_extract["Senior"])
+    def __init__(self, data_inicio=None, data_fim=None):
+        """
+        Inicializa a aplicação; as variáveis do .env já foram carregadas por utils.config.
+        Com 'data_fim', processa todas as datas de data_inicio a data_fim (modo período).
+        """
+        configurar_locale()
+        # Senior (Oracle) ou arquivo local exportado dela, conforme FONTE_DADOS
+        self.fonte_dados = criar_fonte_dados(fonte_dados, fonte_dados_caminho, **dict_extract["Senior"])
+        self.snapshot_senior = None
+        if senior_snapshot:
+            from data.snapshotSenior import snapshotSenior
+            self.snapshot_senior = snapshotSenior(self.fonte_dados, senior_snapshot, senior_snapshot_dias_carga_completa)
+        self.caixa_saida = caixaSaida(caixa_saida, AMBIENTE) if caixa_saida else None
         self.gerenciador_aniversariantes = gerenciadorAniversariantes()
-        self.email_empresa = aniversarioEmpresa()
-        self.email_nascimento = aniversarioNascimento()
-        self.data_referencia = data_simulada or datetime.now()
+        # Criados por _preparar_envio só quando o plano tem mensagens
+        self.conexao_graph = None
+        self.email_empresa = None
+        self.email_nascimento = None
+        self.email_gestores = None
+        self.data_referencia = data_inicio or data_simulada or datetime.now()
+        data_fim = data_fim or self.data_referencia
+        self.datas = [self.data_referencia + timedelta(days=dias) for dias in range((data_fim - self.data_referencia).days + 1)]
+        self.resultados_envio = []
+        self.metricas = metricasExecucao()
+
+    def _preparar_envio(self):
+        """Carrega os módulos de envio com um único cliente do Graph, compartilhado pelos dois fluxos."""
+        if self.conexao_graph is not None:
+            return
+        from data.conexaoGraph import conexaoGraph
+        from utils.utilitariosComuns import utilitariosComuns
+        from email_utils.aniversarioEmpresa import aniversarioEmpresa
+        from email_utils.aniversarioNascimento import aniversarioNascimento
+        from email_utils.consolidadoGestores import consolidadoGestores
+        self.conexao_graph = conexaoGraph()
+        utilitarios = utilitariosComuns(self.conexao_graph, self.metricas)
+        self.email_empresa = aniversarioEmpresa(utilitarios)
+        self.email_nascimento = aniversarioNascimento(utilitarios)
+        self.email_gestores = consolidadoGestores(utilitarios, self.email_empresa, self.email_nascimento)
+
+    def _registrar_envios(self, resultados):
+        """Acumula os resultados por mensagem devolvidos pelos métodos de envio."""
+        if resultados:
+            self.resultados_envio.extend(resultados)
+
+    def _registrar_resumo_envios(self):
+        """Registra no log o resumo dos envios da execução."""
+        if self.conexao_graph is None:
+            logging.info(">>> Nenhum e-mail a enviar nesta execução.")
+            return
+        from utils.despachoEmails import resumir_resultados
+        self.metricas.registrar_envios(self.resultados_envio)
+        self.metricas.registrar_graph(self.conexao_graph.contadores())
+        resumo = resumir_resultados(self.resultados_envio)
+        logging.info(
+            f">>> Resumo dos envios: {resumo['enviados']}/{resumo['total']} enviados, {resumo['falhas']} falha(s), "
+            f"{resumo['envios_graph']} envio(s) ao Graph com latência média {resumo['latencia_media']:.2f}s, máxima {resumo['latencia_maxima']:.2f}s."
+        )
+        contadores = self.metricas.graph
+        logging.info(
+            f">>> Graph: {contadores['limitadas']} resposta(s) de limite (429/503/504), {contadores['reenviadas']} reenvio(s), "
+            f"{contadores['espera_limitador']:.1f}s de espera no limitador de taxa."
+        )
+        for resultado in self.resultados_envio:
+            if resultado['status'] != 202:
+                logging.error(f"Falha no envio '{resultado['assunto']}' para {resultado['destinatarios']}: {resultado['erro']}")
 
-    def processar_aniversariantes_empresa(self, df_validos, df_duplicados, cadastros_menos_6_meses, cadastros_mais_6_meses):
+    def processar_aniversariantes_empresa(self, plano):
         """Método focado em todo o fluxo de aniversários de tempo de empresa."""
         logging.info(">>> Processando aniversariantes de tempo de empresa...")
-        
-        # --- LÓGICA PARA COLABORADORES READMITIDOS (CASOS ESPECIAIS) ---
-        if not df_duplicados.empty:
-            aniversariantes_duplicados_df = self.gerenciador_aniversariantes.identificar_aniversariantes_mes_seguinte_duplicados(df_duplicados, self.data_referencia)
-            # Separa as duas listas para o e-mail da Vanessa
-            menos_6_meses_df = aniversariantes_duplicados_df[
-                aniversariantes_duplicados_df['Nome'].isin(cadastros_menos_6_meses['Nome'])
-            ]
-            mais_6_meses_df = aniversariantes_duplicados_df[
-                aniversariantes_duplicados_df['Nome'].isin(cadastros_mais_6_meses['Nome'])
-            ]
-            self.email_empresa.enviar_email_rh_aniversariante_empresa_duplicados(mais_6_meses_df, menos_6_meses_df, self.data_referencia)
-
-        # --- LÓGICA MENSAL PARA COLABORADORES COM CADASTRO ÚNICO ---
-        aniversariantes_mes_seguinte_df = self.gerenciador_aniversariantes.identificar_aniversariantes_mes_seguinte(df_validos, self.data_referencia)
-        self.email_empresa.enviar_email_rh_aniversariante_empresa(aniversariantes_mes_seguinte_df, self.data_referencia) # E-mail para o RH
-        # self.email_empresa.enviar_emails_gestores_aniversariante_empresa(aniversariantes_mes_seguinte_df, self.data_referencia) # E-mails para Gestores
-        
-        # --- LÓGICA DIÁRIA (E-MAILS DE PARABÉNS) ---
-        aniversariantes_do_dia_df = self.gerenciador_aniversariantes.identificar_aniversariantes_do_dia(df_validos, self.data_referencia)
-        
-        # Separa aniversariantes "Estrela" (5, 10, 15... anos) dos demais
-        anos_star = [5, 10, 15, 20, 25, 30]
-        aniversariantes_star_df = aniversariantes_do_dia_df[aniversariantes_do_dia_df['Anos_de_casa'].isin(anos_star)]
-        aniversariantes_normais_df = aniversariantes_do_dia_df[~aniversariantes_do_dia_df['Anos_de_casa'].isin(anos_star)]
-
-        # Envia os e-mails individuais e a notificação diária para os gestores
-        # self.email_empresa.enviar_email_individual_aniversariante_empresa_star(aniversariantes_star_df, self.data_referencia)
-        # self.email_empresa.enviar_email_individual_aniversariante_empresa(aniversariantes_normais_df, self.data_referencia)
-        # self.email_empresa.enviar_email_diario_gestor_aniversariante_empresa(aniversariantes_do_dia_df, self.data_referencia)
-
-    def processar_aniversariantes_nascimento(self, df_validos):
+        self._registrar_envios(self.email_empresa.enviar_email_rh_aniversariante_empresa_duplicados(plano)) # E-mail para a Vanessa
+        self._registrar_envios(self.email_empresa.enviar_email_rh_aniversariante_empresa(plano)) # E-mail para o RH
+        self._registrar_envios(self.email_empresa.enviar_emails_gestores_aniversariante_empresa(plano)) # E-mails para Gestores
+        self._registrar_envios(self.email_empresa.enviar_email_individual_aniversariante_empresa_star(plano))
+        self._registrar_envios(self.email_empresa.enviar_email_individual_aniversariante_empresa(plano))
+        self._registrar_envios(self.email_empresa.enviar_email_diario_gestor_aniversariante_empresa(plano))
+
+    def processar_aniversariantes_nascimento(self, plano):
         """Método focado em todo o fluxo de aniversários de nascimento."""
         logging.info(">>> Processando aniversariantes de nascimento...")
-        # --- LÓGICA MENSAL ---
-        aniversariantes_nasc_mes_seguinte_df = self.gerenciador_aniversariantes.identificar_aniversariantes_de_nascimento_mes_seguinte(df_validos, self.data_referencia)
-        self.email_nascimento.enviar_email_rh_aniversariantes_nascimento(aniversariantes_nasc_mes_seguinte_df, self.data_referencia)
-        self.email_nascimento.enviar_emails_gestores_aniversariantes_nascimento(aniversariantes_nasc_mes_seguinte_df, self.data_referencia)
+        self._registrar_envios(self.email_nascimento.enviar_email_rh_aniversariantes_nascimento(plano))
+        self._registrar_envios(self.email_nascimento.enviar_emails_gestores_aniversariantes_nascimento(plano))
+        self._registrar_envios(self.email_nascimento.enviar_email_individual_aniversariante_nascimento(plano))
+        self._registrar_envios(self.email_nascimento.enviar_email_diario_gestor_aniversariante_nascimento(plano))
+
+    def _salvar_plano(self, plano):
+        """Grava o plano do dia em Logs/ para auditoria e reprocessamento."""
+        caminho = os.path.join(os.getcwd(), "Logs", plano.data_referencia.strftime("%Y-%m-%d") + "_plano.json")
+        try:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            plano.salvar(caminho)
+            logging.info(f"Plano de envios salvo em {caminho}.")
+        except OSError as e:
+            logging.error(f"Erro ao salvar o plano de envios: {e}")
 
-        # --- LÓGICA DIÁRIA ---
-        aniversariantes_nasc_do_dia_df = self.gerenciador_aniversariantes.identificar_aniversariantes_de_nascimento_do_dia(df_validos, self.data_referencia)
-        self.email_nascimento.enviar_email_individual_aniversariante_nascimento(aniversariantes_nasc_do_dia_df, self.data_referencia)
-        self.email_nascimento.enviar_email_diario_gestor_aniversariante_nascimento(aniversariantes_nasc_do_dia_df, self.data_referencia)
+    def _salvar_metricas(self):
+        """Grava o resumo JSON da execução em Logs/ e, se configurado, o arquivo do Prometheus."""
+        caminho = os.path.join(os.getcwd(), "Logs", self.metricas.inicio.strftime("%Y-%m-%d_%H%M%S") + "_metricas.json")
+        self.metricas.salvar(caminho, metricas_prometheus)
 
     def executar(self):
         """Ponto de entrada principal que executa todo o processo."""
         logging.info(">>> Iniciando processo de envio de e-mails.")
-        # Garante a conexão com o banco de dados antes de prosseguir
-        if not self.conexao_senior.conexaoBancoSenior():
-            logging.error("Falha ao conectar no banco de dados. Encerrando execução.")
+        if len(self.datas) > 1:
+            logging.info(f">>> Modo período: {len(self.datas)} dia(s), de {self.datas[0]:%d/%m/%Y} a {self.datas[-1]:%d/%m/%Y}.")
+        # Garante a conexão com a fonte de dados antes de prosseguir
+        with self.metricas.etapa("conexao"):
+            conectado = self.fonte_dados.conectar()
+        if not conectado:
+            logging.error("Falha ao conectar na fonte de dados. Encerrando execução.")
+            self._salvar_metricas()
             return
 
         try:
-            # 1. Busca os dados brutos dos colaboradores
-            colaboradores_df = self.conexao_senior.consultaDadosSenior()
+            # 1. Busca os dados brutos dos colaboradores (snapshot local + delta, quando configurado)
+            with self.metricas.etapa("consulta"):
+                if self.snapshot_senior:
+                    colaboradores_df = self.snapshot_senior.atualizar()
+                elif senior_filtro_aniversariantes and len(self.datas) == 1:
+                    # Só os CPFs com aniversário hoje; os do mês seguinte apenas quando o e-mail mensal sai
+                    mensal = e_dia_mensal(self.data_referencia)
+                    colaboradores_df = self.fonte_dados.consultaDadosSeniorAniversariantes(self.data_referencia, FLUXOS_ATIVOS, mensal)
+                else:
+                    # No modo período, uma única extração completa serve a todas as datas
+                    colaboradores_df = self.fonte_dados.consultaDadosSenior()
+            self.metricas.registrar_linhas("colaboradores", len(colaboradores_df))
             if colaboradores_df.empty:
                 logging.warning("Nenhum colaborador encontrado. Encerrando execução.")
+                self.metricas.sucesso = True
                 return
 
             # 2. Classifica os colaboradores, separando-os em grupos
             # Este é um passo CRUCIAL. Ele separa os casos simples ('validos') dos complexos ('duplicados')
-            resultados = classificar_usuarios(colaboradores_df)
-            df_validos = resultados['validos']
-            df_duplicados = resultados['cadastros_duplicados']
-            cadastros_menos_6_meses = resultados['cadastros_menos_6_meses']
-            cadastros_mais_6_meses = resultados['cadastros_mais_6_meses']
+            with self.metricas.etapa("classificacao"):
+                if classificacao_processos > 1:
+                    from gerenciadores.classificacaoParalela import classificar_usuarios_paralelo
+                    resultados = classificar_usuarios_paralelo(colaboradores_df, classificacao_processos)
+                else:
+                    resultados = classificar_usuarios(colaboradores_df)
+            for conjunto, df in resultados.items():
+                self.metricas.registrar_linhas(conjunto, len(df))
 
-            # 3. Executa os fluxos de processamento para cada tipo de aniversário
-            self.processar_aniversariantes_empresa(df_validos, df_duplicados, cadastros_menos_6_meses, cadastros_mais_6_meses)
-            # self.processar_aniversariantes_nascimento(df_validos)
+            # 3. Identifica os aniversariantes e monta o plano de envios de cada dia em uma única passagem
+            with self.metricas.etapa("identificacao"):
+                if len(self.datas) == 1:
+                    planos = [planejar_envios(resultados, self.gerenciador_aniversariantes, self.data_referencia, FLUXOS_ATIVOS, ENVIOS_ATIVOS, e_dia_mensal(self.data_referencia), self.caixa_saida, gestor_consolidado)]
+                else:
+                    planos = planejar_envios_periodo(resultados, self.gerenciador_aniversariantes, self.datas, FLUXOS_ATIVOS, ENVIOS_ATIVOS, e_dia_mensal, self.caixa_saida, gestor_consolidado)
+            for plano in planos:
+                self.metricas.registrar_plano(plano)
+                self._salvar_plano(plano)
+
+            # 4. Renderiza e envia, dia a dia em ordem cronológica, as mensagens que ainda não
+            # saíram (caixa de saída); o tempo dos envios fica na etapa 'envio' e o restante em 'renderizacao'
+            planos = [plano for plano in planos if plano.itens]
+            if not planos:
+                logging.info("Nenhuma mensagem no plano de hoje." if len(self.datas) == 1 else "Nenhuma mensagem nos planos do período.")
+                self.metricas.sucesso = True
+                return
+            self._preparar_envio()
+            with self.metricas.etapa("renderizacao"):
+                for plano in planos:
+                    if len(self.datas) > 1:
+                        logging.info(f">>> Enviando as mensagens de {plano.data_referencia:%d/%m/%Y}...")
+                    if 'empresa' in FLUXOS_ATIVOS:
+                        self.processar_aniversariantes_empresa(plano)
+                    if 'nascimento' in FLUXOS_ATIVOS:
+                        self.processar_aniversariantes_nascimento(plano)
+                    # E-mails consolidados dos gestores (GESTOR_CONSOLIDADO), quando ativados
+                    self._registrar_envios(self.email_gestores.enviar_emails_gestores_consolidados(plano))
+            self.metricas.sucesso = True
 
         finally:
-            # Garante que a conexão com o banco de dados seja sempre fechada
-            self.conexao_senior.desconectar()
+            # Garante que a conexão com a fonte de dados seja sempre fechada
+            self.fonte_dados.desconectar()
+            if self.caixa_saida:
+                self.caixa_saida.fechar()
+            self._registrar_resumo_envios()
+            self._salvar_metricas()
             logging.info(">>> Processo finalizado.")
 
+def _data(texto):
+    try:
+        return datetime.strptime(texto, "%d/%m/%Y")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida: '{texto}' (use DD/MM/AAAA).")
+
+def ler_argumentos(argumentos=None):
+    parser = argparse.ArgumentParser(description="Envia os e-mails de aniversário do dia ou de um período.")
+    parser.add_argument('--inicio', type=_data, metavar='DD/MM/AAAA', help="Data de referência (padrão: data_simulada ou hoje).")
+    parser.add_argument('--fim', type=_data, metavar='DD/MM/AAAA', help="Última data do período, para recuperar dias sem execução.")
+    argumentos = parser.parse_args(argumentos)
+    if argumentos.fim and not argumentos.inicio:
+        parser.error("--fim exige --inicio.")
+    if argumentos.fim and argumentos.fim < argumentos.inicio:
+        parser.error("--fim anterior a --inicio.")
+    return argumentos
+
 # --- PONTO DE EXECUÇÃO DO SCRIPT ---
 # Garante que o código dentro deste bloco só será executado quando o arquivo for chamado diretamente
 if __name__ == "__main__":
+    argumentos = ler_argumentos()
     configurar_logs()
-    main_app = Main()
+    main_app = Main(argumentos.inicio, argumentos.fim)
     main_app.executar()
\ No newline at end of file
@@ -1,9 +1,17 @@
 import os 
+import locale
 from dotenv import load_dotenv
 import logging
+# O .env é carregado uma única vez, na primeira importação deste módulo
 dotenv_path = os.path.join(os.path.dirname(__file__), '../..', '.env')  # Corrigido!
 load_dotenv(dotenv_path)
 
+#Ambiente e destinatários
+# ["gestaodepessoas@fgmdentalgroup.com", "grupo.coordenadores@fgmdentalgroup.com", "grupo.supervisores@fgmdentalgroup.com", "grupo.gerentes@fgmdentalgroup.com"]
+EMAIL_RH = os.getenv("EMAIL_RH", "comunicacaointerna@fgmdentalgroup.com")
+EMAIL_TESTE = os.getenv("EMAIL_TESTE", "sophia.alberton@fgmdentalgroup.com")
+AMBIENTE = os.getenv("AMBIENTE", "QAS")
+
 
 #Database
 host_data = os.getenv('host_senior')
@@ -21,6 +29,20 @@ tenant_id = os.getenv("TENANT_ID")
 client_id = os.getenv("CLIENT_ID")
 client_secret = os.getenv("CLIENT_SECRET")
 email_from = os.getenv("USER_MAIL")
+graph_pool_size = int(os.getenv("GRAPH_POOL_SIZE", "10"))
+graph_concorrencia = int(os.getenv("GRAPH_CONCORRENCIA", "4"))
+graph_modo_lote = os.getenv("GRAPH_MODO_LOTE", "N").upper() in ("S", "SIM", "1", "TRUE")
+# Limite de mensagens por minuto da caixa USER_MAIL (0 desativa) e tentativas por mensagem em 429/5xx
+graph_mensagens_por_minuto = int(os.getenv("GRAPH_MENSAGENS_POR_MINUTO", "30"))
+# Rajada máxima do limite por minuto; vazio usa o próprio GRAPH_MENSAGENS_POR_MINUTO
+graph_rajada = int(os.getenv("GRAPH_RAJADA") or graph_mensagens_por_minuto)
+graph_tentativas = int(os.getenv("GRAPH_TENTATIVAS", "5"))
+# Caixa de saída (SQLite) com o que já foi enviado em cada data e ambiente; sem caminho, fica desativada
+caixa_saida = os.getenv("CAIXA_SAIDA")
+# Arquivo .prom para o textfile collector do node_exporter (ex.: /var/lib/node_exporter/textfile/emailrh.prom); vazio desativa
+metricas_prometheus = os.getenv("METRICAS_PROMETHEUS")
+# Junta as mensagens de gestor do dia (diárias e mensais, dos dois fluxos) num único e-mail por gestor
+gestor_consolidado = os.getenv("GESTOR_CONSOLIDADO", "N").upper() in ("S", "SIM", "1", "TRUE")
 
 
 #Database
@@ -29,6 +51,17 @@ port_senior           = os.getenv('port_senior')
 service_name_senior   =os.getenv('service_name_senior')
 user_senior           =os.getenv('user_senior')
 password_senior       =os.getenv('password_senior')
+# Snapshot local da extração (Arrow IPC); vazio desativa e mantém a consulta completa diária
+senior_snapshot       = os.getenv('SENIOR_SNAPSHOT')
+# Dias entre as cargas completas do snapshot; nos demais dias, só o delta e as chaves são consultados
+senior_snapshot_dias_carga_completa = int(os.getenv('SENIOR_SNAPSHOT_DIAS_CARGA_COMPLETA', '7'))
+# Origem dos dados: 'senior' (Oracle), 'parquet' ou 'sqlite' (arquivo exportado em FONTE_DADOS_CAMINHO)
+fonte_dados           = os.getenv('FONTE_DADOS', 'senior')
+fonte_dados_caminho   = os.getenv('FONTE_DADOS_CAMINHO')
+# Consulta apenas os CPFs com aniversário no dia (e no mês seguinte no dia 27)
+senior_filtro_aniversariantes = os.getenv('SENIOR_FILTRO_ANIVERSARIANTES', 'N').upper() in ("S", "SIM", "1", "TRUE")
+# Processos da classificação; 1 classifica no processo atual
+classificacao_processos = int(os.getenv('CLASSIFICACAO_PROCESSOS', '1'))
 
 dict_extract = {
     "Senior":{
@@ -41,3 +74,16 @@ dict_extract = {
 }
 masked_password = '*' * len(password_senior) if password_senior else None
 logging.info(f"[DEBUG] host: {host_senior}, port: {port_senior}, service: {service_name_senior}, user: {user_senior}, password: {masked_password}")
+
+_locale_configurado = False
+
+def configurar_locale():
+    """Nomes de mês em português (strftime('%B')); o setlocale roda uma única vez por processo."""
+    global _locale_configurado
+    if _locale_configurado:
+        return
+    _locale_configurado = True
+    try:
+        locale.setlocale(locale.LC_TIME, 'pt_BR.UTF-8')
+    except locale.Error as e:
+        logging.warning(f"Locale pt_BR.UTF-8 indisponível ({e}). Nomes de mês no idioma padrão do sistema.")
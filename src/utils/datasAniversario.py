@@ -0,0 +1,18 @@
+# src/utils/datasAniversario.py
+"""
+Regra dos dias de aniversário, compartilhada pelo índice de aniversariantes e
+pelos filtros das fontes (consulta da Senior e arquivos locais): em anos não
+bissextos, quem nasceu ou foi admitido em 29/02 comemora em 28/02.
+"""
+import calendar
+
+def comemora_29_fevereiro(data):
+    """Se a data é o 28/02 de um ano não bissexto, quando também se comemora o 29/02."""
+    return data.month == 2 and data.day == 28 and not calendar.isleap(data.year)
+
+def dias_comemorados(data):
+    """(mês, dia) das datas de aniversário comemoradas na data."""
+    dias = [(data.month, data.day)]
+    if comemora_29_fevereiro(data):
+        dias.append((2, 29))
+    return dias
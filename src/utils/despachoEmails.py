@@ -0,0 +1,101 @@
+# src/utils/despachoEmails.py
+import itertools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from data.conexaoGraph import TAMANHO_LOTE_GRAPH
+from utils.config import graph_concorrencia, graph_modo_lote
+from utils.metricasExecucao import latencias_por_envio
+
+# Identificador de cada envio em lote do processo, compartilhado pelas threads e instâncias
+_lotes = itertools.count(1)
+
+class despachoEmails:
+    """
+    Envia mensagens já renderizadas (tuplas (destinatarios, assunto, corpo))
+    em paralelo, com no máximo 'concorrencia' chamadas simultâneas ao Graph.
+    Cada mensagem gera um resultado com status, latência e erro. No modo lote,
+    a latência é a do envio do lote inteiro (com as novas tentativas), e 'lote'
+    identifica as mensagens que o compartilham; no envio individual, 'lote' é None.
+    """
+    def __init__(self, conexao_graph, concorrencia=None, modo_lote=None):
+        self.conexaoGraph = conexao_graph
+        self.concorrencia = max(1, concorrencia or graph_concorrencia)
+        self.modo_lote = graph_modo_lote if modo_lote is None else modo_lote
+
+    def _resultado(self, mensagem, status, latencia, erro=None, lote=None):
+        destinatarios, assunto, _ = mensagem
+        return {
+            'destinatarios': destinatarios,
+            'assunto': assunto,
+            'status': status,
+            'latencia': latencia,
+            'lote': lote,
+            'erro': erro,
+        }
+
+    def _enviar_individual(self, mensagens):
+        mensagem = mensagens[0]
+        inicio = time.perf_counter()
+        try:
+            status = self.conexaoGraph.enviar_email(*mensagem)
+            erro = None if status == 202 else f"HTTP {status}"
+        except Exception as e:
+            status, erro = None, str(e)
+            logging.error(f"Erro ao enviar e-mail para {mensagem[0]}: {e}")
+        return [self._resultado(mensagem, status, time.perf_counter() - inicio, erro)]
+
+    def _enviar_lote(self, mensagens):
+        inicio = time.perf_counter()
+        try:
+            status = self.conexaoGraph.enviar_emails_em_lote(mensagens)
+            erro = None
+        except Exception as e:
+            status, erro = [None] * len(mensagens), str(e)
+            logging.error(f"Erro ao enviar lote de {len(mensagens)} e-mail(s): {e}")
+        latencia = time.perf_counter() - inicio
+        lote = next(_lotes)
+        return [
+            self._resultado(mensagem, codigo, latencia, erro or (None if codigo == 202 else f"HTTP {codigo}"), lote)
+            for mensagem, codigo in zip(mensagens, status)
+        ]
+
+    def despachar(self, mensagens, ao_concluir=None):
+        """
+        Envia as mensagens e devolve os resultados na mesma ordem recebida.
+        'ao_concluir(inicio, resultados)' é chamado, na thread de quem despacha,
+        com os resultados de cada bloco e a posição da sua primeira mensagem.
+        """
+        if not mensagens:
+            return []
+        tamanho = TAMANHO_LOTE_GRAPH if self.modo_lote else 1
+        tarefa = self._enviar_lote if self.modo_lote else self._enviar_individual
+        blocos = [mensagens[i:i + tamanho] for i in range(0, len(mensagens), tamanho)]
+
+        executor = None
+        if self.concorrencia > 1 and len(blocos) > 1:
+            executor = ThreadPoolExecutor(max_workers=min(self.concorrencia, len(blocos)))
+        concluidos = executor.map(tarefa, blocos) if executor else map(tarefa, blocos)
+        todos = []
+        try:
+            for resultados in concluidos:
+                if ao_concluir:
+                    ao_concluir(len(todos), resultados)
+                todos.extend(resultados)
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+        return todos
+
+def resumir_resultados(resultados):
+    """Consolida os resultados de envio em totais, falhas e latências (por envio ao Graph, não por mensagem)."""
+    latencias = [latencia for _, latencia in latencias_por_envio(resultados)]
+    enviados = sum(1 for r in resultados if r['status'] == 202)
+    return {
+        'total': len(resultados),
+        'enviados': enviados,
+        'falhas': len(resultados) - enviados,
+        'envios_graph': len(latencias),
+        'latencia_media': sum(latencias) / len(latencias) if latencias else 0.0,
+        'latencia_maxima': max(latencias, default=0.0),
+    }
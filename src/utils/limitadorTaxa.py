@@ -0,0 +1,50 @@
+# src/utils/limitadorTaxa.py
+"""
+Limitador de taxa (token bucket) para as chamadas de envio ao Graph.
+As fichas são repostas continuamente a 'por_minuto' / 60 por segundo, até a
+capacidade do balde (por padrão, a cota de um minuto): uma rajada de envios,
+como um /$batch de 20 mensagens, sai de uma vez enquanto houver fichas. Quem pede mais fichas do que há disponíveis reserva as
+fichas (o saldo fica negativo) e espera o tempo de reposição, de modo que
+várias threads são atendidas na ordem em que pediram. Uma pausa (Retry-After
+do Graph) bloqueia todas as threads até o horário indicado.
+"""
+import threading
+import time
+
+class limitadorTaxa:
+    def __init__(self, por_minuto, capacidade=None, relogio=time.monotonic, dormir=time.sleep):
+        """
+        'por_minuto' <= 0 desativa o limite (apenas as pausas continuam valendo).
+        'capacidade' é a rajada máxima; o padrão é 'por_minuto' (mínimo de 1).
+        """
+        self.taxa = por_minuto / 60.0
+        self.capacidade = float(capacidade or max(por_minuto, 1))
+        self.relogio = relogio
+        self.dormir = dormir
+        self._fichas = self.capacidade
+        self._atualizado_em = relogio()
+        self._pausado_ate = 0.0
+        self._lock = threading.Lock()
+
+    def _repor(self, agora):
+        self._fichas = min(self.capacidade, self._fichas + (agora - self._atualizado_em) * self.taxa)
+        self._atualizado_em = agora
+
+    def adquirir(self, quantidade=1):
+        """Consome 'quantidade' fichas, esperando se necessário. Retorna os segundos esperados."""
+        with self._lock:
+            agora = self.relogio()
+            espera = max(0.0, self._pausado_ate - agora)
+            if self.taxa > 0:
+                self._repor(agora)
+                self._fichas -= quantidade
+                if self._fichas < 0:
+                    espera = max(espera, -self._fichas / self.taxa)
+        if espera > 0:
+            self.dormir(espera)
+        return espera
+
+    def pausar(self, segundos):
+        """Suspende os envios de todas as threads por 'segundos' (ex.: Retry-After)."""
+        with self._lock:
+            self._pausado_ate = max(self._pausado_ate, self.relogio() + segundos)
@@ -0,0 +1,198 @@
+# src/utils/metricasExecucao.py
+"""
+Métricas de uma execução: duração de cada etapa, linhas processadas,
+mensagens por tipo (chaves de EMAIL_TEMPLATES) e histogramas da latência dos
+envios ao Graph: um por mensagem enviada individualmente (sendMail) e outro
+por lote ($batch, até 20 mensagens), observado uma única vez por lote. Ao final, são gravadas como um resumo JSON por execução
+e, opcionalmente, como arquivo texto no formato do Prometheus, para o
+textfile collector do node_exporter.
+"""
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+
+PREFIXO = "emailrh"
+# Limites (segundos) dos buckets do histograma de latência do Graph
+BUCKETS_LATENCIA = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _rotulos(**rotulos):
+    if not rotulos:
+        return ""
+    texto = ",".join(
+        '{}="{}"'.format(nome, str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for nome, valor in rotulos.items()
+    )
+    return "{" + texto + "}"
+
+def _gravar(caminho, conteudo):
+    """Grava em um arquivo temporário e troca de uma vez, para o leitor nunca ver o arquivo pela metade."""
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    os.makedirs(diretorio, exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        arquivo.write(conteudo)
+    os.replace(temporario, caminho)
+
+def latencias_por_envio(resultados):
+    """Pares (em_lote, latência) de cada envio ao Graph: um por mensagem individual e um por lote."""
+    latencias, lotes = [], set()
+    for resultado in resultados:
+        lote = resultado.get('lote')
+        if lote is None:
+            latencias.append((False, resultado['latencia']))
+        elif lote not in lotes:
+            latencias.append((True, resultado['latencia']))
+            lotes.add(lote)
+    return latencias
+
+def _resumo_histograma(histograma):
+    return {
+        'total': histograma.total,
+        'soma': histograma.soma,
+        'buckets': {str(limite): quantidade for limite, quantidade in histograma.acumulado()},
+    }
+
+def _amostras_histograma(histograma):
+    """Amostras _bucket, _sum e _count de um histograma no formato do Prometheus."""
+    return (
+        [("_bucket", {'le': limite}, quantidade) for limite, quantidade in histograma.acumulado()]
+        + [("_sum", {}, f"{histograma.soma:.3f}"), ("_count", {}, histograma.total)]
+    )
+
+class histogramaLatencia:
+    """Histograma cumulativo (como o do Prometheus) com soma e contagem."""
+    def __init__(self, buckets=BUCKETS_LATENCIA):
+        self.buckets = tuple(buckets)
+        self.contagens = [0] * (len(self.buckets) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.contagens[bisect_left(self.buckets, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+    def acumulado(self):
+        """Pares (limite, quantidade <= limite), terminando em '+Inf'."""
+        acumulado, pares = 0, []
+        for limite, quantidade in zip(self.buckets + ("+Inf",), self.contagens):
+            acumulado += quantidade
+            pares.append((limite, acumulado))
+        return pares
+
+class metricasExecucao:
+    def __init__(self):
+        self.inicio = datetime.now()
+        self._relogio_inicio = time.perf_counter()
+        self.etapas = {}
+        self.linhas = {}
+        self.mensagens = {}
+        self.latencia_graph = histogramaLatencia()
+        self.latencia_lote_graph = histogramaLatencia()
+        self.graph = {}
+        self.sucesso = False
+        self._abertas = []
+
+    @contextmanager
+    def etapa(self, nome):
+        """
+        Mede uma etapa. Etapas aninhadas descontam o tempo das internas
+        (ex.: 'envio' dentro de 'renderizacao'); usar só na thread principal.
+        """
+        self._abertas.append(0.0)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracao = time.perf_counter() - inicio
+            internas = self._abertas.pop()
+            if self._abertas:
+                self._abertas[-1] += duracao
+            self.etapas[nome] = self.etapas.get(nome, 0.0) + duracao - internas
+            logging.info(f"Etapa '{nome}' concluída em {duracao:.2f}s.")
+
+    def registrar_linhas(self, conjunto, quantidade):
+        self.linhas[conjunto] = int(quantidade)
+
+    def registrar_plano(self, plano):
+        """Mensagens planejadas por tipo."""
+        for tipo, quantidade in plano.resumo().items():
+            self._mensagens(tipo)['planejadas'] += quantidade
+
+    def registrar_envios(self, resultados):
+        """Resultado de cada mensagem enviada e latência de cada envio (mensagem individual ou lote)."""
+        for resultado in resultados:
+            contagem = self._mensagens(resultado.get('tipo', 'desconhecido'))
+            contagem['enviadas' if resultado['status'] == 202 else 'falhas'] += 1
+        for em_lote, latencia in latencias_por_envio(resultados):
+            (self.latencia_lote_graph if em_lote else self.latencia_graph).observar(latencia)
+
+    def registrar_graph(self, contadores):
+        self.graph = dict(contadores)
+
+    def _mensagens(self, tipo):
+        return self.mensagens.setdefault(tipo, {'planejadas': 0, 'enviadas': 0, 'falhas': 0})
+
+    def resumo(self):
+        return {
+            'inicio': self.inicio.isoformat(timespec='seconds'),
+            'duracao': time.perf_counter() - self._relogio_inicio,
+            'sucesso': self.sucesso,
+            'etapas': self.etapas,
+            'linhas': self.linhas,
+            'mensagens': self.mensagens,
+            'latencia_graph': _resumo_histograma(self.latencia_graph),
+            'latencia_lote_graph': _resumo_histograma(self.latencia_lote_graph),
+            'graph': self.graph,
+        }
+
+    def formato_prometheus(self):
+        """Métricas no formato texto de exposição do Prometheus."""
+        resumo = self.resumo()
+        linhas = []
+        def metrica(nome, tipo, ajuda, amostras):
+            linhas.append(f"# HELP {PREFIXO}_{nome} {ajuda}")
+            linhas.append(f"# TYPE {PREFIXO}_{nome} {tipo}")
+            for sufixo, rotulos, valor in amostras:
+                linhas.append(f"{PREFIXO}_{nome}{sufixo}{_rotulos(**rotulos)} {valor}")
+
+        metrica("execucao_inicio_timestamp_segundos", "gauge", "Início da última execução (epoch).",
+                [("", {}, f"{self.inicio.timestamp():.0f}")])
+        metrica("execucao_duracao_segundos", "gauge", "Duração total da última execução.",
+                [("", {}, f"{resumo['duracao']:.3f}")])
+        metrica("execucao_sucesso", "gauge", "1 se a última execução terminou sem erro.",
+                [("", {}, int(self.sucesso))])
+        metrica("etapa_duracao_segundos", "gauge", "Duração de cada etapa da última execução.",
+                [("", {'etapa': nome}, f"{duracao:.3f}") for nome, duracao in self.etapas.items()])
+        metrica("linhas", "gauge", "Linhas processadas por conjunto de dados.",
+                [("", {'conjunto': nome}, quantidade) for nome, quantidade in self.linhas.items()])
+        metrica("mensagens", "gauge", "Mensagens por tipo (chave de EMAIL_TEMPLATES) e situação.",
+                [("", {'tipo': tipo, 'situacao': situacao}, quantidade)
+                 for tipo, contagem in sorted(self.mensagens.items()) for situacao, quantidade in contagem.items()])
+        metrica("graph_latencia_segundos", "histogram",
+                "Latência de cada mensagem enviada individualmente ao Graph (sendMail, com as novas tentativas).",
+                _amostras_histograma(self.latencia_graph))
+        metrica("graph_lote_latencia_segundos", "histogram",
+                "Latência de cada lote enviado ao Graph ($batch com até 20 mensagens, com as novas tentativas); uma observação por lote.",
+                _amostras_histograma(self.latencia_lote_graph))
+        metrica("graph_eventos", "gauge", "Respostas de limite (429/503/504) e reenvios ao Graph.",
+                [("", {'evento': nome}, self.graph.get(nome, 0)) for nome in ('limitadas', 'reenviadas')])
+        metrica("graph_espera_limitador_segundos", "gauge", "Tempo de espera no limitador de taxa do Graph.",
+                [("", {}, f"{self.graph.get('espera_limitador', 0.0):.3f}")])
+        return "\n".join(linhas) + "\n"
+
+    def salvar(self, caminho_json, caminho_prometheus=None):
+        """Grava o resumo JSON e, se configurado, o arquivo do textfile collector."""
+        arquivos = [(caminho_json, lambda: json.dumps(self.resumo(), ensure_ascii=False, indent=2))]
+        if caminho_prometheus:
+            arquivos.append((caminho_prometheus, self.formato_prometheus))
+        for caminho, conteudo in arquivos:
+            try:
+                _gravar(caminho, conteudo())
+                logging.info(f"Métricas da execução salvas em {caminho}.")
+            except OSError as e:
+                logging.error(f"Erro ao salvar as métricas da execução em {caminho}: {e}")
@@ -1,39 +1,100 @@
 # src/utils/utilitariosComuns.py
 from datetime import datetime
-import locale
-import os
+from functools import lru_cache
+from html import escape
+from contextlib import nullcontext
+import pandas as pd
 from data.conexaoGraph import conexaoGraph
+from utils.despachoEmails import despachoEmails
+from utils.config import EMAIL_RH, EMAIL_TESTE, AMBIENTE
 import logging
 
-locale.setlocale(locale.LC_TIME, 'pt_BR.UTF-8')
+# Separador usado para escapar uma coluna inteira de uma vez (não aparece em nomes/datas)
+SEPARADOR_CELULAS = "\x00"
+CARACTERES_ESPECIAIS_HTML = "&<>\"'"
+TABELA_ABERTURA = "<table border='1' cellpadding='5' cellspacing='0' style='border-collapse: collapse; width: 100%;'>"
 
-EMAIL_RH = os.getenv("EMAIL_RH", "comunicacaointerna@fgmdentalgroup.com")
-EMAIL_TESTE = os.getenv("EMAIL_TESTE", "sophia.alberton@fgmdentalgroup.com")
-AMBIENTE = os.getenv("AMBIENTE", "QAS")
+@lru_cache(maxsize=None)
+def _cabecalho_tabela(colunas):
+    """Linha de cabeçalho da tabela, montada uma vez por conjunto de colunas."""
+    celulas = "".join(f"<th>{escape(str(coluna))}</th>" for coluna in colunas)
+    return f"<tr style='background-color: #d3d3d3; color: black;'>{celulas}</tr>"
+
+@lru_cache(maxsize=None)
+def _modelo_linha(quantidade, emojis):
+    """Modelo (str.format) de uma linha com 'quantidade' células e seus emojis."""
+    emojis = [emoji.replace("{", "{{").replace("}", "}}") for emoji in emojis]
+    celulas = "".join(
+        f"<td>{emojis[i] if i < len(emojis) else ''} {{}}</td>" for i in range(quantidade)
+    )
+    return f"<tr>{celulas}</tr>"
+
+def _textos_coluna(valores):
+    """Valores de uma coluna como texto; a coluna só é escapada se tiver caracteres especiais."""
+    textos = list(map(str, valores))
+    junto = SEPARADOR_CELULAS.join(textos)
+    if any(caractere in junto for caractere in CARACTERES_ESPECIAIS_HTML):
+        textos = escape(junto).split(SEPARADOR_CELULAS)
+    return textos
+
+def _linhas_tabela(colunas_dados, emojis):
+    """Linhas <tr> a partir dos dados organizados por coluna."""
+    modelo = _modelo_linha(len(colunas_dados), tuple(emojis))
+    if not colunas_dados:
+        return modelo
+    return "".join(map(modelo.format, *(_textos_coluna(valores) for valores in colunas_dados)))
+
+def _por_chave(chaves, valores):
+    """Repete cada valor (mensagem ou resultado) para cada chave (tipo, chave) da caixa de saída da sua mensagem."""
+    return (
+        [chave for chaves_mensagem in chaves for chave in chaves_mensagem],
+        [valor for chaves_mensagem, valor in zip(chaves, valores) for _ in chaves_mensagem],
+    )
+
+@lru_cache(maxsize=None)
+def corpo_email_com_imagem(imagem_src, texto_alt, link=None):
+    """Corpo estático com imagem centralizada; o mesmo conteúdo é montado uma única vez."""
+    link_tag = f'<a href="{link}" style="display: flex; justify-content: center; align-items: center;">' if link else '<a style="display: flex; justify-content: center; align-items: center;">'
+    return f"""<html><body style="display: flex; justify-content: center; align-items: center; height: 100vh; margin: 0;">
+                    {link_tag}
+                        <img src="{imagem_src}" alt="{texto_alt}">
+                    </a></body></html>"""
 
 class utilitariosComuns:
-    def __init__(self):
-        self.conexaoGraph = conexaoGraph()
+    def __init__(self, conexao_graph=None, metricas=None):
+        """
+        'conexao_graph' permite compartilhar um único cliente do Graph entre os fluxos;
+        com 'metricas' (metricasExecucao), o tempo dos envios é medido na etapa 'envio'.
+        """
+        self.conexaoGraph = conexao_graph or conexaoGraph()
+        self.despachoEmails = despachoEmails(self.conexaoGraph)
+        self.metricas = metricas
+
+    def _etapa_envio(self):
+        return self.metricas.etapa("envio") if self.metricas else nullcontext()
 
     def formatar_nome(self, nome):
         """Formata o nome com a primeira letra maiúscula de cada palavra."""
         return ' '.join(word.capitalize() for word in nome.split()) if nome else ""
 
     def _gerar_tabela_html(self, colunas, dados, emojis=None):
-        """Gera a estrutura de uma tabela HTML a partir de colunas e dados."""
-        tabela = "<table border='1' cellpadding='5' cellspacing='0' style='border-collapse: collapse; width: 100%;'>"
-        tabela += "<tr style='background-color: #d3d3d3; color: black;'>"
-        for coluna in colunas:
-            tabela += f"<th>{coluna}</th>"
-        tabela += "</tr>"
-        for linha in dados:
-            tabela += "<tr>"
-            for i, valor in enumerate(linha):
-                emoji = emojis[i] if emojis and i < len(emojis) else ""
-                tabela += f"<td>{emoji} {valor}</td>"
-            tabela += "</tr>"
-        tabela += "</table>"
-        return tabela
+        """
+        Gera a estrutura de uma tabela HTML a partir de colunas e dados.
+        'dados' pode ser uma lista de linhas ou um DataFrame; as células são
+        montadas por coluna, com os valores escapados, e unidas uma única vez.
+        """
+        emojis = emojis or []
+        if isinstance(dados, pd.DataFrame):
+            linhas = _linhas_tabela([dados[coluna].to_numpy(dtype=object) for coluna in dados.columns], emojis)
+        else:
+            dados = list(dados)
+            tamanhos = {len(linha) for linha in dados}
+            if len(tamanhos) == 1 and 0 not in tamanhos:
+                linhas = _linhas_tabela(list(zip(*dados)), emojis)
+            else:
+                # Linhas de tamanhos diferentes: monta cada linha separadamente
+                linhas = "".join(_linhas_tabela([[valor] for valor in linha], emojis) for linha in dados)
+        return f"{TABELA_ABERTURA}{_cabecalho_tabela(tuple(colunas))}{linhas}</table>"
 
     def gerar_corpo_email_aniversariantes_duplicados(self, saudacao, mensagem, colunas, dados, emojis=None):
         """Gera apenas a tabela HTML do email de aniversariantes, sem assinatura final."""
@@ -48,22 +109,70 @@ class utilitariosComuns:
         corpo += "<br>Atenciosamente,<br>Equipe de Gestão de Pessoas"
         return corpo
 
+    def gerar_corpo_email_secoes(self, saudacao, secoes, emojis=None):
+        """Gera o corpo HTML com várias tabelas; 'secoes' são tuplas (mensagem, colunas, dados)."""
+        corpo = f"<strong>{saudacao}</strong><br>"
+        corpo += "<br>".join(
+            f"{mensagem}<br><br>{self._gerar_tabela_html(colunas, dados, emojis)}" for mensagem, colunas, dados in secoes
+        )
+        corpo += "<br>Atenciosamente,<br>Equipe de Gestão de Pessoas"
+        return corpo
+
     def gerar_email_com_imagem(self, imagem_src, texto_alt, link=None):
         """Gera um email com imagem centralizada, com ou sem link."""
-        link_tag = f'<a href="{link}" style="display: flex; justify-content: center; align-items: center;">' if link else '<a style="display: flex; justify-content: center; align-items: center;">'
-        return f"""<html><body style="display: flex; justify-content: center; align-items: center; height: 100vh; margin: 0;">
-                    {link_tag}
-                        <img src="{imagem_src}" alt="{texto_alt}">
-                    </a></body></html>"""
-
-    def enviar_email_formatado(self, destinatarios, assunto, body):
-        """Função auxiliar para enviar e-mails, tratando ambiente de QAS/PRD."""
-        if not destinatarios:
-            logging.warning("Nenhum destinatário para o e-mail.")
-            return
+        return corpo_email_com_imagem(imagem_src, texto_alt, link)
 
-        email_para_envio = destinatarios
+    def _destinatarios_ambiente(self, destinatarios):
+        """Em QAS, redireciona todos os envios para o endereço de teste."""
         if AMBIENTE == "QAS":
-            email_para_envio = EMAIL_TESTE.split(',') if isinstance(EMAIL_TESTE, str) else [EMAIL_TESTE]
+            return EMAIL_TESTE.split(',') if isinstance(EMAIL_TESTE, str) else [EMAIL_TESTE]
+        return destinatarios
+
+    def enviar_emails_formatados(self, mensagens):
+        """
+        Envia uma lista de mensagens (destinatarios, assunto, body) pelo despacho
+        concorrente, tratando ambiente de QAS/PRD. Retorna um resultado por mensagem enviada.
+        """
+        envios = []
+        for destinatarios, assunto, body in mensagens:
+            if not destinatarios:
+                logging.warning("Nenhum destinatário para o e-mail.")
+                continue
+            envios.append((self._destinatarios_ambiente(destinatarios), assunto, body))
+        with self._etapa_envio():
+            return self.despachoEmails.despachar(envios)
+
+    def enviar_emails_plano(self, plano, itens, mensagens):
+        """
+        Envia as mensagens renderizadas dos itens do plano (uma por item, na mesma
+        ordem). Com a caixa de saída do plano, cada mensagem é registrada antes do
+        envio e o resultado de cada bloco é gravado assim que ele termina; uma
+        mensagem com seções é registrada uma vez por seção, com o tipo da seção.
+        Cada resultado leva o tipo da mensagem, para as métricas por template.
+        """
+        envios, tipos, chaves = [], [], []
+        for item, (destinatarios, assunto, body) in zip(itens, mensagens):
+            if not destinatarios:
+                logging.warning("Nenhum destinatário para o e-mail.")
+                continue
+            envios.append((self._destinatarios_ambiente(destinatarios), assunto, body))
+            tipos.append(item.tipo)
+            chaves.append([(secao.tipo, secao.chave) for secao in item.secoes] or [(item.tipo, item.chave)])
+        if not envios:
+            return []
 
-        self.conexaoGraph.enviar_email(email_para_envio, assunto, body)
\ No newline at end of file
+        caixa = plano.caixa_saida
+        registrar = None
+        if caixa is not None:
+            caixa.enfileirar(plano.data_referencia, *_por_chave(chaves, envios))
+            def registrar(inicio, resultados):
+                caixa.registrar(plano.data_referencia, *_por_chave(chaves[inicio:inicio + len(resultados)], resultados))
+        with self._etapa_envio():
+            resultados = self.despachoEmails.despachar(envios, ao_concluir=registrar)
+        for resultado, tipo in zip(resultados, tipos):
+            resultado['tipo'] = tipo
+        return resultados
+
+    def enviar_email_formatado(self, destinatarios, assunto, body):
+        """Função auxiliar para enviar um único e-mail, tratando ambiente de QAS/PRD."""
+        return self.enviar_emails_formatados([(destinatarios, assunto, body)])
@@ -0,0 +1,163 @@
+# tests/classificacaoReferencia.py
+"""
+classificar_usuarios como era antes da versão vetorizada (um laço por CPF com
+groupby), mantida apenas como referência para os testes de equivalência.
+"""
+import logging
+import pandas as pd
+
+def _preparar_dataframe(usuarios):
+    """Função auxiliar para garantir que as colunas tenham os tipos de dados corretos antes do processamento."""
+    usuarios['Cpf'] = usuarios['Cpf'].astype(str).str.strip().str.zfill(11)
+    usuarios['Situacao'] = usuarios['Situacao'].astype(int)
+    usuarios['Situacao_superior'] = usuarios['Situacao_superior'].fillna(0).astype(int)
+    usuarios['Data_admissao'] = pd.to_datetime(usuarios['Data_admissao'])
+    usuarios['Data_demissao'] = pd.to_datetime(usuarios['Data_demissao'])
+    return usuarios
+
+def classificar_usuarios(usuarios):
+    """
+    Função central que itera sobre cada colaborador (agrupado por CPF)
+    e o classifica em uma das seguintes categorias:
+    - validos: Cadastro único e ativo, pronto para e-mails normais.
+    - cadastros_duplicados: Colaborador readmitido, requer tratamento especial.
+    - invalidos_*: Colaboradores que não devem receber e-mails (demitidos, sem e-mail, etc.).
+    - voltaram_menos_6_meses / voltaram_mais_6_meses: apenas o último registro por CPF.
+    - cadastros_menos_6_meses / cadastros_mais_6_meses: todos os registros por CPF.
+    """
+    logging.info("Classificando usuários...")
+    usuarios = _preparar_dataframe(usuarios)
+
+    validos = []
+    invalidos_demitidos = []
+    invalidos_sem_email = []
+    invalidos_sem_superior = []
+    cadastros_duplicados = []
+    voltaram_menos_6_meses = []
+    voltaram_mais_6_meses = []
+    cadastros_menos_6_meses = []
+    cadastros_mais_6_meses = []
+
+    cpfs_readmitidos = set()
+
+    for _, grupo in usuarios.groupby('Cpf'):
+        if grupo['Nome'].str.contains("Mittelstadt", case=False).any() or \
+           grupo['Superior'].str.contains("Bianca De Oliveira Luiz Mittelstadt", case=False, na=False).any():
+            continue
+
+        # Filtra registros ativos
+        grupo_ativos = grupo[grupo['Situacao'] != 7]
+        # Remove duplicados exatos de ativos com mesma admissão/demissão/CPF
+        grupo_ativos_unicos = grupo_ativos.drop_duplicates(subset=['Cpf', 'Data_admissao', 'Data_demissao'])
+        # Junta com os registros demitidos
+        grupo_demitidos = grupo[grupo['Situacao'] == 7]
+        grupo = pd.concat([grupo_demitidos, grupo_ativos_unicos]).sort_values('Data_admissao').reset_index(drop=True)
+
+        tem_multiplas_admissoes = len(grupo) > 1
+        tem_registro_ativo = not grupo_ativos.empty
+        # Lógica de duplicados com base em Tempo_FGM
+        # Remove duplicados ativos com mesma admissão/demissão
+        if not grupo_ativos.empty:
+            data_admissao_ativa = grupo_ativos.iloc[0]['Data_admissao']
+            data_demissao_ativa = grupo_ativos.iloc[0]['Data_demissao']
+            grupo_duplicado = grupo[
+                (grupo['Data_admissao'] == data_admissao_ativa) &
+                (grupo['Data_demissao'] == data_demissao_ativa) &
+                (grupo['Situacao'] == 7)]
+            grupo_sem_duplicados = grupo.drop(grupo_duplicado.index)
+
+            if not grupo_duplicado.empty:
+                invalidos_demitidos.append(grupo_duplicado)
+
+            grupo = grupo_sem_duplicados
+        # Lógica de readmissão
+        if tem_multiplas_admissoes and tem_registro_ativo and not grupo_demitidos.empty:
+            cadastros_duplicados.append(grupo)
+
+            grupo_ordenado = grupo.sort_values('Data_admissao').reset_index(drop=True)
+            for i in range(1, len(grupo_ordenado)):
+                admissao_atual = grupo_ordenado.loc[i, 'Data_admissao']
+                demissao_anterior = grupo_ordenado.loc[i - 1, 'Data_demissao']
+                cpf_atual = grupo_ordenado.loc[i, 'Cpf']
+                cpf_anterior = grupo_ordenado.loc[i - 1, 'Cpf']
+                if pd.notnull(demissao_anterior) and pd.notnull(admissao_atual) and cpf_atual == cpf_anterior:
+                    intervalo = (admissao_atual - demissao_anterior).days
+                    destino_lista = (
+                        (voltaram_menos_6_meses, cadastros_menos_6_meses)
+                        if intervalo < 180
+                        else (voltaram_mais_6_meses, cadastros_mais_6_meses)
+                    )
+
+                    destino_lista[0].append(grupo_ordenado.iloc[i])
+                    destino_lista[1].extend(grupo_ordenado.to_dict('records'))
+                    cpfs_readmitidos.add(cpf_atual)
+                    break
+
+        todas_demitidas = grupo['Situacao'].eq(7).all()
+        tem_email_pessoal = grupo_ativos['Email_pessoal'].notnull().any()
+        grupo_ativos_com_superior = grupo_ativos[
+            grupo_ativos['Superior'].notnull() & (grupo_ativos['Situacao_superior'] != 7)
+        ]
+        tem_superior_valido = not grupo_ativos_com_superior.empty
+
+        cpf_atual = grupo_ativos_com_superior['Cpf'].iloc[0] if not grupo_ativos_com_superior.empty else None
+
+        if todas_demitidas:
+            invalidos_demitidos.append(grupo)
+        elif not tem_email_pessoal:
+            invalidos_sem_email.append(grupo_ativos)
+        elif not tem_superior_valido:
+            todos_superiores_demitidos = grupo_ativos['Situacao_superior'].eq(7).all()
+            if todos_superiores_demitidos:
+                grupo_corrigido = grupo_ativos.copy()
+                grupo_corrigido = grupo_corrigido.groupby('Cpf', as_index=False).first()
+                grupo_corrigido['Superior'] = "Posto de trabalho de superior não ocupado"
+                if cpf_atual not in cpfs_readmitidos:
+                    validos.append(grupo_corrigido)
+            else:
+                invalidos_sem_superior.append(grupo_ativos)
+        else:
+            if cpf_atual and cpf_atual not in cpfs_readmitidos:
+                validos.append(grupo_ativos_com_superior)
+
+    return {
+        'validos': pd.concat(validos, ignore_index=True) if validos else pd.DataFrame(),
+        'invalidos_demitidos': pd.concat(invalidos_demitidos, ignore_index=True) if invalidos_demitidos else pd.DataFrame(),
+        'invalidos_sem_email': pd.concat(invalidos_sem_email, ignore_index=True) if invalidos_sem_email else pd.DataFrame(),
+        'invalidos_sem_superior': pd.concat(invalidos_sem_superior, ignore_index=True) if invalidos_sem_superior else pd.DataFrame(),
+        'cadastros_duplicados': pd.concat(cadastros_duplicados, ignore_index=True) if cadastros_duplicados else pd.DataFrame(),
+        'voltaram_menos_6_meses': pd.DataFrame(voltaram_menos_6_meses),
+        'voltaram_mais_6_meses': pd.DataFrame(voltaram_mais_6_meses),
+        'cadastros_menos_6_meses': pd.DataFrame(cadastros_menos_6_meses),
+        'cadastros_mais_6_meses': pd.DataFrame(cadastros_mais_6_meses)
+    }
+
+def verificar_cpfs_repetidos(df):
+    cpfs = df['Cpf'].astype(str).str.strip().str.zfill(11)
+    cpfs_repetidos = cpfs[cpfs.duplicated()].unique().tolist()
+    print(f"> Total de CPFs repetidos encontrados: {len(cpfs_repetidos)}")
+    return cpfs_repetidos
+
+def agrupar_por_cpf_df(df_validos):
+    df_validos['Cpf'] = df_validos['Cpf'].astype(str).str.strip().str.zfill(11)
+    verificar_cpfs_repetidos(df_validos)
+    return {cpf: grupo for cpf, grupo in df_validos.groupby('Cpf')}
+
+def processar_cpf_df(cpf, registros_df):
+    registros_df['Situacao'] = registros_df['Situacao'].astype(int)
+    todas_demitidas = (registros_df['Situacao'] == 7).all()
+    registros_ativos = registros_df[registros_df['Situacao'] != 7]
+
+    if len(registros_ativos) > 1:
+        logging.warning(f"Inconsistencia: CPF {cpf} com multiplos registros ativos")
+        print(f"> CPF {cpf} com {len(registros_ativos)} registros ativos")
+        for _, row in registros_ativos.iterrows():
+            print(f">  Matrícula - {row['Matricula']} | Situação: {row['Situacao']} | Nome: {row['Nome']} | Email: {row['Email']}")
+
+    return {
+        'cpf': cpf,
+        'todas_demitidas': todas_demitidas,
+        'quantidade_matriculas': len(registros_df),
+        'tem_email_pessoal': registros_df['Email_pessoal'].notnull().any(),
+        'registros_ativos': len(registros_ativos)
+    }
@@ -0,0 +1,8 @@
+# tests/conftest.py
+"""Os módulos do projeto são importados a partir de src/, como em script/main.py."""
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
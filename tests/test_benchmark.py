@@ -0,0 +1,112 @@
+# tests/test_benchmark.py
+"""
+Suíte pytest-benchmark da classificação, de cada identificar_* do
+gerenciadorAniversariantes, do planejamento e da renderização das tabelas HTML,
+sobre dados sintéticos (data.dadosSinteticos). Não acessa a Senior nem o Graph.
+
+Os tamanhos vêm de BENCHMARK_LINHAS (padrão 10000) e as rodadas de BENCHMARK_RODADAS:
+    BENCHMARK_LINHAS=10000,100000,1000000 python -m pytest tests/test_benchmark.py --benchmark-only
+"""
+import logging
+import os
+from datetime import timedelta
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from data.dadosSinteticos import gerar_colaboradores, DATA_EXTRACAO_PADRAO
+from gerenciadores.gerenciarColaboradores import classificar_usuarios
+from gerenciadores.gerenciarAniversariantes import gerenciadorAniversariantes
+from gerenciadores.planejadorEnvios import planejar_envios
+from script.benchmark import COLUNAS_TABELA, TODOS_ENVIOS
+from utils.utilitariosComuns import utilitariosComuns
+
+LINHAS = [int(linhas) for linhas in os.getenv('BENCHMARK_LINHAS', '10000').split(',')]
+RODADAS = int(os.getenv('BENCHMARK_RODADAS', '5'))
+
+# Métodos de identificação medidos sobre os válidos, com a data de referência
+IDENTIFICACOES = (
+    'identificar_aniversariantes_do_dia',
+    'identificar_aniversariantes_mes_seguinte',
+    'identificar_aniversariantes_de_nascimento_do_dia',
+    'identificar_aniversariantes_de_nascimento_mes_seguinte',
+)
+# Métodos de identificação de um período (recuperação de dias sem execução)
+IDENTIFICACOES_PERIODO = (
+    'identificar_aniversariantes_do_periodo',
+    'identificar_aniversariantes_de_nascimento_do_periodo',
+)
+DIAS_PERIODO = 7
+
+@pytest.fixture(scope='module', params=LINHAS, ids=lambda linhas: f'{linhas}_linhas')
+def cenario(request):
+    """DataFrame sintético do tamanho pedido, já classificado, e as entradas de cada caso."""
+    # Os avisos de cada chamada medida (ex.: gestor sem e-mail) entrariam na medição
+    logging.disable(logging.WARNING)
+    data_referencia = DATA_EXTRACAO_PADRAO
+    df = gerar_colaboradores(request.param, 0, data_referencia)
+    resultados = classificar_usuarios(df.copy())
+    mes_seguinte = gerenciadorAniversariantes().identificar_aniversariantes_mes_seguinte(resultados['validos'], data_referencia)
+    tabela = mes_seguinte.reindex(columns=COLUNAS_TABELA)
+    yield SimpleNamespace(
+        linhas=request.param,
+        df=df,
+        resultados=resultados,
+        data_referencia=data_referencia,
+        datas=[data_referencia - timedelta(days=dias) for dias in range(DIAS_PERIODO - 1, -1, -1)],
+        tabela=tabela,
+        tabela_linhas=tabela.values.tolist(),
+    )
+    logging.disable(logging.NOTSET)
+
+def _medir(benchmark, cenario, funcao, preparar=None):
+    """Mede 'funcao' em RODADAS rodadas; 'preparar' monta os argumentos fora da medição."""
+    benchmark.group = f'{cenario.linhas} linhas'
+    setup = (lambda: (preparar(), {})) if preparar else None
+    return benchmark.pedantic(funcao, setup=setup, rounds=RODADAS, iterations=1)
+
+def test_classificar_usuarios(benchmark, cenario):
+    resultados = _medir(benchmark, cenario, classificar_usuarios, lambda: (cenario.df.copy(),))
+    assert not resultados['validos'].empty
+
+# Um gerenciador novo a cada rodada: o índice de datas é montado dentro da medição
+@pytest.mark.parametrize('metodo', IDENTIFICACOES)
+def test_identificar(benchmark, cenario, metodo):
+    _medir(
+        benchmark, cenario,
+        lambda gerenciador: getattr(gerenciador, metodo)(cenario.resultados['validos'], cenario.data_referencia),
+        lambda: (gerenciadorAniversariantes(),),
+    )
+
+def test_identificar_mes_seguinte_duplicados(benchmark, cenario):
+    _medir(
+        benchmark, cenario,
+        lambda gerenciador: gerenciador.identificar_aniversariantes_mes_seguinte_duplicados(cenario.resultados['cadastros_duplicados'], cenario.data_referencia),
+        lambda: (gerenciadorAniversariantes(),),
+    )
+
+@pytest.mark.parametrize('metodo', IDENTIFICACOES_PERIODO)
+def test_identificar_periodo(benchmark, cenario, metodo):
+    por_dia = _medir(
+        benchmark, cenario,
+        lambda gerenciador: getattr(gerenciador, metodo)(cenario.resultados['validos'], cenario.datas),
+        lambda: (gerenciadorAniversariantes(),),
+    )
+    assert len(por_dia) == DIAS_PERIODO
+
+def test_planejar_envios(benchmark, cenario):
+    plano = _medir(
+        benchmark, cenario,
+        lambda gerenciador: planejar_envios(cenario.resultados, gerenciador, cenario.data_referencia, ('empresa', 'nascimento'), TODOS_ENVIOS, True),
+        lambda: (gerenciadorAniversariantes(),),
+    )
+    assert plano.itens
+
+def test_tabela_html_linhas(benchmark, cenario):
+    html = _medir(benchmark, cenario, lambda: utilitariosComuns()._gerar_tabela_html(COLUNAS_TABELA, cenario.tabela_linhas))
+    assert html.count('<tr>') >= len(cenario.tabela_linhas)
+
+def test_tabela_html_dataframe(benchmark, cenario):
+    html = _medir(benchmark, cenario, lambda: utilitariosComuns()._gerar_tabela_html(COLUNAS_TABELA, cenario.tabela))
+    assert html.count('<tr>') >= len(cenario.tabela)
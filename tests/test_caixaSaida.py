@@ -0,0 +1,85 @@
+# tests/test_caixaSaida.py
+"""
+caixaSaida e planoEnvios.pendentes(): reexecução no mesmo dia, reenvio das
+falhas e separação dos ambientes (QAS não conta como enviado para PRD).
+"""
+import sqlite3
+from datetime import datetime
+import pytest
+from data.caixaSaida import caixaSaida, ENVIADO, NA_FILA, FALHA
+from gerenciadores.planejadorEnvios import planoEnvios, INDIVIDUAL_ANIVERSARIANTE_EMPRESA
+
+DATA = datetime(2026, 5, 27)
+TIPO = INDIVIDUAL_ANIVERSARIANTE_EMPRESA
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / 'caixa_saida.sqlite3')
+
+@pytest.fixture
+def abrir(caminho):
+    caixas = []
+    def abrir(ambiente='PRD'):
+        caixas.append(caixaSaida(caminho, ambiente))
+        return caixas[-1]
+    yield abrir
+    for caixa in caixas:
+        caixa.fechar()
+
+def _plano(caixa, cpfs=('1', '2', '3')):
+    plano = planoEnvios(DATA, caixa)
+    for cpf in cpfs:
+        plano.adicionar(TIPO, [f'{cpf}@teste.com'], 'validos', [0], chave=cpf)
+    return plano
+
+def _enviar(caixa, plano, status_por_cpf=None):
+    """Simula o envio das pendentes: registra na fila e grava o status de cada uma (padrão 202)."""
+    status_por_cpf = status_por_cpf or {}
+    pendentes = plano.pendentes(TIPO)
+    chaves = [(TIPO, item.chave) for item in pendentes]
+    caixa.enfileirar(DATA, chaves, [(item.destinatarios, 'assunto', 'corpo') for item in pendentes])
+    caixa.registrar(DATA, chaves, [{'status': status_por_cpf.get(item.chave, 202), 'erro': None} for item in pendentes])
+    return [item.chave for item in pendentes]
+
+def _situacoes(caminho):
+    with sqlite3.connect(caminho) as conexao:
+        return {linha[:3]: linha[3:] for linha in conexao.execute("SELECT ambiente, tipo, chave, status, tentativas FROM envios")}
+
+def test_reexecucao_envia_apenas_o_restante(abrir):
+    caixa = abrir()
+    assert _enviar(caixa, _plano(caixa, ('1', '2'))) == ['1', '2']
+    # Reexecução (ex.: cron disparado duas vezes) com um aniversariante novo no plano
+    caixa = abrir()
+    assert _enviar(caixa, _plano(caixa)) == ['3']
+    assert _enviar(caixa, _plano(caixa)) == []
+
+def test_falha_e_reenviada_na_proxima_execucao(abrir, caminho):
+    caixa = abrir()
+    assert _enviar(caixa, _plano(caixa), {'2': 503}) == ['1', '2', '3']
+    assert _situacoes(caminho)[('PRD', TIPO, '2')] == (FALHA, 1)
+    assert _enviar(caixa, _plano(caixa)) == ['2']
+    assert _situacoes(caminho)[('PRD', TIPO, '2')] == (ENVIADO, 2)
+
+def test_execucao_interrompida_reenvia_o_que_ficou_na_fila(abrir, caminho):
+    caixa = abrir()
+    plano = _plano(caixa)
+    caixa.enfileirar(DATA, [(TIPO, '1')], [(['1@teste.com'], 'assunto', 'corpo')])
+    assert _situacoes(caminho)[('PRD', TIPO, '1')] == (NA_FILA, 0)
+    assert [item.chave for item in plano.pendentes(TIPO)] == ['1', '2', '3']
+
+def test_envio_em_qas_nao_conta_para_prd(abrir, caminho):
+    qas = abrir('QAS')
+    assert _enviar(qas, _plano(qas)) == ['1', '2', '3']
+    assert _enviar(qas, _plano(qas)) == []
+    prd = abrir('PRD')
+    assert _enviar(prd, _plano(prd)) == ['1', '2', '3']
+    assert {chave[0] for chave in _situacoes(caminho)} == {'QAS', 'PRD'}
+
+def test_caixa_sem_ambiente_e_preservada_a_parte(caminho, abrir):
+    with sqlite3.connect(caminho) as conexao:
+        conexao.execute("CREATE TABLE envios (data_referencia, tipo, chave, status, atualizado_em, PRIMARY KEY (data_referencia, tipo, chave))")
+        conexao.execute("INSERT INTO envios VALUES ('2026-05-27', ?, '1', 'enviado', '')", (TIPO,))
+    caixa = abrir()
+    assert _enviar(caixa, _plano(caixa)) == ['1', '2', '3']
+    with sqlite3.connect(caminho) as conexao:
+        assert conexao.execute("SELECT COUNT(*) FROM envios_sem_ambiente").fetchone() == (1,)
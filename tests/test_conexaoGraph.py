@@ -0,0 +1,219 @@
+# tests/test_conexaoGraph.py
+"""
+conexaoGraph contra um Graph local (servidorGraph): token, sendMail e /$batch,
+com as respostas de cada mensagem definidas pelo teste. As esperas entre as
+tentativas são registradas em vez de dormidas.
+"""
+import json
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+import pytest
+import data.conexaoGraph as modulo_graph
+from data.conexaoGraph import conexaoGraph, TAMANHO_LOTE_GRAPH, JITTER_ESPERA, segundos_retry_after
+from utils.despachoEmails import despachoEmails
+from utils.limitadorTaxa import limitadorTaxa
+
+class servidorGraph:
+    """
+    Graph de testes. 'respostas' leva o assunto da mensagem à lista de
+    (status, Retry-After) das suas próximas tentativas; sem resposta na lista, 202.
+    Com o status 'omitir', a sub-requisição fica fora da resposta do /$batch.
+    'status_lotes' são os status das próximas chamadas ao /$batch inteiro (sem corpo).
+    'respostas_token' são as (status, corpo) dos próximos pedidos de token; sem resposta na lista, um token válido.
+    """
+    def __init__(self):
+        self.respostas = {}
+        self.status_lotes = []
+        self.respostas_token = []
+        self.pedidos_token = 0
+        self.lotes = []
+        self.envios = []
+        servidor = self
+
+        class manipulador(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _responder(self, status, corpo=b'', retry_after=None):
+                self.send_response(status)
+                if retry_after is not None:
+                    self.send_header('Retry-After', str(retry_after))
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def do_POST(self):
+                corpo = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if 'oauth2' in self.path:
+                    servidor.pedidos_token += 1
+                    self._responder(*servidor._token())
+                elif self.path.endswith('$batch'):
+                    self._responder(*servidor._lote(json.loads(corpo)['requests']))
+                else:
+                    assunto = json.loads(corpo)['message']['subject']
+                    servidor.envios.append(assunto)
+                    status, retry_after = servidor._proxima(assunto)
+                    self._responder(status, retry_after=retry_after)
+
+        self._http = ThreadingHTTPServer(('127.0.0.1', 0), manipulador)
+        self.url = f'http://127.0.0.1:{self._http.server_address[1]}'
+        threading.Thread(target=self._http.serve_forever, daemon=True).start()
+
+    def _token(self):
+        if self.respostas_token:
+            return self.respostas_token.pop(0)
+        return 200, json.dumps({'access_token': 'token', 'expires_in': 3599}).encode()
+
+    def _proxima(self, assunto):
+        fila = self.respostas.get(assunto)
+        return fila.pop(0) if fila else (202, None)
+
+    def _lote(self, requisicoes):
+        self.lotes.append([requisicao['id'] for requisicao in requisicoes])
+        if self.status_lotes:
+            status, retry_after = self.status_lotes.pop(0)
+            return status, b'', retry_after
+        respostas = []
+        for requisicao in requisicoes:
+            status, retry_after = self._proxima(requisicao['body']['message']['subject'])
+            if status == 'omitir':
+                continue
+            resposta = {'id': requisicao['id'], 'status': status, 'headers': {}}
+            if retry_after is not None:
+                resposta['headers']['Retry-After'] = str(retry_after)
+            respostas.append(resposta)
+        # O Graph não garante a ordem das respostas do lote
+        return 200, json.dumps({'responses': respostas[::-1]}).encode(), None
+
+    def encerrar(self):
+        self._http.shutdown()
+        self._http.server_close()
+
+@pytest.fixture
+def graph(monkeypatch):
+    servidor = servidorGraph()
+    esperas, esperas_limitador = [], []
+    monkeypatch.setattr(modulo_graph, 'GRAPH_URL', servidor.url)
+    monkeypatch.setattr(modulo_graph, 'LOGIN_URL', servidor.url)
+    monkeypatch.setattr(modulo_graph, 'time', SimpleNamespace(monotonic=time.monotonic, sleep=esperas.append))
+    monkeypatch.setattr(conexaoGraph, '_token', None)
+    monkeypatch.setattr(conexaoGraph, '_sessao', None)
+    monkeypatch.setattr(conexaoGraph, '_limitador', limitadorTaxa(0, dormir=esperas_limitador.append))
+    monkeypatch.setattr(conexaoGraph, '_contadores', {'limitadas': 0, 'reenviadas': 0, 'espera_limitador': 0.0})
+    servidor.esperas = esperas
+    servidor.esperas_limitador = esperas_limitador
+    yield servidor
+    servidor.encerrar()
+
+def _mensagens(quantidade):
+    return [([f'pessoa{indice}@teste.com'], f'assunto {indice}', '<p>corpo</p>') for indice in range(quantidade)]
+
+def test_lote_divide_em_blocos_de_20(graph):
+    status = conexaoGraph().enviar_emails_em_lote(_mensagens(45))
+    assert status == [202] * 45
+    assert [len(lote) for lote in graph.lotes] == [TAMANHO_LOTE_GRAPH, TAMANHO_LOTE_GRAPH, 5]
+    assert [int(indice) for lote in graph.lotes for indice in lote] == list(range(45))
+    assert graph.esperas == []
+
+def test_lote_associa_o_status_de_cada_mensagem(graph):
+    graph.respostas = {'assunto 3': [(400, None)], 'assunto 21': [(403, None)]}
+    status = conexaoGraph().enviar_emails_em_lote(_mensagens(25))
+    assert status == [202] * 3 + [400] + [202] * 17 + [403] + [202] * 3
+    # Falhas permanentes não são reenviadas
+    assert len(graph.lotes) == 2
+
+def test_lote_reenvia_apenas_as_falhas_transitorias(graph):
+    graph.respostas = {
+        'assunto 1': [(429, 2)],
+        'assunto 5': [(503, None), (503, None)],
+        'assunto 8': [('omitir', None)],
+        'assunto 9': [(400, None)],
+    }
+    status = conexaoGraph().enviar_emails_em_lote(_mensagens(12), tentativas=3)
+    assert status == [202] * 9 + [400] + [202] * 2
+    assert graph.lotes == [[str(indice) for indice in range(12)], ['1', '5', '8'], ['5']]
+    # O Retry-After da primeira tentativa prevalece sobre o backoff (1 s)
+    assert 2 <= graph.esperas[0] <= 2 * (1 + JITTER_ESPERA)
+    assert len(graph.esperas) == 2
+
+def test_lote_recusado_inteiro_reenvia_todas_as_mensagens(graph):
+    graph.status_lotes = [(503, 1)]
+    status = conexaoGraph().enviar_emails_em_lote(_mensagens(3))
+    assert status == [202] * 3
+    assert graph.lotes == [['0', '1', '2'], ['0', '1', '2']]
+
+def test_lote_devolve_a_ultima_falha_depois_das_tentativas(graph):
+    graph.respostas = {'assunto 0': [(429, None)] * 3}
+    status = conexaoGraph().enviar_emails_em_lote(_mensagens(2), tentativas=3)
+    assert status == [429, 202]
+    assert graph.lotes == [['0', '1'], ['0'], ['0']]
+
+def test_envio_respeita_o_retry_after_do_429(graph):
+    graph.respostas = {'assunto': [(429, 3), (429, None)]}
+    status = conexaoGraph().enviar_email(['pessoa@teste.com'], 'assunto', '<p>corpo</p>')
+    assert status == 202
+    assert graph.envios == ['assunto'] * 3
+    # 1ª espera: Retry-After (3 s) acima do backoff (1 s); 2ª, sem Retry-After: backoff de 2 s; ambas com jitter
+    assert 3 <= graph.esperas[0] <= 3 * (1 + JITTER_ESPERA)
+    assert 2 <= graph.esperas[1] <= 2 * (1 + JITTER_ESPERA)
+    # O 429 com Retry-After pausa o limitador compartilhado: o envio seguinte aguarda o Graph liberar
+    assert graph.esperas_limitador and 2.5 < graph.esperas_limitador[0] <= 3
+    assert conexaoGraph.contadores()['limitadas'] == 2
+    assert conexaoGraph.contadores()['reenviadas'] == 2
+
+def test_envio_aceita_retry_after_em_data_http(graph):
+    graph.respostas = {'assunto': [(503, formatdate(time.time() + 30, usegmt=True))]}
+    assert conexaoGraph().enviar_email(['pessoa@teste.com'], 'assunto', '<p>corpo</p>') == 202
+    assert 28 <= graph.esperas[0] <= 30 * (1 + JITTER_ESPERA)
+
+def test_envio_desiste_depois_das_tentativas(graph):
+    graph.respostas = {'assunto': [(429, None)] * 4}
+    status = conexaoGraph().enviar_email(['pessoa@teste.com'], 'assunto', '<p>corpo</p>', tentativas=4)
+    assert status == 429
+    assert len(graph.envios) == 4
+    # Backoff exponencial sem Retry-After: 1, 2 e 4 s, cada um com até JITTER_ESPERA a mais
+    for espera, base in zip(graph.esperas, [1, 2, 4]):
+        assert base <= espera <= base * (1 + JITTER_ESPERA)
+    assert len(graph.esperas) == 3
+
+def test_envio_nao_reenvia_falha_permanente(graph):
+    graph.respostas = {'assunto': [(400, None)]}
+    assert conexaoGraph().enviar_email(['pessoa@teste.com'], 'assunto', '<p>corpo</p>') == 400
+    assert graph.envios == ['assunto']
+    assert graph.esperas == []
+
+def test_falha_no_token_nao_chama_o_graph(graph):
+    # Corpo de erro fora do padrão JSON (ex.: página de erro de um proxy)
+    graph.respostas_token = [(503, b'<html>Service Unavailable</html>')]
+    with pytest.raises(RuntimeError, match='token'):
+        conexaoGraph().enviar_email(['pessoa@teste.com'], 'assunto', '<p>corpo</p>')
+    assert graph.envios == []
+    # O token com falha não fica em cache: o próximo envio pede outro
+    assert conexaoGraph().enviar_email(['pessoa@teste.com'], 'assunto', '<p>corpo</p>') == 202
+    assert graph.pedidos_token == 2
+
+def test_falha_no_token_vira_resultado_de_falha_no_despacho(graph):
+    graph.respostas_token = [(400, json.dumps({'error': 'invalid_client'}).encode())] * 2
+    resultados = despachoEmails(conexaoGraph(), concorrencia=1, modo_lote=True).despachar(_mensagens(2))
+    assert [resultado['status'] for resultado in resultados] == [None, None]
+    assert all('token' in resultado['erro'] for resultado in resultados)
+    assert graph.lotes == []
+    resultados = despachoEmails(conexaoGraph(), concorrencia=1, modo_lote=False).despachar(_mensagens(1))
+    assert resultados[0]['status'] is None and graph.envios == []
+
+def test_lote_sem_corpo_json_e_reenviado(graph):
+    graph.status_lotes = [(200, None)]
+    assert conexaoGraph().enviar_emails_em_lote(_mensagens(2)) == [202, 202]
+    assert graph.lotes == [['0', '1'], ['0', '1']]
+
+def test_segundos_retry_after():
+    assert segundos_retry_after('7') == 7.0
+    assert segundos_retry_after('-3') == 0.0
+    assert segundos_retry_after(None) is None
+    assert segundos_retry_after('amanhã') is None
+    assert segundos_retry_after(formatdate(time.time() - 60, usegmt=True)) == 0.0
@@ -0,0 +1,73 @@
+# tests/test_gerenciarAniversariantes.py
+"""
+Anos de casa dos aniversariantes de tempo de empresa: continuam sendo os dias
+completos até a data de referência divididos por 365, como antes do índice
+(mês, dia). Na lista do mês seguinte, a referência é a data da execução, então
+quem ainda não completou um ano nessa data fica de fora.
+"""
+from datetime import datetime, timedelta
+import logging
+import pandas as pd
+import pytest
+from data.dadosSinteticos import gerar_colaboradores
+from gerenciadores.gerenciarAniversariantes import gerenciadorAniversariantes
+from gerenciadores.gerenciarColaboradores import classificar_usuarios
+
+REFERENCIA = datetime(2026, 5, 27)
+
+def _validos(*admissoes):
+    return pd.DataFrame({
+        'Cpf': range(1, len(admissoes) + 1),
+        'Nome': [f'COLABORADOR {i}' for i in range(1, len(admissoes) + 1)],
+        'Data_admissao': pd.to_datetime(list(admissoes)),
+        'Data_nascimento': pd.to_datetime(['1990-01-01'] * len(admissoes)),
+    })
+
+def _anos(df):
+    return dict(zip(df['Cpf'], df['Anos_de_casa']))
+
+def test_mes_seguinte_conta_os_anos_na_data_de_referencia():
+    df = _validos('2025-06-10', '2016-06-01', '2020-06-15', '2020-07-01')
+    obtido = gerenciadorAniversariantes().identificar_aniversariantes_mes_seguinte(df, REFERENCIA)
+    # Admitido em 10/06/2025 ainda não tem um ano em 27/05/2026; os demais, um ano a menos que no aniversário
+    assert _anos(obtido) == {2: 9, 3: 5}
+
+def test_mes_seguinte_usa_a_primeira_admissao_do_cpf():
+    df = _validos('2016-06-01', '2021-06-01').assign(Cpf=[1, 1])
+    obtido = gerenciadorAniversariantes().identificar_aniversariantes_mes_seguinte(df, REFERENCIA)
+    assert list(obtido['Data_admissao']) == [pd.Timestamp('2016-06-01')]
+    assert _anos(obtido) == {1: 9}
+
+def test_do_dia_e_do_periodo():
+    df = _validos('2025-06-10', '2000-06-10', '2026-06-10', '2020-02-29', '2025-06-11')
+    gerenciador = gerenciadorAniversariantes()
+    assert _anos(gerenciador.identificar_aniversariantes_do_dia(df, datetime(2026, 6, 10, 8, 30))) == {1: 1, 2: 26}
+    # 29/02 é comemorado em 28/02 nos anos não bissextos
+    assert _anos(gerenciador.identificar_aniversariantes_do_dia(df, datetime(2026, 2, 28))) == {4: 6}
+    por_dia = gerenciador.identificar_aniversariantes_do_periodo(df, [datetime(2026, 6, 10), datetime(2026, 6, 11)])
+    assert [_anos(dia) for dia in por_dia] == [{1: 1, 2: 26}, {5: 1}]
+
+@pytest.fixture(scope='module')
+def validos():
+    logging.disable(logging.WARNING)
+    yield classificar_usuarios(gerar_colaboradores(5_000, 3))['validos']
+    logging.disable(logging.NOTSET)
+
+@pytest.mark.parametrize('referencia', [REFERENCIA, datetime(2024, 2, 28, 9), datetime(2025, 12, 31), datetime(2027, 1, 31)])
+def test_anos_de_casa_iguais_ao_calculo_por_dias(validos, referencia):
+    gerenciador = gerenciadorAniversariantes()
+    admissao = pd.to_datetime(validos['Data_admissao'])
+
+    do_dia = gerenciador.identificar_aniversariantes_do_dia(validos, referencia)
+    esperado = (referencia - admissao[do_dia.index]).dt.days // 365
+    assert do_dia['Anos_de_casa'].tolist() == esperado.tolist()
+    datas = [referencia + timedelta(days=dias) for dias in range(3)]
+    assert [dia['Anos_de_casa'].tolist() for dia in gerenciador.identificar_aniversariantes_do_periodo(validos, datas)] == [
+        dia['Anos_de_casa'].tolist() for dia in (gerenciador.identificar_aniversariantes_do_dia(validos, data) for data in datas)
+    ]
+
+    mes_seguinte = gerenciador.identificar_aniversariantes_mes_seguinte(validos, referencia)
+    primeiras = validos.assign(Data_admissao=admissao).sort_values('Data_admissao').groupby('Cpf').first()
+    primeiras = primeiras[primeiras['Data_admissao'].dt.month == (referencia.month % 12) + 1]
+    anos = primeiras['Data_admissao'].map(lambda data: (referencia - data).days // 365)
+    assert dict(zip(mes_seguinte['Cpf'], mes_seguinte['Anos_de_casa'])) == anos[anos >= 1].to_dict()
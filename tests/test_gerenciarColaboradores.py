@@ -0,0 +1,122 @@
+# tests/test_gerenciarColaboradores.py
+"""
+Equivalência da classificação vetorizada (gerenciarColaboradores) com a
+classificação por CPF de antes (classificacaoReferencia), sobre dados sintéticos
+com readmissões, registros ativos duplicados e colaboradores demitidos.
+
+A referência leva minutos por dezena de milhar de linhas, então os tamanhos
+padrão são pequenos. EQUIVALENCIA_LINHAS acrescenta outros (semente 0), ex.:
+    EQUIVALENCIA_LINHAS=1000000 python -m pytest tests/test_gerenciarColaboradores.py
+"""
+import logging
+import os
+import pandas as pd
+import pytest
+import classificacaoReferencia
+from data.dadosSinteticos import gerar_colaboradores
+from gerenciadores.gerenciarColaboradores import RESULTADOS_CLASSIFICACAO, classificar_usuarios, agrupar_por_cpf_df, processar_cpf_df
+
+GESTOR_SUBSTITUTO = "Posto de trabalho de superior não ocupado"
+# Diferenças intencionais em relação à referência, por resultado: colunas que só
+# podem mudar nas linhas válidas do gestor substituto, que não identifica um gestor
+# (os e-mails de gestores o agrupam pelo nome, sem a matrícula/empresa do gestor demitido)
+DIFERENCAS_INTENCIONAIS = {'validos': ('Matricula_superior', 'Empresa_superior')}
+
+CASOS = [(10_000, 0), (2_000, 7)] + [(int(linhas), 0) for linhas in os.getenv('EQUIVALENCIA_LINHAS', '').split(',') if linhas]
+
+def _valor(coluna, valor):
+    if valor is None or (not isinstance(valor, str) and pd.isna(valor)):
+        return None
+    if isinstance(valor, pd.Timestamp):
+        return valor.isoformat()
+    if hasattr(valor, 'item'):
+        valor = valor.item()
+    # A referência guarda o CPF como texto com zeros à esquerda; a versão atual, como inteiro
+    if coluna == 'Cpf':
+        return int(valor)
+    if isinstance(valor, float) and valor.is_integer() and coluna != 'Tempo_FGM':
+        return int(valor)
+    return valor
+
+def _normalizar(df):
+    """Colunas e valores em tipos Python, sem depender dos dtypes de cada versão."""
+    return {coluna: [_valor(coluna, valor) for valor in df[coluna].astype(object)] for coluna in df.columns}
+
+def _classificar_referencia(df):
+    # A referência trabalha com texto em object, como a consulta antes dos tipos compactos
+    entrada = df.astype({nome: object for nome in df.columns if str(df[nome].dtype) in ('string', 'category')})
+    return classificacaoReferencia.classificar_usuarios(entrada)
+
+def _diferencas(obtido, esperado):
+    """Linhas com valor diferente em cada coluna (as duas com as mesmas colunas e linhas)."""
+    assert list(obtido) == list(esperado)
+    assert len(obtido['Cpf']) == len(esperado['Cpf'])
+    return {
+        coluna: [linha for linha, (a, b) in enumerate(zip(obtido[coluna], esperado[coluna])) if a != b]
+        for coluna in obtido
+    }
+
+@pytest.fixture(scope='module', params=CASOS, ids=lambda p: f"{p[0]}_linhas_semente_{p[1]}")
+def colaboradores(request):
+    logging.disable(logging.WARNING)
+    yield gerar_colaboradores(*request.param)
+    logging.disable(logging.NOTSET)
+
+@pytest.fixture(scope='module')
+def referencia(colaboradores):
+    """Resultados da referência, calculados uma vez por conjunto de dados."""
+    return _classificar_referencia(colaboradores.copy())
+
+def test_classificacao_igual_a_referencia(colaboradores, referencia):
+    esperado = referencia
+    obtido = classificar_usuarios(colaboradores.copy())
+    assert list(obtido) == RESULTADOS_CLASSIFICACAO
+    for chave in RESULTADOS_CLASSIFICACAO:
+        normalizado = _normalizar(obtido[chave])
+        diferencas = _diferencas(normalizado, _normalizar(esperado[chave]))
+        intencionais = DIFERENCAS_INTENCIONAIS.get(chave, ())
+        assert {coluna: linhas for coluna, linhas in diferencas.items() if linhas and coluna not in intencionais} == {}, chave
+        for coluna in intencionais:
+            # Só no gestor substituto, que fica sem matrícula/empresa do gestor
+            assert all(normalizado['Superior'][linha] == GESTOR_SUBSTITUTO for linha in diferencas[coluna]), (chave, coluna)
+            assert all(normalizado[coluna][linha] is None for linha in diferencas[coluna]), (chave, coluna)
+
+def test_gestor_substituto_e_a_unica_diferenca_intencional(colaboradores, referencia):
+    """A referência mantém a matrícula/empresa do gestor demitido no gestor substituto; a versão atual, não."""
+    esperado = _normalizar(referencia['validos'])
+    obtido = _normalizar(classificar_usuarios(colaboradores.copy())['validos'])
+    substitutos = [linha for linha, superior in enumerate(obtido['Superior']) if superior == GESTOR_SUBSTITUTO]
+    assert substitutos
+    diferencas = _diferencas(obtido, esperado)
+    for coluna in DIFERENCAS_INTENCIONAIS['validos']:
+        com_gestor = [linha for linha in substitutos if esperado[coluna][linha] is not None]
+        assert com_gestor and diferencas[coluna] == com_gestor
+
+def test_dados_cobrem_os_casos_da_classificacao(colaboradores):
+    resultados = classificar_usuarios(colaboradores.copy())
+    for chave in ('validos', 'invalidos_demitidos', 'cadastros_duplicados', 'voltaram_menos_6_meses', 'voltaram_mais_6_meses'):
+        assert not resultados[chave].empty, chave
+    # Registros ativos duplicados (mesmo CPF e admissão)
+    ativos = colaboradores[colaboradores['Situacao'] != 7]
+    assert ativos.duplicated(['Cpf', 'Data_admissao']).any()
+
+def test_classificacao_independe_da_ordem_das_linhas(colaboradores):
+    esperado = classificar_usuarios(colaboradores.copy())
+    embaralhado = colaboradores.sample(frac=1, random_state=1).reset_index(drop=True)
+    obtido = classificar_usuarios(embaralhado)
+    for chave in ('validos', 'invalidos_demitidos', 'cadastros_duplicados'):
+        assert _normalizar(obtido[chave]) == _normalizar(esperado[chave]), chave
+
+def test_cpfs_repetidos_vao_para_o_log(caplog, capsys):
+    registros = pd.DataFrame({
+        'Cpf': [1, 1, 2], 'Matricula': [10, 11, 20], 'Situacao': [1, 1, 7], 'Nome': ['ANA', 'ANA', 'JOSE'],
+        'Email': ['ana@fgm.com', None, None], 'Email_pessoal': [None, None, None],
+    })
+    with caplog.at_level(logging.INFO):
+        grupos = agrupar_por_cpf_df(registros)
+        assert processar_cpf_df(1, grupos[1])['registros_ativos'] == 2
+    assert capsys.readouterr().out == ''
+    mensagens = [(registro.levelno, registro.getMessage()) for registro in caplog.records]
+    assert (logging.INFO, "Total de CPFs repetidos encontrados: 1") in mensagens
+    assert (logging.WARNING, "Inconsistencia: CPF 1 com 2 registros ativos") in mensagens
+    assert sum(nivel == logging.WARNING and 'Matrícula' in mensagem for nivel, mensagem in mensagens) == 2
@@ -0,0 +1,120 @@
+# tests/test_hierarquiaSenior.py
+"""
+indiceHierarquia contra a junção antiga (auto-junção de R017HIE), as duas
+executadas sobre um SQLite com as tabelas da Senior anexadas como SENIOR.
+"""
+import sqlite3
+from collections import Counter
+import pandas as pd
+import pytest
+from data.hierarquiaSenior import indiceHierarquia, QUERY_POSTOS, QUERY_OCUPANTES, COLUNAS_HIERARQUIA
+
+# Colunas do gestor como a consulta de colaboradores as obtinha antes do índice
+CONSULTA_ANTIGA = """
+        SELECT
+            FUN.NUMCAD,
+            O.GESTOR,
+            EMG.EMACOM,
+            GEST.SITAFA,
+            O.NUMCAD_GESTOR,
+            O.NUMEMP_GESTOR
+        FROM
+            SENIOR.R034FUN FUN
+        LEFT JOIN (
+            SELECT
+                A.ESTPOS,
+                A.POSTRA,
+                C.NUMCAD AS NUMCAD_GESTOR,
+                C.NUMEMP AS NUMEMP_GESTOR,
+                C.NOMFUN AS GESTOR
+            FROM
+                SENIOR.R017HIE A
+            LEFT JOIN SENIOR.R017HIE B ON
+                SUBSTR(A.POSPOS, 1, LENGTH(A.POSPOS)-2) = B.POSPOS
+                    AND A.ESTPOS = B.ESTPOS
+                    AND A.CODTHP = B.CODTHP
+                    AND A.REVHIE = B.REVHIE
+            LEFT JOIN SENIOR.R034FUN C ON
+                B.ESTPOS = C.ESTPOS
+                AND B.POSTRA = C.POSTRA
+            WHERE
+                A.CODTHP = 1
+        ) O ON
+            FUN.ESTPOS = O.ESTPOS
+            AND FUN.POSTRA = O.POSTRA
+        LEFT JOIN SENIOR.R034CPL EMG ON
+            O.NUMCAD_GESTOR = EMG.NUMCAD
+            AND O.NUMEMP_GESTOR = EMG.NUMEMP
+        LEFT JOIN SENIOR.R034FUN GEST ON
+            O.NUMCAD_GESTOR = GEST.NUMCAD
+            AND O.NUMEMP_GESTOR = GEST.NUMEMP
+        WHERE
+            FUN.TIPCOL = 1
+        """
+
+# (ESTPOS, POSTRA, POSPOS, CODTHP, REVHIE)
+POSTOS = [
+    (1, 'DIR', '01', 1, 1),
+    (1, 'GER', '0101', 1, 1),
+    (1, 'ANA', '010101', 1, 1),
+    (1, 'AUX', '010102', 1, 1),
+    (1, 'VAGO', '0102', 1, 1),
+    (1, 'EST', '010201', 1, 1),
+    (1, 'OUTRO_TIPO', '010103', 2, 1),
+]
+# (NUMEMP, TIPCOL, NUMCAD, NOMFUN, SITAFA, ESTPOS, POSTRA)
+COLABORADORES = [
+    (1, 1, 10, 'DIRETORA', 1, 1, 'DIR'),
+    # Gerente com duas linhas em R034FUN (TIPCOL 1 e 2), com situações diferentes
+    (1, 1, 20, 'GERENTE', 1, 1, 'GER'),
+    (1, 2, 20, 'GERENTE', 7, 1, 'GER'),
+    # Dois ocupantes no posto do analista: o auxiliar tem dois gestores
+    (1, 1, 30, 'ANALISTA', 1, 1, 'ANA'),
+    (2, 1, 31, 'ANALISTA 2', 2, 1, 'ANA'),
+    (1, 1, 40, 'AUXILIAR', 1, 1, 'AUX'),
+    (1, 1, 50, 'ESTAGIARIO', 1, 1, 'EST'),
+    (1, 1, 60, 'SEM POSTO', 1, None, None),
+    (1, 1, 70, 'POSTO DESCONHECIDO', 1, 1, 'INEXISTENTE'),
+    (1, 1, 80, 'OUTRO TIPO', 1, 1, 'OUTRO_TIPO'),
+]
+# (NUMCAD, NUMEMP, EMACOM); o analista 31 não tem R034CPL
+COMPLEMENTOS = [(10, 1, 'diretora@fgm.com'), (20, 1, 'gerente@fgm.com'), (30, 1, None), (40, 1, 'auxiliar@fgm.com')]
+
+@pytest.fixture
+def senior():
+    conexao = sqlite3.connect(':memory:')
+    conexao.execute("ATTACH DATABASE ':memory:' AS SENIOR")
+    conexao.executescript("""
+        CREATE TABLE SENIOR.R017HIE (ESTPOS, POSTRA, POSPOS, CODTHP, REVHIE);
+        CREATE TABLE SENIOR.R034FUN (NUMEMP, TIPCOL, NUMCAD, NOMFUN, SITAFA, ESTPOS, POSTRA);
+        CREATE TABLE SENIOR.R034CPL (NUMCAD, NUMEMP, EMACOM);
+    """)
+    conexao.executemany("INSERT INTO SENIOR.R017HIE VALUES (?, ?, ?, ?, ?)", POSTOS)
+    conexao.executemany("INSERT INTO SENIOR.R034FUN VALUES (?, ?, ?, ?, ?, ?, ?)", COLABORADORES)
+    conexao.executemany("INSERT INTO SENIOR.R034CPL VALUES (?, ?, ?)", COMPLEMENTOS)
+    yield conexao
+    conexao.close()
+
+def _nulo(valor):
+    """Sem gestor, o merge do pandas deixa NaN onde o SQL devolve NULL."""
+    return None if pd.isna(valor) else valor
+
+def _pelo_indice(conexao):
+    indice = indiceHierarquia(conexao.execute(QUERY_POSTOS).fetchall(), conexao.execute(QUERY_OCUPANTES).fetchall())
+    colaboradores = conexao.execute("SELECT NUMCAD, ESTPOS, POSTRA FROM SENIOR.R034FUN WHERE TIPCOL = 1").fetchall()
+    matriculas, estpos, postra = zip(*colaboradores)
+    posicoes, colunas = indice.resolver(estpos, postra)
+    return Counter(
+        (matriculas[posicao],) + tuple(_nulo(colunas[coluna][linha]) for coluna in COLUNAS_HIERARQUIA)
+        for linha, posicao in enumerate(posicoes)
+    )
+
+def test_indice_reproduz_a_juncao_antiga(senior):
+    assert _pelo_indice(senior) == Counter(senior.execute(CONSULTA_ANTIGA).fetchall())
+
+def test_gestor_com_varios_tipcol_repete_a_linha(senior):
+    linhas = _pelo_indice(senior)
+    # O analista vê o gerente uma vez por linha do gerente em R034FUN, cada uma com a sua situação
+    assert linhas[(30, 'GERENTE', 'gerente@fgm.com', 1, 20, 1)] == 2
+    assert linhas[(30, 'GERENTE', 'gerente@fgm.com', 7, 20, 1)] == 2
+    assert sum(quantidade for linha, quantidade in linhas.items() if linha[0] == 30) == 4
@@ -0,0 +1,51 @@
+# tests/test_limitadorTaxa.py
+"""limitadorTaxa com um relógio falso: dormir apenas avança o relógio."""
+from utils.limitadorTaxa import limitadorTaxa
+
+class relogioFalso:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+    def dormir(self, segundos):
+        self.agora += segundos
+
+def _limitador(por_minuto, capacidade=None):
+    relogio = relogioFalso()
+    return limitadorTaxa(por_minuto, capacidade, relogio=relogio, dormir=relogio.dormir), relogio
+
+def test_rajada_padrao_e_a_cota_de_um_minuto():
+    limitador, relogio = _limitador(30)
+    assert [limitador.adquirir() for _ in range(30)] == [0.0] * 30
+    # Sem fichas, a 31ª mensagem espera a reposição de uma ficha (60 / 30 = 2 s)
+    assert limitador.adquirir() == 2.0
+    assert relogio.agora == 2.0
+
+def test_lote_de_20_sai_sem_espera():
+    limitador, _ = _limitador(30)
+    assert limitador.adquirir(20) == 0.0
+    # Restam 10 fichas: o próximo lote de 20 espera as 10 que faltam (20 s)
+    assert limitador.adquirir(20) == 20.0
+
+def test_capacidade_1_espaca_os_envios():
+    limitador, relogio = _limitador(30, capacidade=1)
+    assert limitador.adquirir() == 0.0
+    assert limitador.adquirir() == 2.0
+    assert limitador.adquirir() == 2.0
+    assert relogio.agora == 4.0
+
+def test_fichas_sao_repostas_com_o_tempo():
+    limitador, relogio = _limitador(60, capacidade=10)
+    limitador.adquirir(10)
+    relogio.agora += 5
+    assert limitador.adquirir(5) == 0.0
+    assert limitador.adquirir() == 1.0
+
+def test_pausa_bloqueia_mesmo_sem_limite():
+    limitador, relogio = _limitador(0)
+    limitador.pausar(5)
+    assert limitador.adquirir() == 5.0
+    assert limitador.adquirir() == 0.0
+    assert relogio.agora == 5.0
@@ -0,0 +1,46 @@
+# tests/test_metricasExecucao.py
+"""
+Latência dos envios ao Graph nas métricas: cada mensagem individual é uma
+observação e cada lote ($batch) é uma única observação, no seu próprio histograma.
+"""
+from utils.metricasExecucao import metricasExecucao
+from utils.despachoEmails import despachoEmails, resumir_resultados
+
+class graphFalso:
+    """Responde 202 a tudo, sem rede."""
+    def enviar_email(self, lista_emails, assunto, corpo):
+        return 202
+
+    def enviar_emails_em_lote(self, mensagens):
+        return [202] * len(mensagens)
+
+def _mensagens(quantidade):
+    return [([f'pessoa{indice}@teste.com'], f'assunto {indice}', '<p>corpo</p>') for indice in range(quantidade)]
+
+def _despachar(modo_lote, quantidade):
+    return despachoEmails(graphFalso(), concorrencia=2, modo_lote=modo_lote).despachar(_mensagens(quantidade))
+
+def test_lote_e_observado_uma_vez():
+    resultados = _despachar(True, 45)
+    metricas = metricasExecucao()
+    metricas.registrar_envios(resultados)
+    assert metricas.latencia_lote_graph.total == 3
+    assert metricas.latencia_graph.total == 0
+    assert sum(contagem['enviadas'] for contagem in metricas.mensagens.values()) == 45
+    resumo = resumir_resultados(resultados)
+    assert (resumo['total'], resumo['envios_graph']) == (45, 3)
+
+def test_envio_individual_e_observado_por_mensagem():
+    resultados = _despachar(False, 5) + _despachar(True, 5)
+    metricas = metricasExecucao()
+    metricas.registrar_envios(resultados)
+    assert (metricas.latencia_graph.total, metricas.latencia_lote_graph.total) == (5, 1)
+    assert resumir_resultados(resultados)['envios_graph'] == 6
+
+def test_histogramas_no_formato_prometheus():
+    metricas = metricasExecucao()
+    metricas.registrar_envios(_despachar(True, 25))
+    texto = metricas.formato_prometheus()
+    assert 'emailrh_graph_lote_latencia_segundos_count 2' in texto
+    assert 'emailrh_graph_latencia_segundos_count 0' in texto
+    assert '# TYPE emailrh_graph_lote_latencia_segundos histogram' in texto
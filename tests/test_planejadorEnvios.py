@@ -0,0 +1,194 @@
+# tests/test_planejadorEnvios.py
+"""
+planejadorEnvios sobre os dados sintéticos (gerar_colaboradores(3000, 5), extraídos
+em 27/05/2026): plano de um dia e de um período, e-mails mensais uma única vez por
+período, separação das readmissões, pendentes()/salvar() e o modo período
+(--inicio/--fim) do script/main.py.
+"""
+import json
+import logging
+from datetime import datetime, timedelta
+import pandas as pd
+import pytest
+from data.caixaSaida import caixaSaida
+from data.dadosSinteticos import gerar_colaboradores
+from data.fonteParquet import exportar_parquet
+from gerenciadores.gerenciarAniversariantes import gerenciadorAniversariantes
+from gerenciadores.gerenciarColaboradores import classificar_usuarios
+from gerenciadores.planejadorEnvios import (
+    planejar_envios, planejar_envios_periodo,
+    RH_ANIVERSARIANTES_EMPRESA_DUPLICADOS, RH_ANIVERSARIANTES_EMPRESA, GESTOR_ANIVERSARIANTES_EMPRESA,
+    INDIVIDUAL_ANIVERSARIANTE_EMPRESA, INDIVIDUAL_ANIVERSARIANTE_EMPRESA_STAR, GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA,
+    RH_ANIVERSARIANTES_NASCIMENTO, GESTOR_ANIVERSARIANTES_NASCIMENTO, INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO,
+    GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO, GESTOR_CONSOLIDADO,
+)
+
+DIA_MENSAL = datetime(2026, 5, 27)
+FLUXOS = ('empresa', 'nascimento')
+TODOS_OS_ENVIOS = {
+    RH_ANIVERSARIANTES_EMPRESA_DUPLICADOS, RH_ANIVERSARIANTES_EMPRESA, GESTOR_ANIVERSARIANTES_EMPRESA,
+    INDIVIDUAL_ANIVERSARIANTE_EMPRESA, INDIVIDUAL_ANIVERSARIANTE_EMPRESA_STAR, GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA,
+    RH_ANIVERSARIANTES_NASCIMENTO, GESTOR_ANIVERSARIANTES_NASCIMENTO, INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO,
+    GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO,
+}
+MENSAIS = {
+    RH_ANIVERSARIANTES_EMPRESA_DUPLICADOS, RH_ANIVERSARIANTES_EMPRESA, GESTOR_ANIVERSARIANTES_EMPRESA,
+    RH_ANIVERSARIANTES_NASCIMENTO, GESTOR_ANIVERSARIANTES_NASCIMENTO,
+}
+
+# Mensagens por tipo no plano de 27/05/2026, com os e-mails mensais
+PLANO_DIA_MENSAL = {
+    RH_ANIVERSARIANTES_EMPRESA_DUPLICADOS: 1,
+    RH_ANIVERSARIANTES_EMPRESA: 1,
+    GESTOR_ANIVERSARIANTES_EMPRESA: 94,
+    INDIVIDUAL_ANIVERSARIANTE_EMPRESA_STAR: 1,
+    INDIVIDUAL_ANIVERSARIANTE_EMPRESA: 5,
+    GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA: 6,
+    RH_ANIVERSARIANTES_NASCIMENTO: 1,
+    GESTOR_ANIVERSARIANTES_NASCIMENTO: 84,
+    INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO: 5,
+    GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO: 5,
+}
+# Planos de 26 a 30/05/2026 com os e-mails mensais saindo a partir do dia 27
+PLANOS_PERIODO = [
+    {INDIVIDUAL_ANIVERSARIANTE_EMPRESA: 4, GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA: 4,
+     INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO: 8, GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO: 8},
+    PLANO_DIA_MENSAL,
+    {INDIVIDUAL_ANIVERSARIANTE_EMPRESA_STAR: 1, INDIVIDUAL_ANIVERSARIANTE_EMPRESA: 4, GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA: 4,
+     INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO: 7, GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO: 5},
+    {INDIVIDUAL_ANIVERSARIANTE_EMPRESA: 5, GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA: 5,
+     INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO: 8, GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO: 8},
+    {INDIVIDUAL_ANIVERSARIANTE_EMPRESA_STAR: 2, INDIVIDUAL_ANIVERSARIANTE_EMPRESA: 6, GESTOR_DIARIO_ANIVERSARIANTE_EMPRESA: 6,
+     INDIVIDUAL_ANIVERSARIANTE_NASCIMENTO: 7, GESTOR_DIARIO_ANIVERSARIANTE_NASCIMENTO: 7},
+]
+# Readmitidos com aniversário em junho: retorno em menos de 6 meses primeiro
+RETORNOS_MENOS_6_MESES = [True, True, True, False, False, False, False]
+
+def _datas(inicio, dias):
+    return [inicio + timedelta(days=dia) for dia in range(dias)]
+
+@pytest.fixture(scope='module')
+def colaboradores():
+    return gerar_colaboradores(3_000, 5)
+
+@pytest.fixture(scope='module')
+def resultados(colaboradores):
+    logging.disable(logging.WARNING)
+    yield classificar_usuarios(colaboradores.copy())
+    logging.disable(logging.NOTSET)
+
+def _planejar(resultados, data, mensal, **opcoes):
+    return planejar_envios(resultados, gerenciadorAniversariantes(), data, FLUXOS, TODOS_OS_ENVIOS, mensal, **opcoes)
+
+def _planejar_periodo(resultados, datas, mensal, **opcoes):
+    return planejar_envios_periodo(resultados, gerenciadorAniversariantes(), datas, FLUXOS, TODOS_OS_ENVIOS, mensal, **opcoes)
+
+def test_plano_de_um_dia(resultados):
+    assert _planejar(resultados, DIA_MENSAL, True).resumo() == PLANO_DIA_MENSAL
+    diario = {tipo: quantidade for tipo, quantidade in PLANO_DIA_MENSAL.items() if tipo not in MENSAIS}
+    assert _planejar(resultados, DIA_MENSAL, False).resumo() == diario
+
+def test_plano_do_periodo_igual_aos_planos_de_cada_dia(resultados):
+    datas = _datas(datetime(2026, 5, 26), 5)
+    planos = _planejar_periodo(resultados, reversed(datas), lambda data: data.day >= 27)
+    assert [plano.data_referencia for plano in planos] == datas
+    assert [plano.resumo() for plano in planos] == PLANOS_PERIODO
+    for plano in planos:
+        assert plano.para_dict() == _planejar(resultados, plano.data_referencia, plano.data_referencia == DIA_MENSAL).para_dict()
+
+def test_mensais_uma_vez_por_mes_seguinte_no_periodo(resultados):
+    # Fora de PRD os mensais saem todo dia: os de junho entram em 27/05; os de julho, em 01/06
+    planos = _planejar_periodo(resultados, _datas(DIA_MENSAL, 8), lambda data: True)
+    for tipo in MENSAIS:
+        assert [plano.data_referencia.day for plano in planos if plano.itens_do_tipo(tipo)] == [27, 1], tipo
+    junho, julho = planos[0], planos[5]
+    assert junho.para_dict() == _planejar(resultados, junho.data_referencia, True).para_dict()
+    assert julho.para_dict() == _planejar(resultados, julho.data_referencia, True).para_dict()
+
+def test_readmissoes_separadas_pelo_tempo_de_retorno(resultados):
+    plano = _planejar(resultados, DIA_MENSAL, True)
+    [item] = plano.itens_do_tipo(RH_ANIVERSARIANTES_EMPRESA_DUPLICADOS)
+    duplicados = plano.dados(item)
+    assert duplicados['Retorno_menos_6_meses'].tolist() == RETORNOS_MENOS_6_MESES
+    menos_6_meses = set(resultados['cadastros_menos_6_meses']['Cpf'])
+    mais_6_meses = set(resultados['cadastros_mais_6_meses']['Cpf'])
+    for cpf, menos in zip(duplicados['Cpf'], duplicados['Retorno_menos_6_meses']):
+        assert cpf in (menos_6_meses if menos else mais_6_meses - menos_6_meses)
+    # Todos completam tempo de casa (primeira admissão) em junho
+    assert (pd.to_datetime(duplicados['Data_primeira_admissao']).dt.month == 6).all()
+    assert (duplicados['Tempo_total_anos'] >= 1).all()
+
+def test_pendentes_sem_caixa_de_saida_e_salvar(resultados, tmp_path):
+    plano = _planejar(resultados, DIA_MENSAL, True)
+    for tipo in TODOS_OS_ENVIOS:
+        assert plano.pendentes(tipo) == plano.itens_do_tipo(tipo)
+    caminho = tmp_path / 'plano.json'
+    plano.salvar(caminho)
+    salvo = json.loads(caminho.read_text(encoding='utf-8'))
+    assert salvo['data_referencia'] == '2026-05-27T00:00:00'
+    assert len(salvo['itens']) == sum(PLANO_DIA_MENSAL.values())
+    assert salvo == json.loads(json.dumps(plano.para_dict(), default=str))
+    for item in salvo['itens']:
+        assert len(salvo['quadros'].get(item['quadro'], [])) > max(item['linhas'], default=-1)
+
+def test_pendentes_do_consolidado_sem_as_secoes_enviadas(resultados, tmp_path):
+    caixa = caixaSaida(str(tmp_path / 'caixa_saida.sqlite3'), 'PRD')
+    try:
+        plano = _planejar(resultados, DIA_MENSAL, True, caixa_saida=caixa, consolidar_gestores=True)
+        consolidados = plano.itens_do_tipo(GESTOR_CONSOLIDADO)
+        assert consolidados
+        # Uma seção enviada numa execução anterior sem consolidação
+        secao = consolidados[0].secoes[0]
+        caixa.enfileirar(DIA_MENSAL, [(secao.tipo, secao.chave)], [(secao.destinatarios, 'assunto', 'corpo')])
+        caixa.registrar(DIA_MENSAL, [(secao.tipo, secao.chave)], [{'status': 202, 'erro': None}])
+        pendentes = plano.pendentes(GESTOR_CONSOLIDADO)
+        assert [item.chave for item in pendentes] == [item.chave for item in consolidados]
+        assert pendentes[0].secoes == consolidados[0].secoes[1:]
+        assert pendentes[1:] == consolidados[1:]
+    finally:
+        caixa.fechar()
+
+@pytest.fixture
+def main(monkeypatch, tmp_path, colaboradores):
+    """script/main.py lendo os dados sintéticos de um Parquet, sem caixa de saída, snapshot nem envio."""
+    import script.main as main
+    caminho = str(tmp_path / 'senior.parquet')
+    exportar_parquet(colaboradores, caminho)
+    monkeypatch.chdir(tmp_path)
+    for nome, valor in {
+        'fonte_dados': 'parquet', 'fonte_dados_caminho': caminho, 'senior_snapshot': None, 'caixa_saida': None,
+        'senior_filtro_aniversariantes': False, 'classificacao_processos': 1, 'gestor_consolidado': False,
+        'AMBIENTE': 'PRD', 'FLUXOS_ATIVOS': FLUXOS, 'ENVIOS_ATIVOS': TODOS_OS_ENVIOS,
+    }.items():
+        monkeypatch.setattr(main, nome, valor)
+
+    # Os planos chegam ao envio, que só os registra
+    enviados = []
+    def _preparar_envio(self):
+        self.email_gestores = type('envioGestores', (), {'enviar_emails_gestores_consolidados': lambda _, plano: []})()
+    monkeypatch.setattr(main.Main, '_preparar_envio', _preparar_envio)
+    monkeypatch.setattr(main.Main, 'processar_aniversariantes_empresa', lambda self, plano: enviados.append(plano))
+    monkeypatch.setattr(main.Main, 'processar_aniversariantes_nascimento', lambda self, plano: None)
+    monkeypatch.setattr(main, 'enviados', enviados, raising=False)
+    return main
+
+def test_argumentos_do_periodo(main):
+    argumentos = main.ler_argumentos(['--inicio', '26/05/2026', '--fim', '30/05/2026'])
+    assert (argumentos.inicio, argumentos.fim) == (datetime(2026, 5, 26), datetime(2026, 5, 30))
+    for invalidos in (['--fim', '30/05/2026'], ['--inicio', '30/05/2026', '--fim', '26/05/2026'], ['--inicio', '31/02/2026']):
+        with pytest.raises(SystemExit):
+            main.ler_argumentos(invalidos)
+
+def test_main_no_modo_periodo(main, tmp_path):
+    aplicacao = main.Main(datetime(2026, 5, 26), datetime(2026, 5, 30))
+    assert aplicacao.datas == _datas(datetime(2026, 5, 26), 5)
+    aplicacao.executar()
+    assert [plano.resumo() for plano in main.enviados] == PLANOS_PERIODO
+    salvos = sorted(caminho.name for caminho in (tmp_path / 'Logs').glob('*_plano.json'))
+    assert salvos == [f'2026-05-{dia}_plano.json' for dia in range(26, 31)]
+
+def test_main_de_um_dia(main):
+    aplicacao = main.Main(DIA_MENSAL)
+    assert aplicacao.datas == [DIA_MENSAL]
+    aplicacao.executar()
+    assert [plano.resumo() for plano in main.enviados] == [PLANO_DIA_MENSAL]
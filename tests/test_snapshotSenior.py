@@ -0,0 +1,119 @@
+# tests/test_snapshotSenior.py
+"""
+snapshotSenior contra uma fonte falsa que reproduz a Senior de cada dia: a carga
+completa, o delta (admissões/demissões desde a data pedida) e as chaves atuais
+saem do mesmo DataFrame, e cada consulta feita fica registrada.
+"""
+from datetime import timedelta
+import pandas as pd
+import pytest
+from data.dadosSinteticos import gerar_colaboradores, DATA_EXTRACAO_PADRAO
+from data.fonteDados import fonteDados, compactar_colunas, COLUNAS_SENIOR
+from data.snapshotSenior import snapshotSenior
+
+HOJE = DATA_EXTRACAO_PADRAO
+ORDEM = list(COLUNAS_SENIOR)
+
+class fonteGravada(fonteDados):
+    """Devolve o estado atual da Senior ('df'); com 'falhar', a consulta indicada falha."""
+    descricao = "fonte gravada"
+
+    def __init__(self, df):
+        self.df = df
+        self.consultas = []
+        self.falhar = None
+
+    def carregar(self):
+        return self.df.copy()
+
+    def consultaDadosSenior(self):
+        self.consultas.append('completa')
+        return super().consultaDadosSenior()
+
+    def consultaDadosSeniorDelta(self, desde):
+        self.consultas.append('delta')
+        return None if self.falhar == 'delta' else super().consultaDadosSeniorDelta(desde)
+
+    def consultaChavesSenior(self):
+        self.consultas.append('chaves')
+        return None if self.falhar == 'chaves' else super().consultaChavesSenior()
+
+def _normalizar(df):
+    """Mesmas linhas em qualquer ordem; as categorias dependem das linhas de cada carga."""
+    categorias = {nome: object for nome in df.columns if isinstance(df[nome].dtype, pd.CategoricalDtype)}
+    return df.astype(categorias).sort_values(ORDEM, na_position='first', kind='stable').reset_index(drop=True)
+
+def _igual_a_senior(resultado, fonte):
+    pd.testing.assert_frame_equal(_normalizar(resultado), _normalizar(fonte.carregar()))
+
+@pytest.fixture
+def fonte():
+    return fonteGravada(gerar_colaboradores(400, 3, HOJE - timedelta(days=1)))
+
+@pytest.fixture
+def snapshot(fonte, tmp_path):
+    return snapshotSenior(fonte, str(tmp_path / 'senior.arrow'))
+
+def _admitir(df, cpf, data):
+    """Nova linha copiada da primeira do DataFrame, com outro CPF e matrícula."""
+    linha = df.iloc[[0]].assign(Cpf=cpf, Matricula=df['Matricula'].max() + 1, Data_admissao=pd.Timestamp(data))
+    return pd.concat([df, linha], ignore_index=True)
+
+def test_primeira_execucao_faz_a_carga_completa(snapshot, fonte):
+    _igual_a_senior(snapshot.atualizar(HOJE - timedelta(days=1)), fonte)
+    assert fonte.consultas == ['completa']
+
+def test_delta_aplica_admissoes_demissoes_e_exclusoes(snapshot, fonte):
+    snapshot.atualizar(HOJE - timedelta(days=1))
+    df = fonte.df
+    ativos = df.index[df['Situacao'] != 7]
+    # Demissão de hoje, exclusão de um registro antigo e uma admissão nova
+    df.loc[ativos[0], ['Situacao', 'Data_demissao']] = [7, pd.Timestamp(HOJE)]
+    excluido = df.loc[ativos[1], ['Cpf', 'Matricula']].tolist()
+    df = df.drop(index=ativos[1])
+    fonte.df = _admitir(df, 99999999999, HOJE)
+
+    resultado = snapshot.atualizar(HOJE)
+    assert fonte.consultas == ['completa', 'delta', 'chaves']
+    _igual_a_senior(resultado, fonte)
+    assert not ((resultado['Cpf'] == excluido[0]) & (resultado['Matricula'] == excluido[1])).any()
+    assert (resultado['Cpf'] == 99999999999).sum() == 1
+
+def test_chave_repetida_nao_e_deduplicada(snapshot, fonte):
+    # Posto pai com dois ocupantes: a linha do colaborador vem repetida, uma por gestor
+    linha = fonte.df.iloc[[5]].assign(Superior='OUTRO GESTOR')
+    fonte.df = compactar_colunas(pd.concat([fonte.df, linha], ignore_index=True))
+    snapshot.atualizar(HOJE - timedelta(days=1))
+    _igual_a_senior(snapshot.atualizar(HOJE), fonte)
+
+def test_execucoes_seguidas_acompanham_a_senior(snapshot, fonte):
+    snapshot.atualizar(HOJE - timedelta(days=1))
+    for dias in range(1, 6):
+        fonte.df = _admitir(fonte.df, 99999999900 + dias, HOJE + timedelta(days=dias))
+        _igual_a_senior(snapshot.atualizar(HOJE + timedelta(days=dias)), fonte)
+    assert fonte.consultas.count('completa') == 1
+
+def test_carga_completa_depois_do_intervalo(snapshot, fonte):
+    snapshot.atualizar(HOJE - timedelta(days=1))
+    snapshot.atualizar(HOJE + timedelta(days=5))
+    snapshot.atualizar(HOJE + timedelta(days=6))
+    assert fonte.consultas == ['completa', 'delta', 'chaves', 'completa']
+
+def test_carga_completa_quando_o_esquema_muda(snapshot, fonte):
+    snapshot.atualizar(HOJE - timedelta(days=1))
+    with open(snapshot.caminho_metadados, encoding='utf-8') as arquivo:
+        metadados = arquivo.read()
+    with open(snapshot.caminho_metadados, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(metadados.replace('"Local", ', ''))
+    snapshot.atualizar(HOJE)
+    assert fonte.consultas == ['completa', 'completa']
+
+@pytest.mark.parametrize('falha', ['delta', 'chaves'])
+def test_falha_na_consulta_incremental_mantem_o_snapshot(snapshot, fonte, falha):
+    anterior = snapshot.atualizar(HOJE - timedelta(days=1))
+    fonte.df = _admitir(fonte.df, 99999999999, HOJE)
+    fonte.falhar = falha
+    pd.testing.assert_frame_equal(snapshot.atualizar(HOJE), anterior)
+    # O delta continua sendo pedido a partir da última atualização bem-sucedida
+    fonte.falhar = None
+    _igual_a_senior(snapshot.atualizar(HOJE), fonte)